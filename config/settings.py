@@ -32,6 +32,12 @@ def get_config_dir():
 # Caminho para o arquivo de perfis
 PROFILES_FILE = os.path.join(get_config_dir(), "server_profiles.json")
 
+# Caminho para o índice local de hashes dos arquivos de leitura
+HASH_INDEX_FILE = os.path.join(get_config_dir(), "hash_index.json")
+
+# Caminho para o banco SQLite com o histórico de jobs
+JOB_REGISTRY_FILE = os.path.join(get_config_dir(), "job_history.sqlite3")
+
 # Caminho para o diretório de logs
 LOG_DIR = os.path.join(get_config_dir(), "logs")
 
@@ -59,4 +65,6 @@ DEFAULT_PORT = "22"
 DEFAULT_THREADS = "8"
 DEFAULT_MODE = "isolate"
 DEFAULT_REMOTE_DIR = "/tmp/spades_jobs"
-DEFAULT_OUTPUT_DIR = "assembly"
\ No newline at end of file
+DEFAULT_OUTPUT_DIR = "assembly"
+# Máximo de atualizações de progresso por segundo em cada transferência
+PROGRESS_UPDATES_PER_SECOND = 4
@@ -1,6 +1,10 @@
 # Ponto de entrada da aplicação SPAdes Master
 
 if __name__ == "__main__":
+    # Necessário para o pool de processos (cálculo de hashes) no executável empacotado
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     from ui.app import SPAdesMasterApp
     app = SPAdesMasterApp()
     app.mainloop()
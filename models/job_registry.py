@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import sqlite3
+import threading
+import statistics
+from config.settings import JOB_REGISTRY_FILE
+from utils.logging_utils import log_info, log_error
+
+# Colunas da tabela de jobs (além do id)
+JOB_COLUMNS = (
+    "job_key", "profile", "host", "username", "remote_dir", "output_dir",
+    "read1", "read2", "read1_sha256", "read2_sha256", "input_bytes",
+    "mode", "threads", "memory_gb", "kmer", "command", "spades_version",
+    "status", "exit_code", "submitted_at", "started_at", "ended_at",
+    "peak_rss_kb", "result_path", "stats", "preprocess",
+)
+
+# Colunas gravadas como JSON
+JSON_COLUMNS = ("stats", "preprocess")
+
+# Colunas acrescentadas depois da primeira versão do banco (nome, tipo)
+ADDED_COLUMNS = (
+    ("preprocess", "TEXT"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT UNIQUE NOT NULL,
+    profile TEXT,
+    host TEXT,
+    username TEXT,
+    remote_dir TEXT,
+    output_dir TEXT,
+    read1 TEXT,
+    read2 TEXT,
+    read1_sha256 TEXT,
+    read2_sha256 TEXT,
+    input_bytes INTEGER,
+    mode TEXT,
+    threads INTEGER,
+    memory_gb INTEGER,
+    kmer TEXT,
+    command TEXT,
+    spades_version TEXT,
+    status TEXT,
+    exit_code INTEGER,
+    submitted_at REAL,
+    started_at REAL,
+    ended_at REAL,
+    peak_rss_kb INTEGER,
+    result_path TEXT,
+    stats TEXT,
+    preprocess TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_submitted ON jobs (submitted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, submitted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_host ON jobs (host, submitted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_mode ON jobs (mode, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_read1_sha256 ON jobs (read1_sha256);
+"""
+
+class JobRegistry:
+    """Histórico local de jobs em SQLite: submissões, parâmetros, tempos, picos de recursos e resultados"""
+    def __init__(self, db_file=JOB_REGISTRY_FILE):
+        """
+        Abre (ou cria) o banco do histórico
+
+        Args:
+            db_file: Arquivo SQLite
+        """
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        # Conexão única compartilhada pelas threads de monitoramento, protegida pelo lock
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+        log_info(f"Histórico de jobs em {db_file}")
+
+    def _migrate(self):
+        """Acrescenta as colunas novas a bancos criados por versões anteriores"""
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in ADDED_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    @staticmethod
+    def _row_to_dict(row):
+        job = dict(row)
+        for column in JSON_COLUMNS:
+            try:
+                job[column] = json.loads(job[column]) if job.get(column) else {}
+            except ValueError:
+                job[column] = {}
+        return job
+
+    @staticmethod
+    def _encode(fields):
+        """Serializa as colunas JSON informadas como dicionários"""
+        for column in JSON_COLUMNS:
+            if isinstance(fields.get(column), dict):
+                fields[column] = json.dumps(fields[column])
+        return fields
+
+    def record_submission(self, job_key, **fields):
+        """
+        Registra um job submetido (ou atualiza o registro, se o job_key já existir)
+
+        Args:
+            job_key: Identificador do job no supervisor
+            **fields: Valores das colunas de JOB_COLUMNS (stats e preprocess podem ser dicionários)
+        """
+        fields = {key: value for key, value in self._encode(fields).items() if key in JOB_COLUMNS and key != "job_key"}
+        columns = ["job_key"] + list(fields)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in fields) or "job_key = excluded.job_key"
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(job_key) DO UPDATE SET {updates}",
+                    [job_key] + list(fields.values())
+                )
+        except sqlite3.Error as e:
+            log_error(f"Erro ao registrar job {job_key} no histórico: {str(e)}")
+
+    def update_job(self, job_key, **fields):
+        """
+        Atualiza colunas de um job registrado
+
+        Args:
+            job_key: Identificador do job no supervisor
+            **fields: Valores das colunas (stats e preprocess podem ser dicionários)
+
+        Returns:
+            bool: True se o job existia no histórico
+        """
+        fields = {key: value for key, value in self._encode(fields).items() if key in JOB_COLUMNS and key != "job_key"}
+        if not fields:
+            return False
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_key = ?",
+                                            list(fields.values()) + [job_key])
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            log_error(f"Erro ao atualizar job {job_key} no histórico: {str(e)}")
+            return False
+
+    def get_job(self, job_key):
+        """Retorna o registro de um job (dict) ou None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_key = ?", (job_key,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list_jobs(self, limit=500, status=None, host=None, search=None):
+        """
+        Lista os jobs mais recentes
+
+        Args:
+            limit: Número máximo de registros
+            status: Filtrar por estado (opcional)
+            host: Filtrar por servidor (opcional)
+            search: Texto procurado no diretório de saída e nas leituras (opcional)
+
+        Returns:
+            list: Registros (dict) do mais recente ao mais antigo
+        """
+        conditions, values = [], []
+        if status:
+            conditions.append("status = ?")
+            values.append(status)
+        if host:
+            conditions.append("host = ?")
+            values.append(host)
+        if search:
+            conditions.append("(remote_dir || '/' || output_dir LIKE ? OR read1 LIKE ? OR read2 LIKE ?)")
+            values.extend([f"%{search}%"] * 3)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY submitted_at DESC LIMIT ?", values + [int(limit)]
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def find_job(self, remote_dir, output_dir, host=None):
+        """
+        Busca o job mais recente gravado em um diretório de saída
+
+        Args:
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
+            host: Servidor (opcional)
+
+        Returns:
+            dict: Registro do job ou None se não houver
+        """
+        conditions = ["rtrim(remote_dir, '/') = ?", "output_dir = ?"]
+        values = [remote_dir.strip().rstrip("/"), output_dir]
+        if host:
+            conditions.append("host = ?")
+            values.append(host)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT * FROM jobs WHERE {' AND '.join(conditions)} ORDER BY submitted_at DESC LIMIT 1", values
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def estimate(self, mode, input_bytes, sample=50):
+        """
+        Estima duração e pico de memória de um job pelos jobs concluídos no mesmo modo
+
+        Usa a mediana de segundos e de KB de pico por byte de entrada dos
+        últimos jobs concluídos, escalada para o volume informado.
+
+        Args:
+            mode: Modo do SPAdes
+            input_bytes: Volume de leituras do novo job
+            sample: Número de jobs recentes considerados
+
+        Returns:
+            dict: duration (segundos), peak_rss_kb e based_on (número de jobs) ou None sem histórico
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT input_bytes, started_at, ended_at, peak_rss_kb FROM jobs "
+                "WHERE mode = ? AND status = 'finished' AND input_bytes > 0 AND ended_at > started_at "
+                "ORDER BY submitted_at DESC LIMIT ?", (mode, int(sample))
+            ).fetchall()
+        if not rows or not input_bytes:
+            return None
+        seconds_per_byte = statistics.median((row["ended_at"] - row["started_at"]) / row["input_bytes"] for row in rows)
+        peak_per_byte = statistics.median((row["peak_rss_kb"] or 0) / row["input_bytes"] for row in rows)
+        return {
+            "duration": seconds_per_byte * input_bytes,
+            "peak_rss_kb": int(peak_per_byte * input_bytes),
+            "based_on": len(rows),
+        }
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conn.close()
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+def get_job_registry():
+    """Retorna o histórico de jobs compartilhado pela aplicação"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = JobRegistry()
+        return _shared_registry
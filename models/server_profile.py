@@ -17,6 +17,9 @@ class ServerProfile:
         
         # Carregar perfis
         self.profiles = self._load_profiles()
+        
+        # Capacidades de servidores inspecionados nesta sessão (inclusive sem perfil salvo)
+        self._session_capabilities = {}
     
     def _load_profiles(self):
         """Carrega os perfis do arquivo JSON"""
@@ -89,6 +92,12 @@ class ServerProfile:
         if not port.isdigit():
             port = "22"
         
+        # Preservar as capacidades conhecidas se o servidor não mudou
+        previous = self.profiles.get(name, {})
+        capabilities = None
+        if (previous.get("host"), str(previous.get("port")), previous.get("username")) == (host, port, username):
+            capabilities = previous.get("capabilities")
+        
         # Armazenar perfil
         self.profiles[name] = {
             "host": host,
@@ -98,12 +107,55 @@ class ServerProfile:
             "key_path": key_path if use_key else "",
             "use_key": use_key
         }
+        if capabilities:
+            self.profiles[name]["capabilities"] = capabilities
         
         result = self._save_profiles()
         if result:
             log_info(f"Perfil '{name}' adicionado com sucesso")
         return result
     
+    def _matching_profiles(self, host, port, username):
+        """Retorna os perfis que apontam para o mesmo host/porta/usuário"""
+        port = str(port or "22")
+        return [
+            profile for profile in self.profiles.values()
+            if isinstance(profile, dict) and profile.get("host") == host
+            and str(profile.get("port") or "22") == port and profile.get("username") == username
+        ]
+        
+    def get_capabilities(self, host, port, username):
+        """
+        Retorna as capacidades conhecidas de um servidor (caminho e versão do SPAdes, CPUs, memória, flags)
+        
+        Returns:
+            dict: Registro de capacidades ou {} se o servidor ainda não foi inspecionado
+        """
+        key = (host, str(port or "22"), username)
+        if key in self._session_capabilities:
+            return dict(self._session_capabilities[key])
+        for profile in self._matching_profiles(host, port, username):
+            if profile.get("capabilities"):
+                return dict(profile["capabilities"])
+        return {}
+        
+    def save_capabilities(self, host, port, username, capabilities):
+        """
+        Armazena as capacidades de um servidor nos perfis correspondentes
+        
+        Servidores sem perfil salvo mantêm as capacidades apenas durante a sessão.
+        
+        Returns:
+            bool: True se armazenado com sucesso
+        """
+        self._session_capabilities[(host, str(port or "22"), username)] = dict(capabilities)
+        profiles = self._matching_profiles(host, port, username)
+        if not profiles:
+            return True
+        for profile in profiles:
+            profile["capabilities"] = dict(capabilities)
+        return self._save_profiles()
+        
     def _validate_profile_data(self, name, host, username, password, key_path, use_key):
         """Valida os dados de um perfil antes de salvar"""
         if not name or not host or not username:
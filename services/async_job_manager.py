@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from services.job_manager import MONITOR_MAX_FAILURES
+from services.ssh_pool import OperationScope
+from utils.logging_utils import log_error, log_warning
+
+class AsyncLoopThread:
+    """Executa um único event loop asyncio em uma thread de fundo, compartilhado pela interface"""
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = None
+
+    def start(self):
+        """Inicia o event loop em uma thread daemon"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro, callback=None):
+        """
+        Agenda uma corrotina no event loop
+
+        Args:
+            coro: Corrotina a executar
+            callback: Função opcional chamada com o resultado (ou None em caso de erro)
+
+        Returns:
+            concurrent.futures.Future: Futuro com o resultado da corrotina
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def _done(f):
+            try:
+                result = f.result()
+            except asyncio.CancelledError:
+                result = None
+            except asyncio.TimeoutError:
+                log_error("Tempo esgotado em operação assíncrona")
+                result = None
+            except Exception as e:
+                log_error(f"Erro em operação assíncrona: {str(e)}")
+                result = None
+            if callback:
+                callback(result)
+
+        future.add_done_callback(_done)
+        return future
+
+    def stop(self):
+        """Para o event loop"""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+class AsyncJobManager:
+    """API asyncio sobre o JobManager: corrotinas com cancelamento e tempo limite
+
+    Operações bloqueantes rodam em um pool limitado, cada uma em seu próprio
+    OperationScope. Quando uma delas esgota o tempo ou é cancelada, só os
+    canais e sessões dedicadas abertos por ela são fechados: a operação termina
+    de fato, sem afetar transferências, o agente remoto e as consultas das
+    demais.
+    """
+    def __init__(self, job_manager, max_workers=4, poll_interval=0.05, loop=None):
+        """
+        Inicializa o gerenciador assíncrono
+
+        Args:
+            job_manager: Instância de JobManager (estado de conexão e job compartilhado)
+            max_workers: Máximo de operações bloqueantes (transferências) simultâneas
+            poll_interval: Intervalo (segundos) entre leituras não bloqueantes de canais SSH
+            loop: Event loop em execução (ex: AsyncLoopThread.loop); se informado, o
+                monitoramento dos jobs iniciados pelo JobManager roda nele
+        """
+        self.job_manager = job_manager
+        self.poll_interval = poll_interval
+        self.loop = loop
+        self._monitor_future = None
+        # Pool limitado para as poucas operações que não têm versão não bloqueante
+        # (autenticação, SFTP), em vez de uma thread por clique
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spades-io")
+        if loop is not None:
+            job_manager.monitor_scheduler = self._schedule_monitor
+
+    async def _call(self, func, *args, timeout=None):
+        """Executa uma operação bloqueante do JobManager no pool limitado, com tempo limite"""
+        loop = asyncio.get_running_loop()
+        scope = OperationScope()
+        task = loop.run_in_executor(self._executor, scope.run, func, *args)
+        try:
+            if timeout is None:
+                return await task
+            return await asyncio.wait_for(task, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # O asyncio apenas deixa de esperar: fechar os canais da operação a interrompe no pool
+            log_warning(f"Operação {getattr(func, '__name__', 'remota')} interrompida (tempo esgotado ou cancelamento)")
+            scope.abort()
+            raise
+
+    async def call(self, func, *args, timeout=None):
+        """
+        Executa uma função bloqueante no pool limitado (ex: consultas que usam o JobManager)
+
+        Args:
+            func: Função a executar
+            timeout: Tempo limite em segundos (opcional); ao esgotar, a operação é interrompida
+
+        Returns:
+            Resultado da função
+        """
+        return await self._call(func, *args, timeout=timeout)
+
+    async def exec_command(self, command, timeout=None):
+        """
+        Executa um comando remoto sem bloquear o event loop
+
+        O canal é lido de forma não bloqueante; vários comandos podem estar em
+        andamento ao mesmo tempo no mesmo loop.
+
+        Args:
+            command: Comando shell
+            timeout: Tempo limite em segundos (opcional)
+
+        Returns:
+            tuple: (exit_status, stdout, stderr)
+        """
+        ssh = self.job_manager.ssh
+        if ssh is None:
+            raise ConnectionError("Servidor não conectado")
+
+        transport = ssh.get_transport()
+        if transport is None or not transport.is_active():
+            raise ConnectionError("Transporte SSH inativo")
+
+        # Abertura do canal e envio do comando (curtos) no pool; a espera pela saída é não bloqueante
+        channel = await self._call(self._open_exec_channel, transport, command, timeout=timeout)
+
+        out_chunks = []
+        err_chunks = []
+        deadline = time.monotonic() + timeout if timeout else None
+        # Em tempo esgotado ou cancelamento, fechar o canal encerra o comando no servidor
+        try:
+            while True:
+                while channel.recv_ready():
+                    out_chunks.append(channel.recv(32768))
+                while channel.recv_stderr_ready():
+                    err_chunks.append(channel.recv_stderr(32768))
+                if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                if deadline and time.monotonic() > deadline:
+                    raise asyncio.TimeoutError(f"Tempo esgotado executando: {command}")
+                await asyncio.sleep(self.poll_interval)
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+
+        return (
+            exit_status,
+            b"".join(out_chunks).decode(errors="replace"),
+            b"".join(err_chunks).decode(errors="replace")
+        )
+
+    @staticmethod
+    def _open_exec_channel(transport, command):
+        """Abre um canal de sessão, envia o comando e o coloca em modo não bloqueante"""
+        channel = transport.open_session()
+        channel.exec_command(command)
+        channel.setblocking(0)
+        return channel
+
+    async def connect(self, host, port, username, password=None, key_path=None, use_key=False, timeout=60):
+        """Conecta ao servidor (reutiliza sessões do pool quando possível)"""
+        return await self._call(self.job_manager.connect, host, port, username, password, key_path, use_key, timeout=timeout)
+
+    async def check_server_resources(self, timeout=60):
+        """Verifica os recursos disponíveis no servidor"""
+        return await self._call(self.job_manager.check_server_resources, timeout=timeout)
+
+    async def prepare_remote_dir(self, remote_dir, timeout=120):
+        """Prepara o diretório remoto"""
+        return await self._call(self.job_manager.prepare_remote_dir, remote_dir, timeout=timeout)
+
+    async def upload(self, local_files, remote_dir, compress=False, timeout=None):
+        """Envia os arquivos de leitura para o servidor"""
+        return await self._call(self.job_manager.upload_files, local_files, remote_dir, compress, timeout=timeout)
+
+    async def test_spades(self, spades_command, timeout=60):
+        """Retorna as primeiras linhas da ajuda do SPAdes (vazio se o comando não funcionar)"""
+        _, output, _ = await self.exec_command(f"{spades_command} --help | head -n 5", timeout=timeout)
+        return output.strip()
+
+    async def reattach(self, timeout=120):
+        """Reencontra os jobs em execução no servidor (ver JobManager.reattach_jobs)"""
+        return await self._call(self.job_manager.reattach_jobs, timeout=timeout)
+
+    async def check_checkpoint(self, remote_dir, output_dir, timeout=60):
+        """Verifica se o diretório de saída contém uma montagem interrompida"""
+        return await self._call(self.job_manager.check_checkpoint, remote_dir, output_dir, timeout=timeout)
+
+    async def run(self, remote_dir, read1, read2, output_dir, threads, memory=None, mode="isolate", kmer=None, timeout=300,
+                  backend="direct", normalization=None, fast_scratch=False):
+        """Inicia o SPAdes no servidor"""
+        def _run():
+            return self.job_manager.run_spades(remote_dir, read1, read2, output_dir, threads, memory, mode, kmer,
+                                               backend=backend, normalization=normalization, fast_scratch=fast_scratch)
+        return await self._call(_run, timeout=timeout)
+
+    async def resume(self, remote_dir, output_dir, threads=None, memory=None, backend="direct", timeout=300):
+        """Retoma uma montagem interrompida"""
+        def _resume():
+            return self.job_manager.resume_spades(remote_dir, output_dir, threads, memory, backend=backend)
+        return await self._call(_resume, timeout=timeout)
+
+    async def clean(self, remote_dir, output_dir=None, timeout=None):
+        """Remove arquivos remotos do job (ver JobManager.clean_remote_files)"""
+        return await self._call(self.job_manager.clean_remote_files, remote_dir, output_dir, timeout=timeout)
+
+    async def track(self, remote_dir, job_id, output_dir, step_timeout=120):
+        """
+        Acompanha o job atual até o término, com cada verificação no pool limitado
+
+        Args:
+            remote_dir: Diretório remoto
+            job_id: ID do job no supervisor
+            output_dir: Diretório de saída
+            step_timeout: Tempo limite (segundos) de cada verificação
+        """
+        monitor = {}
+        while True:
+            try:
+                delay = await self._call(self.job_manager.monitor_step, remote_dir, job_id, output_dir, monitor,
+                                         timeout=step_timeout)
+            except asyncio.TimeoutError:
+                log_warning(f"Verificação do job {job_id} sem resposta em {step_timeout} segundos")
+                monitor["failures"] = monitor.get("failures", 0) + 1
+                if monitor["failures"] >= MONITOR_MAX_FAILURES:
+                    log_warning("Muitas falhas ao monitorar o processo. Considerando finalizado.")
+                    self.job_manager.job_running = False
+                    return
+                delay = 0
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+
+    def _schedule_monitor(self, remote_dir, job_id, output_dir):
+        """Agenda o acompanhamento de um job no event loop (chamado pelo JobManager de qualquer thread)"""
+        self._monitor_future = asyncio.run_coroutine_threadsafe(self.track(remote_dir, job_id, output_dir), self.loop)
+
+    async def monitor(self, poll_interval=30, timeout=None, on_update=None):
+        """
+        Aguarda o término do job atual sem bloquear o event loop
+
+        Args:
+            poll_interval: Intervalo (segundos) entre verificações
+            timeout: Tempo máximo de espera em segundos (opcional)
+            on_update: Função opcional chamada com as métricas a cada verificação
+
+        Returns:
+            bool: True se o job terminou dentro do tempo limite
+        """
+        async def _wait():
+            while self.job_manager.job_running:
+                snapshot = self.job_manager.get_monitor_snapshot()
+                if snapshot is None and self.job_manager.job_pid:
+                    status, output, _ = await self.exec_command(
+                        f"ps -p {self.job_manager.job_pid} -o pid= 2>/dev/null", timeout=60
+                    )
+                    snapshot = {"running": bool(output.strip())}
+                if on_update:
+                    on_update(snapshot)
+                await asyncio.sleep(poll_interval)
+            return True
+
+        try:
+            return await asyncio.wait_for(_wait(), timeout) if timeout else await _wait()
+        except asyncio.TimeoutError:
+            return False
+
+    async def download(self, remote_dir, output_dir, local_dir, important_only=True, timeout=None):
+        """Baixa os resultados do servidor"""
+        return await self._call(
+            self.job_manager.download_results, remote_dir, output_dir, local_dir, important_only,
+            timeout=timeout
+        )
+
+    async def cancel(self, timeout=120):
+        """Cancela o job em execução"""
+        return await self._call(self.job_manager.cancel_job, timeout=timeout)
+
+    async def run_job(self, connection, params, download=True):
+        """
+        Executa o fluxo completo (conectar, enviar, executar, monitorar e baixar)
+
+        Permite usar o SPAdes Master sem interface gráfica, por exemplo:
+        asyncio.run(AsyncJobManager(JobManager(ConsoleStatusUpdater())).run_job(conn, params))
+
+        Args:
+            connection: Dicionário no formato de ConfigFrame.get_connection_params
+            params: Dicionário no formato de ConfigFrame.get_spades_params
+            download: Se True, baixa os arquivos importantes ao final
+
+        Returns:
+            bool: True se todas as etapas foram concluídas
+        """
+        if not await self.connect(connection["host"], connection["port"], connection["username"],
+                                  connection.get("password"), connection.get("key_path"), connection.get("use_key", False)):
+            return False
+        if not await self.prepare_remote_dir(params["remote_dir"]):
+            return False
+        if not await self.upload([params["read1_path"], params["read2_path"]], params["remote_dir"],
+                                 params.get("compress_upload", False)):
+            return False
+        started = await self.run(
+            params["remote_dir"], params["read1_path"], params["read2_path"], params["output_dir"],
+            params["threads"], params.get("memory") or None, params.get("mode", "isolate"), params.get("kmer")
+        )
+        if isinstance(started, tuple):
+            started = started[0]
+        if not started:
+            return False
+        await self.monitor()
+        if download:
+            return await self.download(params["remote_dir"], params["output_dir"], params["local_output_dir"])
+        return True
+
+    def shutdown(self):
+        """Encerra o acompanhamento do job e libera o pool de operações bloqueantes"""
+        if self._monitor_future is not None:
+            self._monitor_future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import os
+from services.remote_batch import quote_remote_path
+from services.remote_browser import is_remote_read, remote_read_path
+from services.job_queue import MEMORY_HEADROOM
+from models.job_registry import get_job_registry
+from utils.logging_utils import log_warning
+from utils.progress import format_bytes, format_duration
+
+# Fator de expansão estimado de FASTQ comprimido (gzip) para o tamanho descomprimido
+GZIP_EXPANSION = 4.0
+
+# Memória estimada (GB) por GB de leituras descomprimidas, por modo do SPAdes
+# (metagenomas e transcriptomas mantêm grafos bem maiores que um isolado)
+MODE_MEMORY_FACTORS = {
+    "meta": 4.0,
+    "metaviral": 4.0,
+    "metaplasmid": 4.0,
+    "rna": 3.0,
+}
+DEFAULT_MEMORY_FACTOR = 2.0
+
+# Memória mínima (GB) reservada para qualquer montagem
+BASE_MEMORY_GB = 4
+
+# Jobs concluídos no histórico necessários para usar o pico de memória medido no lugar do fator do modo
+MIN_HISTORY_JOBS = 3
+
+# Folga sobre o pico de memória estimado pelo histórico
+HISTORY_MEMORY_HEADROOM = 1.25
+
+# Acima destes volumes de leitura (GB descomprimidos) o SPAdes aproveita mais threads
+THREAD_CAPS = [
+    (2, 8),
+    (10, 16),
+    (40, 32),
+]
+
+def input_volume(job_manager, read_paths):
+    """
+    Soma o tamanho das leituras (locais ou já no servidor), estimando o volume descomprimido
+
+    Args:
+        job_manager: JobManager conectado (usado para leituras remotas)
+        read_paths: Caminhos das leituras no formato de ConfigFrame
+
+    Returns:
+        tuple: (bytes em disco, bytes descomprimidos estimados) ou None se algum tamanho for desconhecido
+    """
+    sizes = {}
+    remote = [path for path in read_paths if is_remote_read(path)]
+    for path in read_paths:
+        if not is_remote_read(path):
+            if not os.path.isfile(path):
+                return None
+            sizes[path] = os.path.getsize(path)
+
+    if remote:
+        command = "stat -L -c %s " + " ".join(quote_remote_path(remote_read_path(path)) for path in remote)
+        status, output, _ = job_manager.link.exec_idempotent(command, timeout=30)
+        values = output.split()
+        if status != 0 or len(values) != len(remote) or not all(value.isdigit() for value in values):
+            return None
+        sizes.update(zip(remote, (int(value) for value in values)))
+
+    on_disk = sum(sizes.values())
+    expanded = sum(size * GZIP_EXPANSION if path.endswith(".gz") else size for path, size in sizes.items())
+    return on_disk, int(expanded)
+
+def history_estimate(mode, volume):
+    """
+    Estimativa de duração e pico de memória pelos jobs concluídos no histórico local
+
+    Args:
+        mode: Modo do SPAdes
+        volume: Resultado de input_volume (ou None)
+
+    Returns:
+        dict: Resultado de JobRegistry.estimate ou None sem histórico suficiente
+    """
+    if not volume:
+        return None
+    try:
+        estimate = get_job_registry().estimate(mode, volume[0])
+    except Exception as e:
+        log_warning(f"Histórico de jobs indisponível para a estimativa: {str(e)}")
+        return None
+    if not estimate or estimate["based_on"] < MIN_HISTORY_JOBS or not estimate["peak_rss_kb"]:
+        return None
+    return estimate
+
+def plan_job(job_manager, read_paths, mode):
+    """
+    Consulta recursos, volume das leituras e histórico e escolhe -t e -m de um job
+
+    Args:
+        job_manager: JobManager conectado
+        read_paths: Caminhos das leituras no formato de ConfigFrame
+        mode: Modo do SPAdes
+
+    Returns:
+        dict: Resultado de plan_resources ou None se os recursos forem desconhecidos
+    """
+    resources = job_manager.check_server_resources()
+    volume = input_volume(job_manager, read_paths)
+    return plan_resources(resources, volume, mode, history_estimate(mode, volume))
+
+def plan_resources(resources, volume, mode, history=None):
+    """
+    Escolhe threads (-t) e memória (-m) para um job
+
+    As threads são as CPUs ociosas do servidor (descontada a carga média dos
+    demais usuários), limitadas pelo volume de leituras. A memória é estimada
+    pelo pico de jobs anteriores do mesmo modo, quando houver histórico, ou pelo
+    volume descomprimido e pelo modo, limitada à memória disponível.
+
+    Args:
+        resources: Resultado de JobManager.check_server_resources
+        volume: Resultado de input_volume (ou None se desconhecido)
+        mode: Modo do SPAdes
+        history: Resultado de history_estimate (opcional): o pico medido em jobs
+            anteriores substitui o fator do modo
+
+    Returns:
+        dict: threads, memory (GB) e reasons (lista de explicações) ou None se os recursos forem desconhecidos
+    """
+    cpus = resources.get("cpu_count") if resources else None
+    total_mem = resources.get("total_mem") if resources else None
+    if not isinstance(cpus, int) or not isinstance(total_mem, int):
+        return None
+    available_mem = resources.get("available_mem")
+    if not isinstance(available_mem, int):
+        available_mem = total_mem
+    load = resources.get("load_avg")
+    reasons = []
+
+    # Threads: CPUs ociosas, mantendo uma livre para o sistema em servidores maiores
+    busy = math.ceil(load) if isinstance(load, float) else 0
+    idle = max(1, cpus - busy - (1 if cpus > 4 else 0))
+    threads = idle
+    if isinstance(load, float):
+        reasons.append(f"{cpus} CPUs com carga média {load:.2f}: {idle} livres para o job")
+    else:
+        reasons.append(f"{cpus} CPUs (carga média desconhecida): {idle} livres para o job")
+
+    expanded_gb = volume[1] / 1024 ** 3 if volume else None
+    if expanded_gb is not None:
+        for limit_gb, cap in THREAD_CAPS:
+            if expanded_gb < limit_gb:
+                if threads > cap:
+                    threads = cap
+                    reasons.append(f"leituras pequenas (< {limit_gb} GB descomprimidos): threads limitadas a {cap}")
+                break
+
+    # Memória: pico do histórico ou volume descomprimido x fator do modo, dentro do que o servidor tem livre
+    limit_gb = int(min(available_mem, total_mem * MEMORY_HEADROOM) / 1024)
+    if expanded_gb is None:
+        memory = limit_gb
+        reasons.append(f"tamanho das leituras desconhecido: memória limitada à disponível ({limit_gb} GB)")
+    else:
+        if history:
+            estimate = max(BASE_MEMORY_GB, math.ceil(history["peak_rss_kb"] / 1024 ** 2 * HISTORY_MEMORY_HEADROOM))
+            reasons.append(f"leituras com {format_bytes(volume[0])} no modo {mode}: {history['based_on']} jobs anteriores "
+                           f"indicam pico de {format_bytes(history['peak_rss_kb'] * 1024)} e duração de "
+                           f"~{format_duration(history['duration'])}: estimativa de {estimate} GB")
+        else:
+            factor = MODE_MEMORY_FACTORS.get(mode, DEFAULT_MEMORY_FACTOR)
+            estimate = math.ceil(BASE_MEMORY_GB + expanded_gb * factor)
+            reasons.append(f"leituras com {format_bytes(volume[0])} (~{format_bytes(volume[1])} descomprimidos) "
+                           f"no modo {mode}: estimativa de {estimate} GB")
+        memory = min(estimate, limit_gb)
+        if memory < estimate:
+            reasons.append(f"apenas {limit_gb} GB disponíveis no servidor: a montagem pode falhar por falta de memória")
+    memory = max(1, memory)
+
+    return {"threads": threads, "memory": memory, "reasons": reasons}
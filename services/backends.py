@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import json
+import shlex
+import time
+from abc import ABC, abstractmethod
+from services.remote_batch import RemoteBatch, quote_remote_path
+from services.job_supervisor import (JobSupervisor, job_files, build_wrapper_script, write_script_command,
+                                     register_command, parse_manifest, JOBS_REGISTRY_DIR, CANCEL_GRACE_SECONDS,
+                                     JOB_PENDING, JOB_RUNNING, JOB_FINISHED, JOB_FAILED, JOB_CANCELLED)
+from utils.logging_utils import log_info, log_warning
+
+# Identificador impresso por sbatch --parsable ou qsub
+SUBMISSION_ID_PATTERN = re.compile(r"^(\d+(?:\.[\w.-]+)?)(?:;\S+)?$")
+
+# Chaves do ponteiro do job preservadas entre leituras do manifesto
+STATE_KEYS = ("job_id", "manifest", "remote_dir", "output_dir", "threads", "memory", "backend", "scheduler_id")
+
+class DirectBackend:
+    """Execução direta no servidor conectado: o supervisor roda em uma sessão própria (setsid)"""
+    name = "direct"
+
+    def __init__(self, link):
+        """
+        Args:
+            link: ReconnectingSession da sessão principal
+        """
+        self.link = link
+        self.supervisor = JobSupervisor(link)
+
+    @staticmethod
+    def _merge(previous, current):
+        """Mantém no manifesto lido os dados do ponteiro (diretórios, recursos, backend)"""
+        for key in STATE_KEYS:
+            if key in previous and key not in current:
+                current[key] = previous[key]
+        return current
+
+    def launch(self, workdir, command, job_id, details):
+        """
+        Inicia o job
+
+        Args:
+            workdir: Diretório remoto do job
+            command: Comando do SPAdes
+            job_id: Identificador do job
+            details: Dados do ponteiro (output_dir, threads, memory, backend)
+
+        Returns:
+            dict: Manifesto inicial ou None se não iniciou
+        """
+        state = self.supervisor.launch(workdir, command, job_id, details)
+        if state is not None:
+            state.update({key: value for key, value in details.items() if key not in state})
+        return state
+
+    def read_state(self, state):
+        """
+        Lê o estado atual de um job
+
+        Args:
+            state: Último estado conhecido (deve conter 'manifest')
+
+        Returns:
+            dict: Estado atualizado ou None se o manifesto não foi encontrado
+        """
+        current = self.supervisor.read_manifest(state["manifest"])
+        return self._merge(state, current) if current is not None else None
+
+    def cancel(self, state):
+        """
+        Cancela o job
+
+        Returns:
+            bool: True se nenhum processo do job continua em execução
+        """
+        if not state.get("pgid"):
+            return False
+        return self.supervisor.cancel(state["pgid"], state.get("manifest"))
+
+class SchedulerBackend(DirectBackend, ABC):
+    """Submissão a um escalonador de cluster: o supervisor roda como script do job, no nó de cálculo
+
+    O manifesto é gravado no diretório do job (sistema de arquivos compartilhado)
+    e lido do nó de login; o estado do escalonador complementa o manifesto
+    quando o job termina sem que o supervisor registre o término (cancelamento,
+    tempo limite, falta de memória ou falha do nó).
+    """
+    name = None
+    submit_tool = None
+
+    @abstractmethod
+    def script_header(self, job_id, threads, memory, files):
+        """Diretivas do escalonador no início do script do job"""
+
+    @abstractmethod
+    def submit_command(self, script):
+        """Comando que submete o script e imprime o identificador do job no escalonador"""
+
+    @abstractmethod
+    def status_command(self, scheduler_id):
+        """Comando que imprime o estado do job no escalonador"""
+
+    @abstractmethod
+    def parse_status(self, output):
+        """
+        Interpreta o estado do escalonador
+
+        Returns:
+            tuple: (estado bruto, estado final equivalente do supervisor ou None se o job está ativo/desconhecido)
+        """
+
+    @abstractmethod
+    def cancel_command(self, scheduler_id):
+        """Comando que cancela o job no escalonador"""
+
+    def launch(self, workdir, command, job_id, details):
+        files = job_files(workdir, job_id)
+        script_path = f"{files['wrapper'][:-len('.sh')]}.{self.name}"
+        script = self.script_header(job_id, details.get("threads"), details.get("memory"), files)
+        script += f"sh {quote_remote_path(files['wrapper'])}\n"
+        pending = {
+            "job_id": job_id, "pid": None, "pgid": None, "status": JOB_PENDING,
+            "start_time": None, "end_time": None, "exit_code": None, "peak_rss_kb": 0,
+            "log_file": files["log_file"], "error_file": files["error_file"],
+        }
+
+        batch = RemoteBatch()
+        batch.add("write", write_script_command(files["wrapper"], build_wrapper_script(workdir, command, job_id)))
+        batch.add("script", write_script_command(script_path, script))
+        batch.add("pending", f"echo {shlex.quote(json.dumps(pending))} > {quote_remote_path(files['manifest'])} && echo OK")
+        batch.add(
+            "submit",
+            f"if ! command -v {self.submit_tool} >/dev/null; then echo 'SM_NO_SCHEDULER'; "
+            f"else cd {quote_remote_path(workdir)} && {self.submit_command(quote_remote_path(script_path))} 2>&1; fi"
+        )
+        results = batch.run(self.link.get_client(), timeout=60)
+        if not all(results.get(key) == "OK" for key in ("write", "script", "pending")):
+            log_warning(f"Não foi possível gravar os scripts do job em {workdir}")
+            return None
+
+        output = results.get("submit", "")
+        scheduler_id = self.parse_submission(output)
+        if scheduler_id is None:
+            reason = f"{self.submit_tool} não encontrado no servidor" if "SM_NO_SCHEDULER" in output else output
+            log_warning(f"Falha na submissão ao escalonador: {reason}")
+            return None
+
+        details = dict(details, backend=self.name, scheduler_id=scheduler_id)
+        register = RemoteBatch().add("register", register_command(workdir, job_id, details))
+        if self.link.run_batch(register, timeout=30).get("register") != "OK":
+            log_warning(f"Não foi possível registrar o job {job_id} em {JOBS_REGISTRY_DIR}; ele não será reencontrado ao reabrir o aplicativo")
+
+        state = dict(pending, manifest=files["manifest"])
+        state.update(details)
+        log_info(f"Job {job_id} submetido ao {self.name}: {scheduler_id}")
+        return state
+
+    @staticmethod
+    def parse_submission(output):
+        """Identificador do job na saída do comando de submissão (ex: '1234', '1234;cluster' ou '1234.servidor')"""
+        for line in output.splitlines():
+            match = SUBMISSION_ID_PATTERN.match(line.strip())
+            if match:
+                return match.group(1)
+        return None
+
+    def read_state(self, state):
+        scheduler_id = state.get("scheduler_id")
+        batch = RemoteBatch()
+        batch.add("manifest", f"cat {quote_remote_path(state['manifest'])}")
+        batch.add("scheduler", self.status_command(scheduler_id))
+        results = self.link.run_batch(batch, timeout=30)
+
+        current = parse_manifest(results.get("manifest", ""))
+        if current is None:
+            return None
+        current = self._merge(state, current)
+        current["manifest"] = state["manifest"]
+        raw, final = self.parse_status(results.get("scheduler", ""))
+        current["scheduler_state"] = raw
+        # Job encerrado pelo escalonador sem que o supervisor registrasse o término
+        if final is not None and current.get("status") in (JOB_PENDING, JOB_RUNNING):
+            current["status"] = final
+            current["end_time"] = current.get("end_time") or int(time.time())
+        return current
+
+    def cancel(self, state, grace=CANCEL_GRACE_SECONDS):
+        scheduler_id = shlex.quote(str(state.get("scheduler_id")))
+        manifest = quote_remote_path(state["manifest"])
+        self.link.exec_idempotent(f"{self.cancel_command(scheduler_id)} 2>&1", timeout=30)
+        deadline = time.time() + grace + 20
+        while time.time() < deadline:
+            current = self.read_state(state)
+            if current is None or current.get("status") not in (JOB_PENDING, JOB_RUNNING):
+                break
+            time.sleep(2)
+        else:
+            return False
+        # O supervisor pode ter sido encerrado pelo escalonador antes de gravar o término
+        self.link.exec_idempotent(
+            f"sed -i -e 's/\"status\": \"{JOB_RUNNING}\"/\"status\": \"{JOB_CANCELLED}\"/' "
+            f"-e 's/\"status\": \"{JOB_PENDING}\"/\"status\": \"{JOB_CANCELLED}\"/' {manifest}",
+            timeout=30
+        )
+        return True
+
+class SlurmBackend(SchedulerBackend):
+    """Submissão com sbatch; estado por squeue (jobs ativos) e sacct (jobs encerrados)"""
+    name = "slurm"
+    submit_tool = "sbatch"
+
+    # Estados finais do SLURM e o equivalente no manifesto
+    FINAL_STATES = {
+        "COMPLETED": JOB_FINISHED,
+        "CANCELLED": JOB_CANCELLED,
+        "FAILED": JOB_FAILED,
+        "TIMEOUT": JOB_FAILED,
+        "OUT_OF_MEMORY": JOB_FAILED,
+        "NODE_FAIL": JOB_FAILED,
+        "PREEMPTED": JOB_FAILED,
+        "BOOT_FAIL": JOB_FAILED,
+        "DEADLINE": JOB_FAILED,
+    }
+
+    def script_header(self, job_id, threads, memory, files):
+        lines = [
+            "#!/bin/sh",
+            f"#SBATCH --job-name=spades_{job_id}",
+            "#SBATCH --ntasks=1",
+            f"#SBATCH --cpus-per-task={int(threads or 1)}",
+            f"#SBATCH --output={files['log_file'][:-len('.log')]}.sched.out",
+        ]
+        if memory:
+            lines.append(f"#SBATCH --mem={int(memory)}G")
+        return "\n".join(lines) + "\n"
+
+    def submit_command(self, script):
+        return f"sbatch --parsable {script}"
+
+    def status_command(self, scheduler_id):
+        job = shlex.quote(str(scheduler_id))
+        return (f"s=$(squeue -h -j {job} -o %T 2>/dev/null | head -1); "
+                f"[ -n \"$s\" ] || s=$(sacct -n -X -P -j {job} -o State 2>/dev/null | head -1); echo \"$s\"")
+
+    def parse_status(self, output):
+        raw = output.strip().split()[0] if output.strip() else ""
+        return raw, self.FINAL_STATES.get(raw)
+
+    def cancel_command(self, scheduler_id):
+        return f"scancel {scheduler_id}"
+
+class PbsBackend(SchedulerBackend):
+    """Submissão com qsub (PBS/Torque); estado por qstat -f"""
+    name = "pbs"
+    submit_tool = "qsub"
+
+    # Código de saída do PBS para jobs encerrados por qdel (SIGTERM = 256 + 15)
+    KILLED_EXIT_STATUS = 271
+
+    def script_header(self, job_id, threads, memory, files):
+        base = files["log_file"][:-len(".log")]
+        lines = [
+            "#!/bin/sh",
+            f"#PBS -N spades_{job_id}",
+            f"#PBS -l nodes=1:ppn={int(threads or 1)}",
+            f"#PBS -o {base}.sched.out",
+            f"#PBS -e {base}.sched.err",
+        ]
+        if memory:
+            lines.append(f"#PBS -l mem={int(memory)}gb")
+        return "\n".join(lines) + "\n"
+
+    def submit_command(self, script):
+        return f"qsub {script}"
+
+    def status_command(self, scheduler_id):
+        job = shlex.quote(str(scheduler_id))
+        return f"qstat -f -x {job} 2>/dev/null || qstat -f {job} 2>/dev/null"
+
+    def parse_status(self, output):
+        fields = {}
+        for line in output.splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                fields[key.strip()] = value.strip()
+        raw = fields.get("job_state", "")
+        if raw not in ("C", "F"):
+            return raw, None
+        exit_status = fields.get("Exit_status", "")
+        if exit_status == "0":
+            return raw, JOB_FINISHED
+        if exit_status == str(self.KILLED_EXIT_STATUS):
+            return raw, JOB_CANCELLED
+        return raw, JOB_FAILED
+
+    def cancel_command(self, scheduler_id):
+        return f"qdel {scheduler_id}"
+
+# Backends de execução disponíveis (nome -> classe)
+BACKENDS = {
+    DirectBackend.name: DirectBackend,
+    SlurmBackend.name: SlurmBackend,
+    PbsBackend.name: PbsBackend,
+}
+
+def get_backend(name_or_state, link):
+    """
+    Retorna o backend de execução
+
+    Args:
+        name_or_state: Nome do backend ou estado/ponteiro de um job (chave 'backend')
+        link: ReconnectingSession da sessão principal
+
+    Returns:
+        DirectBackend: Instância do backend (execução direta se o nome for desconhecido)
+    """
+    name = name_or_state.get("backend") if isinstance(name_or_state, dict) else name_or_state
+    return BACKENDS.get(name or DirectBackend.name, DirectBackend)(link)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import queue
+import threading
+import time
+from services.autotune import plan_job
+from utils.logging_utils import log_info, log_warning, log_error
+
+# Padrões de nome de arquivo R1 -> R2 (os mesmos usados na seleção de arquivos)
+PAIR_PATTERNS = [("_R1_", "_R2_"), ("_R1.", "_R2."), ("_1.", "_2."), ("_1_", "_2_")]
+
+# Estados de uma amostra no pipeline
+STATUS_PENDING = "Aguardando"
+STATUS_UPLOADING = "Enviando"
+STATUS_UPLOADED = "Na fila de execução"
+STATUS_RUNNING = "Montando"
+STATUS_ASSEMBLED = "Na fila de download"
+STATUS_DOWNLOADING = "Baixando"
+STATUS_DONE = "Concluído"
+STATUS_FAILED = "Falhou"
+STATUS_CANCELLED = "Cancelado"
+
+# Marca de fim de fila entre as etapas
+_END = object()
+
+class BatchSample:
+    """Amostra (par de leituras) processada pelo pipeline em lote"""
+    def __init__(self, name, read1, read2):
+        self.name = name
+        self.read1 = read1
+        self.read2 = read2
+        self.status = STATUS_PENDING
+        self.message = ""
+
+def pair_reads(paths):
+    """
+    Agrupa arquivos de leitura em pares R1/R2 pelo nome
+
+    Args:
+        paths: Caminhos dos arquivos selecionados
+
+    Returns:
+        tuple: (lista de BatchSample, lista de arquivos sem par)
+    """
+    remaining = set(paths)
+    samples = []
+    for path in sorted(paths):
+        if path not in remaining:
+            continue
+        name = os.path.basename(path)
+        for r1_tag, r2_tag in PAIR_PATTERNS:
+            if r1_tag not in name:
+                continue
+            mate = os.path.join(os.path.dirname(path), name.replace(r1_tag, r2_tag, 1))
+            if mate in remaining and mate != path:
+                sample_name = re.sub(r"[^A-Za-z0-9._-]", "_", name.split(r1_tag)[0]) or f"amostra_{len(samples) + 1}"
+                samples.append(BatchSample(sample_name, path, mate))
+                remaining.discard(path)
+                remaining.discard(mate)
+                break
+    return samples, sorted(remaining)
+
+class BatchPipeline:
+    """Pipeline em lote: envia as próximas amostras enquanto o servidor monta a atual e baixa as concluídas
+
+    Cada etapa (envio, execução, download) roda em sua própria thread, ligadas
+    por filas limitadas. O envio fica no máximo 'upload_ahead' amostras à
+    frente da execução, mantendo a rede e as CPUs do servidor ocupadas sem
+    acumular leituras no disco remoto; a execução para de iniciar montagens
+    quando 'download_behind' amostras concluídas aguardam download.
+
+    Envios e downloads usam sessões dedicadas do pool (SFTP em paralelo) e
+    seguem ao mesmo tempo que a montagem. Só o estado do job atual do
+    JobManager (job_running e campos job_*) é compartilhado: o início e o
+    cancelamento de uma montagem são serializados por '_job_lock'.
+    """
+    def __init__(self, job_manager, params, samples, upload_ahead=2, download_behind=2, poll_interval=10, on_update=None):
+        """
+        Inicializa o pipeline
+
+        Args:
+            job_manager: JobManager conectado
+            params: Parâmetros no formato de ConfigFrame.get_spades_params (remote_dir, output_dir, ...)
+            samples: Lista de BatchSample
+            upload_ahead: Máximo de amostras enviadas aguardando execução
+            download_behind: Máximo de amostras montadas aguardando download
+            poll_interval: Intervalo (segundos) entre verificações do job em execução
+            on_update: Função opcional chamada com a amostra a cada mudança de estado
+        """
+        self.job_manager = job_manager
+        self.params = params
+        self.samples = samples
+        self.poll_interval = poll_interval
+        self.on_update = on_update
+        self._run_queue = queue.Queue(maxsize=max(1, upload_ahead))
+        self._download_queue = queue.Queue(maxsize=max(1, download_behind))
+        self._job_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._threads = []
+
+    def _set_status(self, sample, status, message=""):
+        sample.status = status
+        sample.message = message
+        log_info(f"[Lote] {sample.name}: {status}{' - ' + message if message else ''}")
+        if self.on_update:
+            try:
+                self.on_update(sample)
+            except Exception as e:
+                log_error(f"Erro ao atualizar o estado da amostra: {str(e)}")
+
+    def _remote_dir(self, sample):
+        return f"{self.params['remote_dir'].rstrip('/')}/{sample.name}"
+
+    def _local_dir(self, sample):
+        return os.path.join(self.params["local_output_dir"], sample.name)
+
+    def _put(self, target_queue, item):
+        """Coloca um item na fila, desistindo se o pipeline for cancelado"""
+        while not self._cancelled.is_set():
+            try:
+                target_queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _upload_stage(self):
+        """Etapa 1: prepara o diretório remoto e envia as leituras de cada amostra"""
+        try:
+            for sample in self.samples:
+                if self._cancelled.is_set():
+                    break
+                self._set_status(sample, STATUS_UPLOADING)
+                remote_dir = self._remote_dir(sample)
+                ok = (self.job_manager.prepare_remote_dir(remote_dir) and
+                      self.job_manager.upload_files([sample.read1, sample.read2], remote_dir,
+                                                    self.params.get("compress_upload", False)))
+                if not ok:
+                    self._set_status(sample, STATUS_FAILED, "Falha no envio")
+                    continue
+                self._set_status(sample, STATUS_UPLOADED)
+                # Bloqueia quando já há 'upload_ahead' amostras aguardando execução
+                if not self._put(self._run_queue, sample):
+                    break
+        finally:
+            self._put_end(self._run_queue)
+
+    def _put_end(self, target_queue):
+        """Sinaliza o fim da fila para a próxima etapa"""
+        while True:
+            try:
+                target_queue.put(_END, timeout=1)
+                return
+            except queue.Full:
+                if not self._cancelled.is_set():
+                    continue
+                # Cancelado com a fila cheia: descartar um item para liberar espaço
+                try:
+                    dropped = target_queue.get_nowait()
+                    if isinstance(dropped, BatchSample):
+                        self._set_status(dropped, STATUS_CANCELLED)
+                except queue.Empty:
+                    pass
+
+    def _resources(self, sample):
+        """
+        Threads e memória de uma amostra (ajuste automático por amostra, se ativado)
+
+        Returns:
+            tuple: (threads, memória em GB ou None); threads é None se não puderem ser definidas
+        """
+        threads, memory = self.params.get("threads") or None, self.params.get("memory") or None
+        if not self.params.get("auto_tune"):
+            return threads, memory
+        try:
+            plan = plan_job(self.job_manager, [sample.read1, sample.read2], self.params.get("mode", "isolate"))
+        except Exception as e:
+            log_warning(f"[Lote] Ajuste automático indisponível para {sample.name}: {str(e)}")
+            plan = None
+        if plan is None:
+            return threads, memory
+        log_info(f"[Lote] {sample.name}: ajuste automático -t {plan['threads']} -m {plan['memory']}")
+        return plan["threads"], plan["memory"]
+
+    def _run_stage(self):
+        """Etapa 2: executa o SPAdes de uma amostra por vez e aguarda o término"""
+        try:
+            while True:
+                sample = self._run_queue.get()
+                if sample is _END:
+                    break
+                if self._cancelled.is_set():
+                    self._set_status(sample, STATUS_CANCELLED)
+                    continue
+                threads, memory = self._resources(sample)
+                if not threads:
+                    self._set_status(sample, STATUS_FAILED, "ajuste automático indisponível e threads não informadas")
+                    continue
+                self._set_status(sample, STATUS_RUNNING)
+                with self._job_lock:
+                    started = self.job_manager.run_spades(
+                        self._remote_dir(sample), sample.read1, sample.read2,
+                        self.params["output_dir"], threads, memory,
+                        self.params.get("mode", "isolate"), self.params.get("kmer") or None,
+                        advanced_params=self.params.get("advanced_params"),
+                        backend=self.params.get("backend") or "direct",
+                        normalization=self.params.get("normalization"),
+                        fast_scratch=self.params.get("fast_scratch", False)
+                    )
+                if not started:
+                    self._set_status(sample, STATUS_FAILED, "Falha ao iniciar o SPAdes")
+                    continue
+                while self.job_manager.job_running and not self._cancelled.is_set():
+                    time.sleep(self.poll_interval)
+                if self._cancelled.is_set():
+                    with self._job_lock:
+                        self.job_manager.cancel_job()
+                    self._set_status(sample, STATUS_CANCELLED)
+                    continue
+                self._set_status(sample, STATUS_ASSEMBLED)
+                # Bloqueia quando já há 'download_behind' amostras aguardando download
+                if not self._put(self._download_queue, sample):
+                    self._set_status(sample, STATUS_CANCELLED)
+        finally:
+            self._put_end(self._download_queue)
+
+    def _download_stage(self):
+        """Etapa 3: baixa os arquivos importantes das amostras concluídas"""
+        while True:
+            sample = self._download_queue.get()
+            if sample is _END:
+                break
+            self._set_status(sample, STATUS_DOWNLOADING)
+            ok = self.job_manager.download_results(
+                self._remote_dir(sample), self.params["output_dir"], self._local_dir(sample), True
+            )
+            if ok:
+                self._set_status(sample, STATUS_DONE)
+            else:
+                self._set_status(sample, STATUS_FAILED, "Falha no download (a montagem pode ter falhado)")
+
+    def start(self):
+        """Inicia as três etapas em threads separadas"""
+        for target in (self._upload_stage, self._run_stage, self._download_stage):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wait(self, timeout=None):
+        """
+        Aguarda o término do pipeline
+
+        Returns:
+            bool: True se todas as etapas terminaram
+        """
+        for thread in self._threads:
+            thread.join(timeout)
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def cancel(self):
+        """Cancela o pipeline (o job em execução é cancelado no servidor)"""
+        self._cancelled.set()
+
+    def is_running(self):
+        """Retorna True enquanto alguma etapa estiver ativa"""
+        return any(thread.is_alive() for thread in self._threads)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import shlex
+from services.remote_batch import RemoteBatch, quote_remote_path
+
+# Mensagem gravada pelo SPAdes no spades.log ao final de uma montagem completa
+PIPELINE_FINISHED = "SPAdes pipeline finished"
+
+THREADS_PATTERN = re.compile(r"(?:^|\s)(?:-t|--threads)\s+(\d+)")
+MEMORY_PATTERN = re.compile(r"(?:^|\s)(?:-m|--memory)\s+(\d+)")
+
+class Checkpoint:
+    """Estado de um diretório de saída do SPAdes, para retomada com --continue ou --restart-from"""
+    def __init__(self, output_dir, results):
+        """
+        Args:
+            output_dir: Diretório de saída (relativo ao diretório remoto)
+            results: Resultados do lote de inspect_output
+        """
+        self.output_dir = output_dir
+        self.exists = results.get("exists") == "1"
+        self.has_params = results.get("params") == "1"
+        self.finished = results.get("finished") == "1"
+        self.corrected = results.get("corrected") == "1"
+        self.command_line = results.get("command_line", "")
+        self.completed_k = []
+        self.started_k = []
+        for line in results.get("kdirs", "").splitlines():
+            state, _, k = line.partition(" ")
+            if k.isdigit():
+                (self.completed_k if state == "done" else self.started_k).append(int(k))
+        self.completed_k.sort()
+        self.started_k.sort()
+
+        threads = THREADS_PATTERN.search(self.command_line)
+        memory = MEMORY_PATTERN.search(self.command_line)
+        self.previous_threads = int(threads.group(1)) if threads else None
+        self.previous_memory = int(memory.group(1)) if memory else None
+
+    @property
+    def resumable(self):
+        """True se o SPAdes deixou estado salvo e a montagem não terminou"""
+        return self.exists and self.has_params and not self.finished
+
+    @property
+    def restart_stage(self):
+        """
+        Estágio para --restart-from: a iteração de k interrompida, a montagem
+        após a correção de erros concluída, ou o último ponto salvo
+        """
+        if self.started_k:
+            return f"k{self.started_k[0]}"
+        if self.completed_k:
+            return "last"
+        if self.corrected or "--only-assembler" in self.command_line:
+            return "as"
+        return "ec"
+
+    def describe(self):
+        """Resumo do que já foi concluído"""
+        done = []
+        if self.corrected:
+            done.append("correção de erros")
+        if self.completed_k:
+            done.append("k " + ", ".join(str(k) for k in self.completed_k))
+        completed = "; ".join(done) if done else "nenhum estágio"
+        return f"concluídos: {completed} (retomada em {self.restart_stage})"
+
+def inspect_output(link, remote_dir, output_dir):
+    """
+    Inspeciona um diretório de saída do SPAdes em uma única ida e volta
+
+    Args:
+        link: ReconnectingSession da sessão principal
+        remote_dir: Diretório remoto do job
+        output_dir: Diretório de saída (relativo ao diretório remoto)
+
+    Returns:
+        Checkpoint: Estado do diretório de saída
+    """
+    path = quote_remote_path(f"{remote_dir.rstrip('/')}/{output_dir}")
+    batch = RemoteBatch()
+    batch.dir_exists("exists", f"{remote_dir.rstrip('/')}/{output_dir}")
+    batch.add("params", f"[ -f {path}/params.txt ] && echo 1 || echo 0")
+    batch.add("finished", f"grep -q '{PIPELINE_FINISHED}' {path}/spades.log && echo 1 || echo 0")
+    batch.add("corrected", f"[ -d {path}/corrected ] && echo 1 || echo 0")
+    batch.add(
+        "kdirs",
+        f"for d in {path}/K*; do [ -d \"$d\" ] || continue; k=${{d##*/K}}; "
+        f"if [ -f \"$d/final_contigs.fasta\" ]; then echo \"done $k\"; else echo \"started $k\"; fi; done"
+    )
+    batch.add("command_line", f"grep -m 1 'Command line:' {path}/params.txt")
+    return Checkpoint(output_dir, link.run_batch(batch, timeout=30))
+
+def build_resume_command(spades_command, checkpoint, threads=None, memory=None):
+    """
+    Monta o comando de retomada
+
+    Sem mudança de recursos usa --continue (que não aceita outras opções);
+    com -t ou -m diferentes da execução anterior usa --restart-from no
+    estágio interrompido, preservando os estágios já concluídos.
+
+    Args:
+        spades_command: Comando do SPAdes
+        checkpoint: Checkpoint do diretório de saída
+        threads: Novo número de threads (opcional)
+        memory: Nova memória em GB (opcional)
+
+    Returns:
+        str: Comando a executar no diretório remoto
+    """
+    output = shlex.quote(checkpoint.output_dir)
+    threads = int(threads) if threads and str(threads).isdigit() else None
+    memory = int(memory) if memory and str(memory).isdigit() else None
+    changed = ((threads is not None and threads != checkpoint.previous_threads) or
+               (memory is not None and memory != checkpoint.previous_memory))
+    if not changed:
+        return f"{spades_command} --continue -o {output}"
+
+    command = f"{spades_command} --restart-from {checkpoint.restart_stage} -o {output}"
+    if threads is not None:
+        command += f" -t {threads}"
+    if memory is not None:
+        command += f" -m {memory}"
+    return command
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import hashlib
+import zlib
+import struct
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from services.reconnect import ReconnectingSession
+from services.ssh_pool import current_scope
+from services.remote_batch import quote_remote_path
+from services.transfer_engine import ParallelUploader, PART_SUFFIX, remote_sha256_command
+from utils.logging_utils import log_info, log_warning
+
+# Tamanho dos blocos comprimidos de forma independente (um membro gzip por bloco)
+COMPRESS_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Extensões de arquivos que já estão comprimidos
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".zst", ".xz")
+
+def is_compressed(path):
+    """Retorna True se o arquivo já estiver comprimido (pela extensão)"""
+    return path.lower().endswith(COMPRESSED_EXTENSIONS)
+
+def compressed_name(path):
+    """Nome do arquivo no servidor quando enviado com compressão (ex: reads.fastq -> reads.fastq.gz)"""
+    return os.path.basename(path) + ".gz"
+
+def gzip_member(data, level=6):
+    """
+    Comprime um bloco como um membro gzip completo
+
+    Membros concatenados formam um arquivo .gz válido (como o pigz/bgzip),
+    lido normalmente pelo SPAdes. O zlib libera o GIL durante a compressão,
+    permitindo comprimir vários blocos em paralelo com threads.
+
+    Args:
+        data: Bytes do bloco
+        level: Nível de compressão (1-9)
+
+    Returns:
+        bytes: Membro gzip
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    body = compressor.compress(data) + compressor.flush()
+    # Cabeçalho fixo (sem nome nem data) para que a saída seja determinística
+    header = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+    trailer = struct.pack("<II", zlib.crc32(data) & 0xFFFFFFFF, len(data) & 0xFFFFFFFF)
+    return header + body + trailer
+
+class CompressedUploader:
+    """Envia leituras não comprimidas como .gz, comprimindo em paralelo durante o envio (sem arquivo temporário)"""
+    def __init__(self, pool, key, workers=None, level=6, block_size=COMPRESS_BLOCK_SIZE, progress_callback=None):
+        """
+        Inicializa o envio comprimido
+
+        Args:
+            pool: SSHSessionPool com as credenciais do servidor
+            key: Chave do servidor no pool
+            workers: Threads de compressão (padrão: número de CPUs locais)
+            level: Nível de compressão gzip
+            block_size: Tamanho dos blocos de entrada
+            progress_callback: Função opcional (lidos, total) com o progresso somado dos arquivos
+        """
+        self.pool = pool
+        self.key = key
+        self.workers = workers or os.cpu_count() or 2
+        self.level = level
+        self.block_size = block_size
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._read = 0
+        self._total = 0
+        self.uploaded = {}  # caminho remoto -> (SHA-256, tamanho) dos arquivos comprimidos enviados
+
+    def _add_progress(self, count):
+        with self._lock:
+            self._read += count
+            read, total = self._read, self._total
+        if self.progress_callback:
+            self.progress_callback(read, total)
+
+    def _compressed_blocks(self, executor, local_path, start):
+        """Lê o arquivo a partir de 'start' e produz (bytes_lidos, membro_gzip) na ordem original"""
+        window = deque()
+        with open(local_path, "rb") as local_file:
+            local_file.seek(start)
+            while True:
+                # Manter um número limitado de blocos em compressão (memória limitada)
+                while len(window) < self.workers * 2:
+                    data = local_file.read(self.block_size)
+                    if not data:
+                        break
+                    window.append((len(data), executor.submit(gzip_member, data, self.level)))
+                if not window:
+                    return
+                length, future = window.popleft()
+                yield length, future.result()
+
+    def _upload_one(self, executor, link, local_path, remote_path):
+        """
+        Comprime e envia um arquivo, retomando do último bloco confirmado após quedas
+
+        Returns:
+            tuple: (SHA-256, tamanho) do arquivo comprimido enviado
+        """
+        part_path = remote_path + PART_SUFFIX
+        # Fronteiras de bloco: (posição na entrada, posição na saída, estado do hash)
+        boundaries = [(0, 0, hashlib.sha256())]
+        state = {"first": True, "read": 0}
+
+        def _send(client):
+            sftp = ParallelUploader.open_sftp(client)
+            try:
+                in_offset, out_offset, digest = boundaries[-1]
+                if not state["first"]:
+                    # Voltar ao último bloco totalmente confirmado pelo servidor
+                    try:
+                        remote_size = sftp.stat(part_path).st_size
+                    except IOError:
+                        remote_size = 0
+                    while len(boundaries) > 1 and boundaries[-1][1] > remote_size:
+                        boundaries.pop()
+                    in_offset, out_offset, digest = boundaries[-1]
+                    self._add_progress(-(state["read"] - in_offset))
+                    log_info(f"Retomando envio comprimido de {os.path.basename(local_path)} a partir de {in_offset} bytes")
+                state["first"] = False
+                state["read"] = in_offset
+
+                with sftp.open(part_path, "r+b" if out_offset else "wb") as remote_file:
+                    remote_file.truncate(out_offset)
+                    remote_file.seek(out_offset)
+                    remote_file.set_pipelined(True)
+                    digest = digest.copy()
+                    for length, member in self._compressed_blocks(executor, local_path, in_offset):
+                        remote_file.write(member)
+                        digest.update(member)
+                        in_offset += length
+                        out_offset += len(member)
+                        boundaries.append((in_offset, out_offset, digest.copy()))
+                        state["read"] = in_offset
+                        self._add_progress(length)
+                return digest.hexdigest(), out_offset
+            finally:
+                sftp.close()
+
+        return link.with_retry(_send, f"envio comprimido de {os.path.basename(local_path)}")
+
+    def upload(self, files):
+        """
+        Comprime e envia os arquivos, conferindo o SHA-256 do resultado no servidor
+
+        O hash e o tamanho de cada arquivo concluído ficam em self.uploaded.
+
+        Args:
+            files: Lista de tuplas (caminho_local, caminho_remoto_gz)
+
+        Returns:
+            dict: Erros por caminho remoto (vazio se todos foram enviados)
+        """
+        failures = {}
+        self._read = 0
+        self._total = sum(os.path.getsize(local_path) for local_path, _ in files)
+        results = {}
+        self.uploaded = {}
+        scope = current_scope()
+
+        def _worker(local_path, remote_path, executor):
+            link = ReconnectingSession(self.pool, self.key, dedicated=True, scope=scope)
+            try:
+                results[remote_path] = self._upload_one(executor, link, local_path, remote_path)
+            except Exception as e:
+                failures[remote_path] = str(e)
+            finally:
+                link.close()
+
+        # R1 e R2 são comprimidos e enviados ao mesmo tempo, compartilhando as threads de compressão
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="spades-gzip") as executor:
+            threads = []
+            for local_path, remote_path in files:
+                log_info(f"Enviando {os.path.basename(local_path)} com compressão gzip em {self.workers} threads")
+                thread = threading.Thread(target=_worker, args=(local_path, remote_path, executor), daemon=True)
+                threads.append(thread)
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with ReconnectingSession(self.pool, self.key) as link:
+            for local_path, remote_path in files:
+                if remote_path in failures:
+                    continue
+                part_path = remote_path + PART_SUFFIX
+                status, remote_hash, _ = link.exec_idempotent(remote_sha256_command(part_path))
+                remote_hash = remote_hash.strip()
+                if status == 0 and len(remote_hash) == 64 and remote_hash != results[remote_path][0]:
+                    failures[remote_path] = "SHA-256 do arquivo comprimido não confere com o enviado"
+                    continue
+                if status != 0 or len(remote_hash) != 64:
+                    log_warning(f"sha256sum indisponível no servidor. {os.path.basename(remote_path)} não foi verificado.")
+                status, _, error = link.exec_idempotent(
+                    f"mv -f {quote_remote_path(part_path)} {quote_remote_path(remote_path)}"
+                )
+                if status != 0:
+                    failures[remote_path] = f"Erro ao concluir o arquivo remoto: {error.strip()}"
+                    continue
+                self.uploaded[remote_path] = results[remote_path]
+        return failures
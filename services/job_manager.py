@@ -6,26 +6,77 @@ import socket
 import threading
 import time
 import re
+import shlex
 from datetime import datetime
 import tarfile
 import paramiko
 import scp
 from utils.logging_utils import log_info, log_error, log_warning
+from services.ssh_pool import SSHSessionPool
+from services.remote_batch import RemoteBatch, quote_remote_path
+from services.remote_agent import RemoteMonitorAgent
+from services.reconnect import ReconnectingSession
+from services.transfer_engine import ParallelUploader
+from utils.hash_index import get_hash_index
+from services.remote_dedup import RemoteDeduplicator
+from services.compressed_upload import CompressedUploader, compressed_name, is_compressed
+from utils.progress import ProgressAggregator
+from services.remote_browser import is_remote_read, remote_read_path
+from services.job_supervisor import JobSupervisor, job_files, SUPERVISOR_SAMPLE_SECONDS, JOB_PENDING, JOB_RUNNING, JOB_FINISHED, JOB_CANCELLED
+from services.backends import get_backend, DirectBackend
+from services.checkpoint import inspect_output, build_resume_command
+from services.autotune import input_volume
+from services.storage_probe import probe_scratch, choose_scratch, required_space, scratch_tmp_dir
+from services.read_prep import build_prep_command, validate_normalization, parse_prep_summary, prep_dir, PREP_SUMMARY
+from models.job_registry import get_job_registry
+
+# Tempo (segundos) em que os recursos lidos na conexão são reaproveitados
+RESOURCES_CACHE_SECONDS = 15
+
+# Tempo (segundos) em que a medição dos diretórios temporários é reaproveitada
+SCRATCH_PROBE_CACHE_SECONDS = 600
+
+# Intervalo (segundos) entre verificações do job pelo manifesto e pelos logs
+MONITOR_POLL_SECONDS = 30
+
+# Intervalo (segundos) entre verificações do término do processo com o agente remoto ativo
+AGENT_POLL_SECONDS = 2
+
+# Falhas consecutivas de verificação após as quais o job é considerado finalizado
+MONITOR_MAX_FAILURES = 5
 
 class JobManager:
     """Classe para gerenciar trabalhos do SPAdes remotamente"""
-    def __init__(self, status_updater, ssh_utils=None):
+    def __init__(self, status_updater, ssh_utils=None, session_pool=None, capability_store=None):
         self.status_updater = status_updater
+        self.capability_store = capability_store  # ServerProfile (cache de capacidades por servidor)
+        self.capabilities = {}
+        self._resources_cache = None  # (timestamp, dict)
+        self._scratch_cache = {}  # diretório remoto -> (timestamp, medições de probe_scratch)
+        self.session_pool = session_pool if session_pool is not None else SSHSessionPool()
+        self.session_key = None
         self.ssh = None
         self.scp_client = None
         self.connected = False
         self.job_running = False
         self.job_id = None
         self.connection_info = {}
+        self.profile_name = ""  # Perfil de servidor usado na conexão (registrado no histórico)
         self.spades_path = None 
         self.job_pid = None
+        self.job_pgid = None  # Grupo de processos do job (manifesto do supervisor)
+        self.job_manifest = None  # Caminho remoto do manifesto do job em execução
+        self.job_key = None  # Identificador do job no supervisor (ponteiro no registro remoto)
+        self.job_state = None  # Último estado conhecido do job atual (manifesto, backend e id no escalonador)
         self.job_output_file = None
-        self.allocated_memory = 0  # Memória alocada em MB
+        self.allocated_memory = 0  # Memória alocada (GB, opção -m do SPAdes)
+        self.job_threads = 0  # Threads do job atual (opção -t)
+        self.use_monitor_agent = True  # Usar agente remoto (JSON por canal único) quando disponível
+        self.monitor_agent = None
+        self.link = None  # Camada de reconexão da sessão principal
+        self.monitor_scheduler = None  # Função opcional (remote_dir, job_id, output_dir) que agenda o monitoramento do job
+        self.uploaded_names = {}  # nome local -> nome no servidor (ex: reads.fastq -> reads.fastq.gz)
+        self.transfer_progress = ProgressAggregator(self.status_updater.update_transfer)
         
     def connect(self, host, port, username, password=None, key_path=None, use_key=False):
         """
@@ -77,13 +128,6 @@ class JobManager:
                 "username": username
             }
             
-            # Limpar conexões anteriores
-            if self.ssh is not None:
-                self.ssh.close()
-                
-            self.ssh = paramiko.SSHClient()
-            self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
             # Conectar com chave ou senha
             connect_kwargs = {
                 "hostname": host,
@@ -102,27 +146,23 @@ class JobManager:
             else:
                 connect_kwargs["password"] = password
                 
-            # Tentar conectar
-            self.ssh.connect(**connect_kwargs)
-                
-             # Verificar se o SPAdes está instalado
-            # Primeiro tentar o comando which
-            stdin, stdout, stderr = self.ssh.exec_command("which spades.py || echo 'NOT_FOUND'")
-            spades_path = stdout.read().decode().strip()
-            
-            # Se não encontrar com which, verificar manualmente os locais comuns
-            if spades_path == 'NOT_FOUND':
-                from config.settings import COMMON_SPADES_PATHS
-                
-                for path in COMMON_SPADES_PATHS:
-                    path = os.path.expanduser(path)  # Expandir '~' se presente
-                    stdin, stdout, stderr = self.ssh.exec_command(f"[ -f {path} ] && [ -x {path} ] && echo '{path}' || echo 'NOT_FOUND'")
-                    result = stdout.read().decode().strip()
-                    if result != 'NOT_FOUND':
-                        spades_path = result
-                        break
+            # Obter sessão do pool (reutiliza sessão autenticada se ainda estiver ativa)
+            self.session_key = SSHSessionPool.make_key(host, port, username)
+            self.ssh, reused = self.session_pool.get_primary(self.session_key, connect_kwargs)
+            if reused:
+                self.status_updater.update_log("Reutilizando sessão SSH já autenticada", "INFO")
+            self.link = ReconnectingSession(self.session_pool, self.session_key, on_reconnect=self._on_reconnected)
+            self.link.client = self.ssh
+                
+            # Localizar o SPAdes, validar as capacidades em cache e ler os recursos
+            # do servidor em um único script remoto (uma ida e volta)
+            cached = self._get_cached_capabilities()
+            probe = self._build_capability_batch(cached).run(self.ssh, timeout=60)
+            self._resources_cache = (time.time(), self._resources_from_probe(probe))
+            spades_path = probe.get("spades_path") or 'NOT_FOUND'
             
             if spades_path == 'NOT_FOUND':
+                self.capabilities = {}
                 self.status_updater.update_status("Erro: SPAdes não encontrado automaticamente")
                 self.status_updater.update_log("SPAdes não encontrado automaticamente no servidor. Um diálogo será exibido para configuração manual.", "WARNING")
                 return False
@@ -130,12 +170,14 @@ class JobManager:
             # Armazenar o caminho do SPAdes para uso posterior
             self.spades_path = spades_path
             self.status_updater.update_log(f"SPAdes encontrado: {spades_path}", "SUCCESS")
+            self._update_capabilities(cached, probe)
             
             # Criar cliente SCP
             transport = self.ssh.get_transport()
             if transport is None:
                 self.status_updater.update_log("Erro ao obter transporte SSH", "ERROR")
-                self.ssh.close()
+                self.session_pool.invalidate(self.session_key, self.ssh)
+                self.ssh = None
                 return False
                 
             self.scp_client = scp.SCPClient(transport, progress=self._progress_callback)
@@ -168,13 +210,159 @@ class JobManager:
             self.status_updater.update_log(f"Erro ao conectar: {str(e)}", "ERROR")
             return False
             
-    def disconnect(self):
-        """Desconecta do servidor"""
-        if self.ssh:
+    def _get_cached_capabilities(self):
+        """Retorna as capacidades armazenadas para o servidor da conexão atual"""
+        if not self.capability_store or not self.connection_info:
+            return {}
+        info = self.connection_info
+        return self.capability_store.get_capabilities(info["host"], info["port"], info["username"])
+        
+    def _save_capabilities(self):
+        """Persiste as capacidades do servidor da conexão atual"""
+        if not self.capability_store or not self.connection_info:
+            return
+        info = self.connection_info
+        self.capability_store.save_capabilities(info["host"], info["port"], info["username"], self.capabilities)
+        
+    def _build_capability_batch(self, cached):
+        """
+        Monta o lote remoto de descoberta do SPAdes e dos recursos do servidor
+        
+        A versão e as flags do SPAdes só são consultadas (--version/--help) quando
+        o executável mudou em relação ao cache (caminho, mtime, inode e tamanho).
+        
+        Args:
+            cached: Capacidades em cache (pode ser vazio)
+            
+        Returns:
+            RemoteBatch: Lote pronto para execução
+        """
+        from config.settings import COMMON_SPADES_PATHS
+        candidates = []
+        if cached.get("spades_path"):
+            candidates.append(quote_remote_path(cached["spades_path"]))
+        candidates.append('"$(command -v spades.py)"')
+        candidates.extend(quote_remote_path(path) for path in COMMON_SPADES_PATHS if path != "spades.py")
+        cached_stamp = shlex.quote(cached.get("spades_stamp", ""))
+        stale = f'[ -n "$SM_SPADES" ] && {{ [ -z "$SM_STAMP" ] || [ "$SM_STAMP" != {cached_stamp} ]; }}'
+        
+        batch = RemoteBatch()
+        batch.add(
+            "spades_path",
+            f'SM_SPADES=""; for p in {" ".join(candidates)}; do '
+            f'if [ -n "$p" ] && [ -f "$p" ] && [ -x "$p" ]; then SM_SPADES="$p"; break; fi; done; echo "$SM_SPADES"'
+        )
+        batch.add(
+            "spades_stamp",
+            'SM_STAMP=""; [ -n "$SM_SPADES" ] && s=$(stat -L -c \'%Y:%i:%s\' "$SM_SPADES") && SM_STAMP="$SM_SPADES:$s"; echo "$SM_STAMP"'
+        )
+        batch.add("spades_version", f'{stale} && "$SM_SPADES" --version 2>&1 | head -1')
+        batch.add("spades_flags", f'{stale} && "$SM_SPADES" --help 2>&1 | grep -o -- "--[a-z][a-z0-9-]*" | sort -u | tr "\\n" " "')
+        self._add_resource_probes(batch)
+        return batch
+        
+    def _update_capabilities(self, cached, probe):
+        """
+        Atualiza as capacidades do servidor a partir do resultado do lote de conexão
+        
+        Args:
+            cached: Capacidades em cache usadas para montar o lote
+            probe: Resultados do lote (ver _build_capability_batch)
+        """
+        stamp = probe.get("spades_stamp", "")
+        resources = self._resources_cache[1] if self._resources_cache else {}
+        
+        if stamp and stamp == cached.get("spades_stamp") and cached.get("spades_version"):
+            self.capabilities = dict(cached)
+            self.status_updater.update_log("Capacidades do servidor em cache ainda válidas", "INFO")
+        else:
+            self.capabilities = {
+                "spades_path": self.spades_path,
+                "spades_stamp": stamp,
+                "spades_version": probe.get("spades_version", ""),
+                "supported_flags": probe.get("spades_flags", "").split()
+            }
+            
+        if isinstance(resources.get("cpu_count"), int):
+            self.capabilities["cpu_count"] = resources["cpu_count"]
+        if isinstance(resources.get("total_mem"), int):
+            self.capabilities["total_mem_mb"] = resources["total_mem"]
+            
+        if self.capabilities != cached:
+            self.capabilities["checked_at"] = datetime.now().isoformat(timespec="seconds")
+            self._save_capabilities()
+            
+        if self.capabilities.get("spades_version"):
+            self.status_updater.update_log(f"Versão do SPAdes: {self.capabilities['spades_version']}", "SUCCESS")
+            
+    def set_spades_path(self, path, version=None):
+        """
+        Define manualmente o caminho do SPAdes e atualiza as capacidades do servidor
+        
+        Args:
+            path: Caminho do executável no servidor
+            version: Versão informada pelo executável (opcional)
+        """
+        self.spades_path = path
+        # Sem o carimbo do executável: a próxima conexão revalida versão e flags
+        self.capabilities = {
+            "spades_path": path,
+            "spades_version": version or "",
+            "supported_flags": [],
+            "checked_at": datetime.now().isoformat(timespec="seconds")
+        }
+        self._save_capabilities()
+        
+    def supports_flag(self, flag):
+        """
+        Verifica se a versão do SPAdes no servidor aceita uma flag
+        
+        Returns:
+            bool: True se aceita ou se as flags ainda não são conhecidas
+        """
+        flags = self.capabilities.get("supported_flags")
+        return not flags or flag in flags
+            
+    def _on_reconnected(self, client):
+        """Atualiza a sessão principal e o cliente SCP após uma reconexão automática"""
+        self.ssh = client
+        try:
+            if self.scp_client:
+                self.scp_client.close()
+            self.scp_client = scp.SCPClient(client.get_transport(), progress=self._progress_callback)
+        except Exception:
+            self.scp_client = None
+        self.status_updater.update_log("Conexão com o servidor restabelecida", "SUCCESS")
+        
+    def is_connected_to(self, host, port, username):
+        """
+        Verifica se já existe uma sessão ativa para o servidor informado
+        
+        Returns:
+            bool: True se conectado ao mesmo host/porta/usuário
+        """
+        if not self.connected or not self.session_key:
+            return False
+        host = (host or "").strip().split(":")[0]
+        port = int(port.strip()) if port and str(port).strip().isdigit() else 22
+        key = SSHSessionPool.make_key(host, port, (username or "").strip())
+        return key == self.session_key and self.session_pool.has_session(key)
+        
+    def disconnect(self, keep_session=True):
+        """
+        Desconecta do servidor
+        
+        Args:
+            keep_session: Se True, mantém a sessão SSH aquecida no pool para reutilização
+        """
+        self._stop_monitor_agent()
+        self.link = None
+        if not keep_session and self.session_key:
             try:
-                self.ssh.close()
+                self.session_pool.close(self.session_key)
             except Exception as e:
                 self.status_updater.update_log(f"Erro ao desconectar SSH: {str(e)}", "WARNING")
+        self.ssh = None
                 
         if self.scp_client:
             try:
@@ -196,45 +384,69 @@ class JobManager:
         if not self.connected or not self.ssh:
             return None
             
-        try:
-            # Verificar CPU
-            stdin, stdout, stderr = self.ssh.exec_command("nproc 2>/dev/null || echo 'unknown'")
-            cpu_output = stdout.read().decode().strip()
-            cpu_count = int(cpu_output) if cpu_output.isdigit() else "Desconhecido"
-            
-            # Verificar RAM
-            stdin, stdout, stderr = self.ssh.exec_command("free -m 2>/dev/null | grep Mem || echo 'unknown'")
-            mem_output = stdout.read().decode().strip()
-            
-            if mem_output and mem_output != 'unknown':
-                mem_info = mem_output.split()
-                if len(mem_info) >= 4:
-                    total_mem = int(mem_info[1])
-                    used_mem = int(mem_info[2])
-                    free_mem = int(mem_info[3])
-                else:
-                    total_mem = used_mem = free_mem = "Desconhecido"
-            else:
-                total_mem = used_mem = free_mem = "Desconhecido"
+        # Reaproveitar a leitura feita no lote de conexão, se recente
+        if self._resources_cache and time.time() - self._resources_cache[0] < RESOURCES_CACHE_SECONDS:
+            return dict(self._resources_cache[1])
             
-            # Verificar espaço em disco
-            stdin, stdout, stderr = self.ssh.exec_command("df -h --output=avail / 2>/dev/null | tail -1 || echo 'unknown'")
-            disk_avail = stdout.read().decode().strip()
-            
-            resources = {
-                "cpu_count": cpu_count,
-                "total_mem": total_mem,
-                "used_mem": used_mem,
-                "free_mem": free_mem,
-                "disk_avail": disk_avail
-            }
-            
-            return resources
+        try:
+            # CPU, RAM e disco em uma única ida e volta
+            batch = RemoteBatch()
+            self._add_resource_probes(batch)
+            resources = self._resources_from_probe(self.link.run_batch(batch, timeout=30))
+            self._resources_cache = (time.time(), resources)
+            return dict(resources)
             
         except Exception as e:
             self.status_updater.update_log(f"Erro ao verificar recursos: {str(e)}", "ERROR")
             return None
             
+    @staticmethod
+    def _add_resource_probes(batch):
+        """Adiciona ao lote as consultas de CPU, memória e disco"""
+        batch.add("cpu_count", "nproc")
+        batch.add("mem", "free -m | grep Mem")
+        batch.add("disk_avail", "df -h --output=avail / | tail -1")
+        batch.add("load_avg", "cut -d' ' -f1 /proc/loadavg")
+        
+    @staticmethod
+    def _resources_from_probe(probe):
+        """
+        Converte o resultado das consultas de recursos no dicionário de check_server_resources
+        
+        Args:
+            probe: Resultados do lote (ver _add_resource_probes)
+            
+        Returns:
+            dict: Informações de CPU, memória e disco
+        """
+        cpu_output = probe.get("cpu_count", "")
+        cpu_count = int(cpu_output) if cpu_output.isdigit() else "Desconhecido"
+        
+        total_mem = used_mem = free_mem = available_mem = "Desconhecido"
+        mem_info = probe.get("mem", "").split()
+        if len(mem_info) >= 4 and all(value.isdigit() for value in mem_info[1:4]):
+            total_mem = int(mem_info[1])
+            used_mem = int(mem_info[2])
+            free_mem = int(mem_info[3])
+            # Coluna 'available' do free (inclui cache liberável); 'free' em versões antigas
+            available_mem = int(mem_info[6]) if len(mem_info) >= 7 and mem_info[6].isdigit() else free_mem
+            
+        # Carga média do último minuto (processos de todos os usuários)
+        try:
+            load_avg = float(probe.get("load_avg", ""))
+        except ValueError:
+            load_avg = "Desconhecido"
+            
+        return {
+            "cpu_count": cpu_count,
+            "total_mem": total_mem,
+            "used_mem": used_mem,
+            "free_mem": free_mem,
+            "available_mem": available_mem,
+            "load_avg": load_avg,
+            "disk_avail": probe.get("disk_avail") or "unknown"
+        }
+            
     def prepare_remote_dir(self, remote_dir):
         """
         Prepara o diretório remoto para receber os arquivos
@@ -257,67 +469,66 @@ class JobManager:
                 remote_dir = "/tmp/spades_jobs"
                 self.status_updater.update_log(f"Usando diretório remoto padrão: {remote_dir}")
                 
-            # Verificar se o diretório já existe
-            stdin, stdout, stderr = self.ssh.exec_command(f"[ -d \"{remote_dir}\" ] && echo 'EXISTS' || echo 'NOT_EXISTS'")
-            dir_exists = stdout.read().decode().strip()
+            # Todas as verificações (existência, permissões, criação, diretório
+            # alternativo e teste de escrita) são feitas em um único script remoto
+            alt_remote_dir = "/tmp/spades_jobs_" + datetime.now().strftime("%Y%m%d%H%M%S")
+            quoted_dir = quote_remote_path(remote_dir)
+            quoted_alt = quote_remote_path(alt_remote_dir)
+            
+            batch = RemoteBatch()
+            batch.add("existed", f"[ -d {quoted_dir} ] && echo 1 || echo 0")
+            batch.add("chmod", f"[ -d {quoted_dir} ] && (chmod u+rwx {quoted_dir} && echo OK || echo ERROR)")
+            batch.add(
+                "mkdir",
+                f"if [ -d {quoted_dir} ]; then echo SKIP; "
+                f"elif mkdir -p {quoted_dir} 2>&1 && chmod 755 {quoted_dir}; then echo OK; "
+                f"else echo ERROR; fi"
+            )
+            batch.add(
+                "target",
+                f"if [ -d {quoted_dir} ]; then echo {quoted_dir}; "
+                f"elif mkdir -p {quoted_alt} && chmod 755 {quoted_alt}; then echo {quoted_alt}; fi"
+            )
+            batch.add("perms", f"ls -ld {quoted_dir} || ls -ld {quoted_alt}")
+            batch.add(
+                "write",
+                f'd={quoted_dir}; [ -d "$d" ] || d={quoted_alt}; '
+                f'result=ERROR; for i in 1 2 3; do '
+                f'if touch "$d/.test_write" && rm "$d/.test_write"; then result="OK:$i"; break; fi; '
+                f'chmod -R u+rwx "$d"; sleep 1; done; echo "$result"'
+            )
+            results = batch.run(self.ssh, timeout=60)
             
-            if dir_exists == 'EXISTS':
+            if results.get("existed") == "1":
                 self.status_updater.update_log(f"Diretório remoto já existe: {remote_dir}")
-                
-                # Verificar permissões do diretório existente
-                stdin, stdout, stderr = self.ssh.exec_command(f"ls -ld \"{remote_dir}\"")
-                dir_perms = stdout.read().decode().strip()
-                self.status_updater.update_log(f"Permissões do diretório remoto: {dir_perms}", "INFO")
-                
-                # Tentar corrigir permissões se necessário
-                stdin, stdout, stderr = self.ssh.exec_command(f"chmod u+rwx \"{remote_dir}\" 2>/dev/null && echo 'OK' || echo 'ERROR'")
-                chmod_result = stdout.read().decode().strip()
-                if chmod_result == 'OK':
+                if results.get("chmod") == "OK":
                     self.status_updater.update_log(f"Permissões do diretório remoto atualizadas", "INFO")
+            elif results.get("mkdir", "").endswith("OK"):
+                self.status_updater.update_log(f"Diretório remoto criado: {remote_dir}", "SUCCESS")
             else:
-                # Criar diretório com permissões explícitas
-                stdin, stdout, stderr = self.ssh.exec_command(f"mkdir -p \"{remote_dir}\" && chmod 755 \"{remote_dir}\"")
-                exit_status = stdout.channel.recv_exit_status()
+                error = results.get("mkdir", "").replace("ERROR", "").strip()
+                self.status_updater.update_log(f"Erro ao criar diretório remoto: {error}", "ERROR")
+                self.status_updater.update_log(f"Tentando criar diretório alternativo: {alt_remote_dir}", "WARNING")
                 
-                if exit_status == 0:
-                    self.status_updater.update_log(f"Diretório remoto criado: {remote_dir}", "SUCCESS")
-                else:
-                    error = stderr.read().decode().strip()
-                    self.status_updater.update_log(f"Erro ao criar diretório remoto: {error}", "ERROR")
-                    
-                    # Tentar criar em um local alternativo
-                    alt_remote_dir = "/tmp/spades_jobs_" + datetime.now().strftime("%Y%m%d%H%M%S")
-                    self.status_updater.update_log(f"Tentando criar diretório alternativo: {alt_remote_dir}", "WARNING")
-                    
-                    stdin, stdout, stderr = self.ssh.exec_command(f"mkdir -p \"{alt_remote_dir}\" && chmod 755 \"{alt_remote_dir}\"")
-                    alt_exit_status = stdout.channel.recv_exit_status()
-                    
-                    if alt_exit_status == 0:
-                        remote_dir = alt_remote_dir
-                        self.status_updater.update_log(f"Diretório alternativo criado: {remote_dir}", "SUCCESS")
-                    else:
-                        alt_error = stderr.read().decode().strip()
-                        self.status_updater.update_log(f"Erro ao criar diretório alternativo: {alt_error}", "ERROR")
-                        return False
+                if results.get("target") != alt_remote_dir:
+                    self.status_updater.update_log(f"Erro ao criar diretório alternativo: {alt_remote_dir}", "ERROR")
+                    return False
                     
-            # Verificar permissões com múltiplas tentativas
-            max_attempts = 3
-            for attempt in range(1, max_attempts + 1):
-                stdin, stdout, stderr = self.ssh.exec_command(f"touch \"{remote_dir}/.test_write\" && rm \"{remote_dir}/.test_write\" && echo 'OK' || echo 'ERROR'")
-                write_test = stdout.read().decode().strip()
-                
-                if write_test == 'OK':
-                    self.status_updater.update_log(f"Permissão de escrita confirmada no diretório remoto", "SUCCESS")
-                    return True
-                else:
-                    if attempt < max_attempts:
-                        self.status_updater.update_log(f"Tentativa {attempt}/{max_attempts}: Sem permissão de escrita. Tentando corrigir...", "WARNING")
-                        # Tentar corrigir permissões
-                        stdin, stdout, stderr = self.ssh.exec_command(f"chmod -R u+rwx \"{remote_dir}\" 2>/dev/null")
-                        time.sleep(1)  # Pequena pausa entre tentativas
-                    else:
-                        self.status_updater.update_log(f"Aviso: Sem permissão de escrita no diretório remoto após {max_attempts} tentativas", "WARNING")
-                        # Continuar mesmo com o aviso, pois algumas operações ainda podem funcionar
+                remote_dir = alt_remote_dir
+                self.status_updater.update_log(f"Diretório alternativo criado: {remote_dir}", "SUCCESS")
+                
+            if results.get("perms"):
+                self.status_updater.update_log(f"Permissões do diretório remoto: {results['perms']}", "INFO")
+                
+            write_test = results.get("write", "ERROR")
+            if write_test.startswith("OK"):
+                attempt = write_test.split(":")[-1]
+                if attempt != "1":
+                    self.status_updater.update_log(f"Permissões corrigidas após {attempt} tentativas", "WARNING")
+                self.status_updater.update_log(f"Permissão de escrita confirmada no diretório remoto", "SUCCESS")
+            else:
+                self.status_updater.update_log(f"Aviso: Sem permissão de escrita no diretório remoto após 3 tentativas", "WARNING")
+                # Continuar mesmo com o aviso, pois algumas operações ainda podem funcionar
             
             return True
                 
@@ -325,13 +536,14 @@ class JobManager:
             self.status_updater.update_log(f"Erro ao preparar diretório remoto: {str(e)}", "ERROR")
             return False
             
-    def upload_files(self, local_files, remote_dir):
+    def upload_files(self, local_files, remote_dir, compress=False):
         """
         Envia arquivos para o servidor remoto
         
         Args:
-            local_files: Lista de caminhos dos arquivos locais
+            local_files: Lista de caminhos dos arquivos locais (ou leituras já no servidor, ver remote_browser)
             remote_dir: Caminho do diretório remoto
+            compress: Se True, leituras não comprimidas são enviadas como .gz (compressão durante o envio)
             
         Returns:
             bool: True se enviados com sucesso
@@ -341,7 +553,7 @@ class JobManager:
             
         try:
             # Validar arquivos
-            if not local_files or not all(os.path.exists(f) for f in local_files):
+            if not local_files or not all(is_remote_read(f) or os.path.exists(f) for f in local_files):
                 self.status_updater.update_log("Arquivos locais inválidos ou não encontrados", "ERROR")
                 return False
                 
@@ -350,6 +562,15 @@ class JobManager:
                 self.status_updater.update_log("Diretório remoto não especificado", "ERROR")
                 return False
                 
+            # Leituras que já estão no servidor são apenas ligadas ao diretório remoto
+            remote_reads = [f for f in local_files if is_remote_read(f)]
+            if remote_reads:
+                if not self.link_remote_reads(remote_reads, remote_dir):
+                    return False
+                local_files = [f for f in local_files if not is_remote_read(f)]
+                if not local_files:
+                    return True
+                
             self.status_updater.update_status("Enviando arquivos...")
             
             # Verificar espaço em disco
@@ -359,123 +580,204 @@ class JobManager:
             self.status_updater.update_log(f"Tamanho total dos arquivos: {total_size_mb:.2f} MB")
             
             # Verificar permissões do diretório remoto antes de iniciar transferência
-            stdin, stdout, stderr = self.ssh.exec_command(f"ls -ld \"{remote_dir}\"")
-            dir_perms = stdout.read().decode().strip()
-            self.status_updater.update_log(f"Permissões do diretório remoto: {dir_perms}", "INFO")
-            
-            # Tentar corrigir permissões se necessário
-            stdin, stdout, stderr = self.ssh.exec_command(f"chmod u+rwx \"{remote_dir}\" 2>/dev/null && echo 'OK' || echo 'ERROR'")
-            chmod_result = stdout.read().decode().strip()
-            if chmod_result == 'OK':
+            # e tentar corrigi-las se necessário (ambos são seguros de repetir)
+            quoted_dir = quote_remote_path(remote_dir)
+            batch = RemoteBatch()
+            batch.add("perms", f"ls -ld {quoted_dir}")
+            batch.add("chmod", f"chmod u+rwx {quoted_dir} && echo 'OK' || echo 'ERROR'")
+            permissions = self.link.run_batch(batch, timeout=30)
+            self.status_updater.update_log(f"Permissões do diretório remoto: {permissions.get('perms', '')}", "INFO")
+            
+            if permissions.get("chmod") == 'OK':
                 self.status_updater.update_log(f"Permissões do diretório remoto atualizadas", "INFO")
-            
-            # Recriar cliente SCP para garantir conexão fresca
-            try:
-                if self.scp_client:
-                    self.scp_client.close()
-                transport = self.ssh.get_transport()
-                if transport is None:
-                    self.status_updater.update_log("Erro ao obter transporte SSH. Reconectando...", "WARNING")
-                    # Reconectar usando informações armazenadas
-                    if self.connection_info and self.connection_info.get("host"):
-                        self.ssh.close()
-                        self.ssh = paramiko.SSHClient()
-                        self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                        self.ssh.connect(
-                            hostname=self.connection_info.get("host"),
-                            port=self.connection_info.get("port", 22),
-                            username=self.connection_info.get("username"),
-                            timeout=10
-                        )
-                        transport = self.ssh.get_transport()
-                    else:
-                        self.status_updater.update_log("Não foi possível reconectar - informações de conexão ausentes", "ERROR")
-                        return False
                 
-                self.scp_client = scp.SCPClient(transport, progress=self._progress_callback)
-            except Exception as scp_error:
-                self.status_updater.update_log(f"Erro ao criar cliente SCP: {str(scp_error)}", "ERROR")
-                return False
+            for local_file in local_files:
+                file_size_mb = os.path.getsize(local_file) / (1024 * 1024)
+                self.status_updater.update_log(f"Enviando arquivo: {os.path.basename(local_file)} ({file_size_mb:.2f} MB)")
             
-            # Enviar arquivos com mecanismo de retry
-            max_retries = 3
+            # Leituras não comprimidas podem ser comprimidas durante o envio (.fastq -> .fastq.gz)
+            compressed = [local_file for local_file in local_files if compress and not is_compressed(local_file)]
             for local_file in local_files:
-                if not os.path.exists(local_file):
-                    self.status_updater.update_log(f"Arquivo não encontrado: {local_file}", "ERROR")
+                name = compressed_name(local_file) if local_file in compressed else os.path.basename(local_file)
+                self.uploaded_names[os.path.basename(local_file)] = name
+            if compressed:
+                if not self._upload_compressed(compressed, remote_dir):
+                    return False
+                local_files = [local_file for local_file in local_files if local_file not in compressed]
+                
+            files = [(local_file, f"{remote_dir}/{os.path.basename(local_file)}") for local_file in local_files]
+            
+            # Pular arquivos cujo conteúdo (SHA-256) já está no servidor: no próprio
+            # destino ou em outro diretório, ligado ao destino por hardlink/symlink
+            self.status_updater.update_status("Comparando arquivos com o servidor...")
+            hash_index = get_hash_index()
+            hash_index.prefetch(local_files)
+            local_hashes = {remote_path: hash_index.get_digest(local_file) for local_file, remote_path in files}
+            entries = [(remote_path, local_hashes[remote_path], os.path.getsize(local_file)) for local_file, remote_path in files]
+            deduplicator = RemoteDeduplicator(self.link)
+            try:
+                placed = deduplicator.place(entries)
+            except Exception as dedup_error:
+                self.status_updater.update_log(f"Não foi possível consultar arquivos já enviados: {str(dedup_error)}", "WARNING")
+                placed = {}
+            for local_file, remote_path in files:
+                if placed.get(remote_path, "missing") != "missing":
+                    self.status_updater.update_log(f"Arquivo já presente no servidor, envio dispensado: {os.path.basename(local_file)}", "SUCCESS")
+            pending = [(local_file, remote_path) for local_file, remote_path in files if placed.get(remote_path, "missing") == "missing"]
+            
+            # Enviar todos os arquivos ao mesmo tempo, em faixas escritas por vários
+            # canais SFTP (sessões dedicadas do pool, com reconexão automática)
+            self.status_updater.update_status("Enviando arquivos...")
+            self.status_updater.update_progress(0)
+            uploader = ParallelUploader(self.session_pool, self.session_key,
+                                        progress_callback=lambda sent, total: self._sftp_progress_callback(sent, total, "Envio"))
+            try:
+                failures = uploader.upload(pending, local_hashes)
+            except Exception as sftp_error:
+                failures = {remote_path: str(sftp_error) for _, remote_path in pending}
+                
+            for local_file, remote_path in pending:
+                filename = os.path.basename(local_file)
+                if remote_path not in failures:
+                    self.status_updater.update_log(f"Arquivo enviado: {filename}", "SUCCESS")
                     continue
                     
-                filename = os.path.basename(local_file)
-                self.status_updater.update_log(f"Enviando arquivo: {filename}")
-                
-                # Verificar tamanho do arquivo
-                file_size = os.path.getsize(local_file)
-                file_size_mb = file_size / (1024 * 1024)
-                self.status_updater.update_log(f"Tamanho do arquivo: {file_size_mb:.2f} MB")
-                
-                # Tentar enviar com múltiplas tentativas
-                success = False
-                for attempt in range(1, max_retries + 1):
+                # SCP apenas se o envio via SFTP não for possível
+                self.status_updater.update_log(f"Envio via SFTP falhou: {failures[remote_path]}. Tentando SCP...", "WARNING")
+                try:
+                    scp_client = scp.SCPClient(self.link.get_client().get_transport(), progress=self._progress_callback)
                     try:
-                        # Tentar primeiro com SCP
-                        if self.scp_client:
-                            try:
-                                # Resetar a barra de progresso antes de iniciar a transferência
-                                self.status_updater.update_progress(0)
-                                self.scp_client.put(local_file, f"{remote_dir}/{filename}")
-                                # Garantir que a barra de progresso chegue a 100% ao finalizar
-                                self.status_updater.update_progress(100)
-                                success = True
-                                break
-                            except Exception as scp_error:
-                                self.status_updater.update_log(f"Tentativa {attempt}/{max_retries} com SCP falhou: {str(scp_error)}", "WARNING")
-                                
-                                # Se SCP falhar, tentar com SFTP
-                                try:
-                                    # Resetar a barra de progresso antes de iniciar a transferência com SFTP
-                                    self.status_updater.update_progress(0)
-                                    transport = self.ssh.get_transport()
-                                    sftp = paramiko.SFTPClient.from_transport(transport)
-                                    sftp.put(local_file, f"{remote_dir}/{filename}", callback=self._sftp_progress_callback)
-                                    sftp.close()
-                                    # Garantir que a barra de progresso chegue a 100% ao finalizar
-                                    self.status_updater.update_progress(100)
-                                    success = True
-                                    break
-                                except Exception as sftp_error:
-                                    self.status_updater.update_log(f"Tentativa {attempt}/{max_retries} com SFTP falhou: {str(sftp_error)}", "WARNING")
-                    except Exception as e:
-                        self.status_updater.update_log(f"Erro na tentativa {attempt}/{max_retries}: {str(e)}", "WARNING")
-                    
-                    if attempt < max_retries:
-                        self.status_updater.update_log(f"Tentando novamente em 2 segundos...", "INFO")
-                        time.sleep(2)  # Esperar antes de tentar novamente
-                        
-                        # Tentar recriar o cliente SCP
-                        try:
-                            if self.scp_client:
-                                self.scp_client.close()
-                            transport = self.ssh.get_transport()
-                            self.scp_client = scp.SCPClient(transport, progress=self._progress_callback)
-                        except Exception:
-                            pass
-                
-                if success:
+                        scp_client.put(local_file, remote_path)
+                    finally:
+                        scp_client.close()
                     self.status_updater.update_log(f"Arquivo enviado: {filename}", "SUCCESS")
-                else:
+                except Exception as scp_error:
+                    self.status_updater.update_log(f"Envio via SCP falhou: {str(scp_error)}", "WARNING")
+                    
                     # Verificar permissões do diretório remoto
-                    stdin, stdout, stderr = self.ssh.exec_command(f"ls -la \"{remote_dir}\"")
-                    dir_content = stdout.read().decode().strip()
-                    self.status_updater.update_log(f"Conteúdo do diretório remoto:\n{dir_content}", "INFO")
+                    try:
+                        _, dir_content, _ = self.link.exec_idempotent(f"ls -la {quote_remote_path(remote_dir)}", timeout=30)
+                        self.status_updater.update_log(f"Conteúdo do diretório remoto:\n{dir_content.strip()}", "INFO")
+                    except Exception as list_error:
+                        self.status_updater.update_log(f"Não foi possível listar o diretório remoto: {str(list_error)}", "WARNING")
                     
-                    self.status_updater.update_log(f"Falha ao enviar arquivo {filename} após {max_retries} tentativas", "ERROR")
+                    self.status_updater.update_log(f"Falha ao enviar arquivo {filename}", "ERROR")
                     return False
+                    
+            # Registrar os hashes no servidor para reaproveitar os arquivos em execuções futuras
+            try:
+                deduplicator.record(entries)
+            except Exception as record_error:
+                self.status_updater.update_log(f"Não foi possível registrar os hashes no servidor: {str(record_error)}", "WARNING")
                 
+            # Garantir que a barra de progresso chegue a 100% ao finalizar
+            self.status_updater.update_progress(100)
             return True
             
         except Exception as e:
             self.status_updater.update_log(f"Erro ao enviar arquivos: {str(e)}", "ERROR")
             return False
             
+    def link_remote_reads(self, remote_reads, remote_dir):
+        """
+        Cria links simbólicos no diretório remoto para leituras que já estão no servidor
+        
+        Args:
+            remote_reads: Leituras remotas (prefixo de remote_browser)
+            remote_dir: Diretório remoto do job
+            
+        Returns:
+            bool: True se todos os links foram criados
+        """
+        batch = RemoteBatch()
+        for position, remote_read in enumerate(remote_reads):
+            source = quote_remote_path(remote_read_path(remote_read))
+            dest = quote_remote_path(f"{remote_dir}/{os.path.basename(remote_read_path(remote_read))}")
+            batch.add(
+                f"link_{position}",
+                f"if [ ! -r {source} ]; then echo MISSING; "
+                f"elif [ {source} -ef {dest} ] || ln -sfn {source} {dest}; then echo OK; else echo ERROR; fi"
+            )
+        results = self.link.run_batch(batch, timeout=60)
+        
+        success = True
+        for position, remote_read in enumerate(remote_reads):
+            path = remote_read_path(remote_read)
+            name = os.path.basename(path)
+            result = results.get(f"link_{position}")
+            if result == "OK":
+                self.uploaded_names[name] = name
+                self.status_updater.update_log(f"Usando leitura do servidor (sem envio): {path}", "SUCCESS")
+            elif result == "MISSING":
+                self.status_updater.update_log(f"Leitura não encontrada ou sem permissão de leitura no servidor: {path}", "ERROR")
+                success = False
+            else:
+                self.status_updater.update_log(f"Erro ao criar link para {path} em {remote_dir}", "ERROR")
+                success = False
+        return success
+        
+    def remote_read_name(self, local_file):
+        """Retorna o nome do arquivo de leitura no servidor (pode ter recebido .gz no envio)"""
+        name = os.path.basename(local_file)
+        return self.uploaded_names.get(name, name)
+        
+    def _upload_compressed(self, local_files, remote_dir):
+        """
+        Comprime (gzip em blocos, várias threads) e envia as leituras sem arquivo temporário local
+        
+        Leituras já enviadas comprimidas (mesmo SHA-256 da original, conforme o
+        índice remoto) são reaproveitadas sem comprimir nem enviar de novo.
+        
+        Args:
+            local_files: Leituras não comprimidas
+            remote_dir: Diretório remoto
+            
+        Returns:
+            bool: True se todas foram enviadas e verificadas
+        """
+        files = [(local_file, f"{remote_dir}/{compressed_name(local_file)}") for local_file in local_files]
+        
+        # Procurar no servidor um .gz já enviado a partir da mesma leitura original
+        self.status_updater.update_status("Comparando arquivos com o servidor...")
+        hash_index = get_hash_index()
+        hash_index.prefetch(local_files)
+        source_hashes = {remote_path: hash_index.get_digest(local_file) for local_file, remote_path in files}
+        deduplicator = RemoteDeduplicator(self.link)
+        try:
+            placed = deduplicator.place_compressed([(remote_path, digest) for remote_path, digest in source_hashes.items() if digest])
+        except Exception as dedup_error:
+            self.status_updater.update_log(f"Não foi possível consultar arquivos já enviados: {str(dedup_error)}", "WARNING")
+            placed = {}
+        for local_file, remote_path in files:
+            if placed.get(remote_path, "missing") != "missing":
+                self.status_updater.update_log(f"Arquivo já presente no servidor, envio dispensado: {os.path.basename(remote_path)}", "SUCCESS")
+        files = [(local_file, remote_path) for local_file, remote_path in files if placed.get(remote_path, "missing") == "missing"]
+        if not files:
+            return True
+            
+        self.status_updater.update_status("Comprimindo e enviando arquivos...")
+        self.status_updater.update_progress(0)
+        uploader = CompressedUploader(self.session_pool, self.session_key,
+                                      progress_callback=lambda read, total: self._sftp_progress_callback(read, total, "Envio comprimido"))
+        try:
+            failures = uploader.upload(files)
+        except Exception as e:
+            failures = {remote_path: str(e) for _, remote_path in files}
+            
+        for local_file, remote_path in files:
+            if remote_path in failures:
+                self.status_updater.update_log(f"Falha ao enviar {os.path.basename(local_file)} comprimido: {failures[remote_path]}", "ERROR")
+            else:
+                self.status_updater.update_log(f"Arquivo enviado comprimido: {os.path.basename(remote_path)}", "SUCCESS")
+                
+        # Registrar o .gz com o hash da leitura original para reaproveitá-lo em envios futuros
+        try:
+            deduplicator.record([(remote_path, digest, size, source_hashes[remote_path])
+                                 for remote_path, (digest, size) in uploader.uploaded.items()])
+        except Exception as record_error:
+            self.status_updater.update_log(f"Não foi possível registrar os hashes no servidor: {str(record_error)}", "WARNING")
+        return not failures
+        
     def _parse_spades_progress(self, output):
         """
         Extrai informações de progresso do SPAdes a partir da saída do log
@@ -515,19 +817,20 @@ class JobManager:
             return None
             
     def _progress_callback(self, filename, size, sent):
-        """Callback para progresso do SCP"""
+        """Callback para progresso do SCP (chamado a cada bloco; agregado pelo ProgressAggregator)"""
         try:
-            if size:
-                percent = float(sent) / float(size) * 100
-                # Atualizar a barra de progresso apenas se o valor for diferente do atual
-                # para evitar atualizações desnecessárias
-                self.status_updater.update_progress(int(percent))
+            if isinstance(filename, bytes):
+                filename = filename.decode(errors="replace")
+            self.transfer_progress.update(os.path.basename(filename), sent, size)
         except Exception:
             pass
             
-    def run_spades(self, remote_dir, read1, read2, output_dir, threads, memory=None, mode="isolate", kmer=None, advanced_params=None):
+    def launch_job(self, remote_dir, read1, read2, output_dir, threads, memory=None, mode="isolate", kmer=None, job_id=None, backend="direct",
+                   normalization=None, advanced_params=None, fast_scratch=False):
         """
-        Executa o SPAdes no servidor remoto
+        Valida os parâmetros e inicia o SPAdes sob o supervisor, sem alterar o job atual
+        
+        Usado por run_spades e pela fila de jobs (que acompanha vários jobs pelo manifesto).
         
         Args:
             remote_dir: Diretório remoto
@@ -538,18 +841,23 @@ class JobManager:
             memory: Memória máxima (opcional)
             mode: Modo de execução do SPAdes
             kmer: Tamanhos de k-mer (opcional)
+            job_id: Identificador do job (padrão: data e hora)
+            backend: Backend de execução (direct, slurm ou pbs)
+            normalization: Redução de cobertura antes da montagem (method, depth, genome_size_mb) ou None
+            advanced_params: Opções adicionais do SPAdes (cov_cutoff: auto, off ou número) ou None
+            fast_scratch: Apontar --tmp-dir para o diretório temporário mais rápido do servidor
             
         Returns:
-            bool: True se iniciado com sucesso
+            dict: Manifesto inicial do job (com job_id, remote_dir e output_dir) ou None se não iniciou
         """
         if not self.connected or not self.ssh:
-            return False
+            return None
         
         try:
             # Validar parâmetros
             if not remote_dir or not read1 or not read2 or not output_dir or not threads:
                 self.status_updater.update_log("Parâmetros incompletos para execução do SPAdes", "ERROR")
-                return False
+                return None
                 
             remote_dir = remote_dir.strip()
             output_dir = output_dir.strip()
@@ -557,35 +865,39 @@ class JobManager:
             if not output_dir:
                 output_dir = "assembly"
                 
-            # Verificar se os arquivos existem no servidor
-            read1_file = os.path.basename(read1)
-            read2_file = os.path.basename(read2)
+            # Verificar se os arquivos existem no servidor (com o nome usado no envio, ex: .fastq.gz)
+            read1_file = self.remote_read_name(read1)
+            read2_file = self.remote_read_name(read2)
             
-            stdin, stdout, stderr = self.ssh.exec_command(f"[ -f {remote_dir}/{read1_file} ] && [ -f {remote_dir}/{read2_file} ] && echo 'OK' || echo 'MISSING'")
-            files_exist = stdout.read().decode().strip()
+            batch = RemoteBatch()
+            batch.file_exists("read1", f"{remote_dir}/{read1_file}")
+            batch.file_exists("read2", f"{remote_dir}/{read2_file}")
+            files_exist = self.link.run_batch(batch, timeout=30)
             
-            if files_exist != 'OK':
+            if files_exist.get("read1") != "1" or files_exist.get("read2") != "1":
                 self.status_updater.update_log("Arquivos de leitura não encontrados no servidor. Envie-os primeiro.", "ERROR")
-                return False
+                return None
             
             # Usar o caminho completo do SPAdes
             spades_command = self.spades_path if self.spades_path else "spades.py"
                 
-            # Verificar se o SPAdes pode ser executado (teste simples)
-            self.status_updater.update_log("Verificando se o SPAdes pode ser executado...")
-            test_cmd = f"{spades_command} --version"
-            stdin, stdout, stderr = self.ssh.exec_command(test_cmd)
-            spades_version = stdout.read().decode().strip()
-            spades_error = stderr.read().decode().strip()
-            
-            if not spades_version and spades_error:
-                self.status_updater.update_log(f"Erro ao executar SPAdes: {spades_error}", "ERROR")
-                return False
-                
+            # Verificar se o SPAdes pode ser executado (teste simples), a menos que
+            # a versão já tenha sido validada na conexão
+            spades_version = self.capabilities.get("spades_version")
+            if not spades_version:
+                self.status_updater.update_log("Verificando se o SPAdes pode ser executado...")
+                test_cmd = f"{spades_command} --version"
+                _, spades_version, spades_error = self.link.exec_idempotent(test_cmd, timeout=60)
+                spades_version = spades_version.strip()
+                spades_error = spades_error.strip()
+                
+                if not spades_version and spades_error:
+                    self.status_updater.update_log(f"Erro ao executar SPAdes: {spades_error}", "ERROR")
+                    return None
+                    
             self.status_updater.update_log(f"Versão do SPAdes: {spades_version}", "SUCCESS")
                 
             self.status_updater.update_status("Iniciando SPAdes...")
-            self.job_running = True
             
             # Sanitizar thread count
             if not str(threads).isdigit():
@@ -597,9 +909,28 @@ class JobManager:
                 memory = None
                 self.status_updater.update_log("Valor de memória inválido. Usando padrão do SPAdes.", "WARNING")
                 
-            # Construir o comando SPAdes - SIMPLIFICADO E CORRIGIDO
-            # Usar apenas uma mudança de diretório
-            command = f"cd {remote_dir} && {spades_command}"
+            # Normalização/subamostragem das leituras, executada pelo supervisor antes do SPAdes
+            prep_command = None
+            if normalization:
+                error = validate_normalization(normalization)
+                if error:
+                    self.status_updater.update_log(error, "ERROR")
+                    return None
+                tool = "bbnorm.sh" if normalization["method"] == "bbnorm" else "seqtk"
+                status, _, _ = self.link.exec_idempotent(f"command -v {tool}", timeout=15)
+                if status != 0:
+                    self.status_updater.update_log(f"{tool} não encontrado no servidor: instale-o ou desative a normalização", "ERROR")
+                    return None
+                prep_command, read1_file, read2_file = build_prep_command(
+                    read1_file, read2_file, output_dir, normalization, threads, memory
+                )
+                self.status_updater.update_log(
+                    f"As leituras serão reduzidas a ~{normalization['depth']}x ({normalization['method']}) "
+                    f"em {remote_dir}/{prep_dir(output_dir)} antes da montagem"
+                )
+                
+            # Construir o comando SPAdes (executado no diretório remoto pelo supervisor)
+            command = spades_command
             command += f" -1 {read1_file} -2 {read2_file}"
             command += f" -t {threads}"
             
@@ -621,6 +952,9 @@ class JobManager:
             else:
                 command += f" --{mode}"
                 
+            if mode != "isolate" and not self.supports_flag(f"--{mode}"):
+                self.status_updater.update_log(f"A versão do SPAdes no servidor não lista a opção --{mode}", "WARNING")
+                
             # Validar k-mer
             if kmer:
                 # Verificar se é uma lista válida de k-mers (números separados por vírgula)
@@ -636,131 +970,564 @@ class JobManager:
                 else:
                     self.status_updater.update_log("Valores de k-mer inválidos. Usando padrão do SPAdes.", "WARNING")
                 
+            # Cutoff de cobertura
+            cov_cutoff = str((advanced_params or {}).get("cov_cutoff") or "").strip()
+            if cov_cutoff:
+                if cov_cutoff in ("auto", "off") or re.match(r"^\d+(\.\d+)?$", cov_cutoff):
+                    command += f" --cov-cutoff {cov_cutoff}"
+                else:
+                    self.status_updater.update_log(f"Cutoff de cobertura inválido: {cov_cutoff}. Usando padrão do SPAdes.", "WARNING")
+                
+            # Área temporária rápida (a saída continua no diretório remoto, em armazenamento durável)
+            tmp_dir = None
+            if fast_scratch and self.supports_flag("--tmp-dir"):
+                name = f"{output_dir.replace('/', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                if (backend or DirectBackend.name) == DirectBackend.name:
+                    base = self.choose_scratch_dir(remote_dir, read1, read2, memory)
+                    tmp_dir = scratch_tmp_dir(base, name) if base else None
+                else:
+                    # O job roda em um nó de cálculo: usar o $TMPDIR local do nó
+                    tmp_dir = scratch_tmp_dir(None, name)
+                if tmp_dir:
+                    command += f" --tmp-dir {tmp_dir}"
+                    
             command += f" -o {output_dir}"
+            steps = ([f"mkdir -p {tmp_dir}"] if tmp_dir else []) + ([prep_command] if prep_command else [])
+            if steps:
+                command = f"( {' && '.join(steps + [command])} )"
+            if tmp_dir:
+                # A área temporária é removida ao final, preservando o código de saída
+                command = f"( {command}; c=$?; rm -rf {tmp_dir}; exit $c )"
+            
+            details = {"output_dir": output_dir, "threads": int(threads), "memory": int(memory) if memory else None,
+                       "backend": backend or DirectBackend.name}
+            inputs = {"read1": read1, "read2": read2, "mode": mode, "kmer": kmer, "normalization": normalization}
+            return self._start_supervised(remote_dir, output_dir, command, spades_command, job_id, details, inputs)
+                
+        except Exception as e:
+            self.status_updater.update_log(f"Erro ao iniciar SPAdes: {str(e)}", "ERROR")
+            self.status_updater.update_status("Erro ao iniciar SPAdes")
+            return None
             
-            # Registrar o comando
-            self.status_updater.update_log(f"Executando comando: {command}")
+    def _start_supervised(self, remote_dir, output_dir, command, spades_command, job_id=None, details=None, inputs=None):
+        """
+        Inicia um comando do SPAdes uma única vez, sob o script supervisor (grupo de processos próprio e manifesto)
+        
+        Na execução direta o supervisor roda no servidor conectado; nos backends de
+        escalonador (SLURM/PBS) ele é submetido como job e começa no estado 'pending'.
+        
+        Args:
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
+            command: Comando completo do SPAdes
+            spades_command: Executável do SPAdes (para o diagnóstico de falhas)
+            job_id: Identificador do job (padrão: data e hora)
+            details: Dados gravados no registro remoto de jobs (output_dir, threads, memory, backend)
+            inputs: Leituras, modo, k-mers e normalização (registrados no histórico local)
             
-            # Iniciar o comando em background
-            job_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        Returns:
+            dict: Manifesto inicial do job (com job_id, remote_dir e output_dir) ou None se não iniciou
+        """
+        self.status_updater.update_log(f"Executando comando: cd {remote_dir} && {command}")
+        
+        job_id = job_id or datetime.now().strftime("%Y%m%d%H%M%S")
+        details = details or {"output_dir": output_dir}
+        state = get_backend(details.get("backend"), self.link).launch(remote_dir, command, job_id, details)
+        
+        if state is None or (state.get("status") == JOB_RUNNING and not state.get("pid")):
+            self.status_updater.update_log("Falha ao iniciar o processo SPAdes", "ERROR")
+            self._report_launch_failure(remote_dir, job_id, spades_command)
+            return None
             
-            # Melhorar o redirecionamento para capturar todos os erros
-            log_file = f"{remote_dir}/spades_{job_id}.log"
-            error_file = f"{remote_dir}/spades_{job_id}.err"
+        if state.get("status") not in (JOB_RUNNING, JOB_PENDING):
+            # O SPAdes terminou antes do primeiro registro do supervisor (erro de parâmetros, por exemplo)
+            self.status_updater.update_log(f"O processo SPAdes terminou logo após o início (código {state.get('exit_code')})", "ERROR")
+            self._report_launch_failure(remote_dir, job_id, spades_command)
+            return None
             
-            # Usando o formato de execução em background mais confiável
-            # e capturando tanto stdout quanto stderr
-            full_command = f"{command} > {log_file} 2> {error_file} & echo $!"
+        state.update(job_id=job_id, remote_dir=remote_dir, output_dir=output_dir)
+        if state.get("status") == JOB_PENDING:
+            self.status_updater.update_log(f"SPAdes submetido ao escalonador {state.get('backend')}: job {state.get('scheduler_id')}", "SUCCESS")
+        else:
+            self.status_updater.update_log(f"SPAdes iniciado com PID: {state['pid']} (grupo {state.get('pgid')})", "SUCCESS")
+        self._record_submission(state, command, details, inputs or {})
+        return state
+        
+    def _record_submission(self, state, command, details, inputs):
+        """
+        Registra um job iniciado no histórico local
+        
+        Args:
+            state: Manifesto inicial do job
+            command: Comando executado
+            details: output_dir, threads e memory
+            inputs: Leituras, modo, k-mers e normalização
+        """
+        reads = [inputs.get("read1"), inputs.get("read2")]
+        hashes = get_hash_index()
+        digests = [hashes.lookup(path) if path and not is_remote_read(path) else None for path in reads]
+        try:
+            volume = input_volume(self, [path for path in reads if path]) if all(reads) else None
+        except Exception as e:
+            log_warning(f"Tamanho das leituras indisponível para o histórico: {str(e)}")
+            volume = None
             
-            self.status_updater.update_log(f"Executando: {full_command}")
-            stdin, stdout, stderr = self.ssh.exec_command(full_command)
+        try:
+            get_job_registry().record_submission(
+                state["job_id"],
+                profile=self.profile_name,
+                host=self.connection_info.get("host"),
+                username=self.connection_info.get("username"),
+                remote_dir=state["remote_dir"],
+                output_dir=state["output_dir"],
+                read1=reads[0],
+                read2=reads[1],
+                read1_sha256=digests[0],
+                read2_sha256=digests[1],
+                input_bytes=volume[0] if volume else None,
+                mode=inputs.get("mode"),
+                threads=details.get("threads"),
+                memory_gb=details.get("memory"),
+                kmer=inputs.get("kmer"),
+                command=command,
+                spades_version=self.capabilities.get("spades_version"),
+                status=state.get("status"),
+                submitted_at=time.time(),
+                started_at=state.get("start_time"),
+                preprocess=inputs.get("normalization") or None,
+            )
+        except Exception as e:
+            log_error(f"Erro ao registrar o job no histórico: {str(e)}")
             
-            # Obter PID do processo
-            pid = stdout.read().decode().strip()
+    def record_job_end(self, state, remote_dir, output_dir):
+        """
+        Registra no histórico o término de um job: estado, tempos, pico de memória e, se concluído, resultados
+        
+        Args:
+            state: Manifesto final do job
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
+        """
+        if not state or not state.get("job_id"):
+            return
+        fields = {
+            "status": state.get("status"),
+            "exit_code": state.get("exit_code"),
+            "ended_at": state.get("end_time"),
+            "peak_rss_kb": state.get("peak_rss_kb"),
+        }
+        if state.get("start_time"):
+            fields["started_at"] = state["start_time"]
+        if state.get("status") == JOB_FINISHED:
+            stats = self._assembly_stats(remote_dir, output_dir)
+            if stats:
+                fields["result_path"] = stats.pop("path")
+                fields["stats"] = stats
+        try:
+            registry = get_job_registry()
+            job = registry.get_job(state["job_id"])
+            if job and job["preprocess"]:
+                fields["preprocess"] = dict(job["preprocess"], **self._prep_summary(remote_dir, output_dir))
+            registry.update_job(state["job_id"], **fields)
+        except Exception as e:
+            log_error(f"Erro ao registrar o término do job no histórico: {str(e)}")
             
-            # Verificar se obtivemos um PID válido
-            if not pid or not pid.isdigit():
-                self.status_updater.update_log("Falha ao iniciar o processo SPAdes", "ERROR")
-                
-                # Verificar se há mensagens de erro
-                stdin, stdout, stderr = self.ssh.exec_command(f"cat {error_file} 2>/dev/null || echo 'Sem arquivo de erro'")
-                error_output = stdout.read().decode().strip()
-                if error_output and error_output != 'Sem arquivo de erro':
-                    self.status_updater.update_log(f"Erro ao iniciar SPAdes: {error_output}", "ERROR")
-                
-                # Verificar se há alguma saída que possa ajudar a diagnosticar
-                stdin, stdout, stderr = self.ssh.exec_command(f"[ -f {log_file} ] && cat {log_file} || echo 'Nenhum log disponível'")
-                log_output = stdout.read().decode().strip()
-                if log_output and log_output != 'Nenhum log disponível':
-                    self.status_updater.update_log(f"Log do SPAdes: {log_output}", "INFO")
-                
-                # Tentar executar um teste mais simples para ver se o comando básico funciona
-                stdin, stdout, stderr = self.ssh.exec_command(f"{spades_command} --help 2>/dev/null | head -5")
-                help_output = stdout.read().decode().strip()
-                if not help_output:
-                    self.status_updater.update_log(f"O comando SPAdes não pode ser executado. Verifique o caminho: {spades_command}", "ERROR")
-                    
-                self.job_running = False
-                return False
+    def choose_scratch_dir(self, remote_dir, read1=None, read2=None, memory=None):
+        """
+        Escolhe o diretório temporário (--tmp-dir) mais rápido com espaço suficiente para o job
+        
+        Mede espaço livre e escrita sequencial de SSDs locais, /dev/shm, $TMPDIR, /tmp
+        e da home; a medição é reaproveitada por SCRATCH_PROBE_CACHE_SECONDS.
+        
+        Args:
+            remote_dir: Diretório remoto do job
+            read1: Leitura 1 (para estimar o espaço necessário)
+            read2: Leitura 2
+            memory: Memória do job em GB (-m), descontada de diretórios em memória como /dev/shm
             
-            self.job_id = pid
+        Returns:
+            str: Diretório escolhido ou None para manter o padrão do SPAdes (dentro da saída)
+        """
+        remote_dir = remote_dir.strip().rstrip("/")
+        try:
+            cached = self._scratch_cache.get(remote_dir)
+            if cached and time.time() - cached[0] < SCRATCH_PROBE_CACHE_SECONDS:
+                probes = cached[1]
+            else:
+                self.status_updater.update_log("Medindo os diretórios temporários do servidor...")
+                probes = probe_scratch(self.link, remote_dir)
+                self._scratch_cache[remote_dir] = (time.time(), probes)
+            volume = input_volume(self, [read1, read2]) if read1 and read2 else None
+        except Exception as e:
+            self.status_updater.update_log(f"Não foi possível medir os diretórios temporários: {str(e)}", "WARNING")
+            return None
             
-            # Verificar imediatamente se o processo está realmente em execução
-            stdin, stdout, stderr = self.ssh.exec_command(f"ps -p {pid} -o pid,comm | grep -v PID || echo 'NOT_RUNNING'")
-            process_check = stdout.read().decode().strip()
+        best, reasons = choose_scratch(probes, required_space(volume), memory)
+        for reason in reasons:
+            log_info(f"Área temporária: {reason}")
+        if best is None:
+            self.status_updater.update_log(f"Área temporária: {reasons[-1] if reasons else 'nenhum diretório disponível'}", "INFO")
+            return None
+        self.status_updater.update_log(f"Área temporária do SPAdes (--tmp-dir) em {best['path']} ({best['fs_type']})", "SUCCESS")
+        return best["path"]
+        
+    def _prep_summary(self, remote_dir, output_dir):
+        """
+        Lê o resumo do pré-processamento das leituras de um job (bases de entrada, fração, leituras mantidas)
+        
+        Returns:
+            dict: Valores do resumo (vazio se indisponível)
+        """
+        path = quote_remote_path(f"{remote_dir.rstrip('/')}/{prep_dir(output_dir)}/{PREP_SUMMARY}")
+        try:
+            status, output, _ = self.link.exec_idempotent(f"cat {path}", timeout=15)
+        except Exception as e:
+            log_warning(f"Resumo do pré-processamento indisponível: {str(e)}")
+            return {}
+        return parse_prep_summary(output) if status == 0 else {}
             
-            if process_check == 'NOT_RUNNING':
-                # Processo não está em execução, provavelmente falhou no início
-                self.status_updater.update_log("O processo SPAdes não está em execução após o início. Verificando erros...", "ERROR")
-                
-                # Verificar log de erro
-                stdin, stdout, stderr = self.ssh.exec_command(f"cat {error_file} 2>/dev/null || echo 'Sem mensagens de erro'")
-                error_log = stdout.read().decode().strip()
-                self.status_updater.update_log(f"Mensagens de erro: {error_log}", "ERROR")
-                
-                # Verificar se há alguma saída de log
-                stdin, stdout, stderr = self.ssh.exec_command(f"[ -f {log_file} ] && cat {log_file} || echo 'Sem log disponível'")
-                log_output = stdout.read().decode().strip()
-                if log_output and log_output != 'Sem log disponível':
-                    self.status_updater.update_log(f"Conteúdo do log: {log_output}", "INFO")
-                
-                # Verificar permissão no diretório
-                stdin, stdout, stderr = self.ssh.exec_command(f"ls -ld {remote_dir}")
-                dir_perms = stdout.read().decode().strip()
-                self.status_updater.update_log(f"Permissões do diretório remoto: {dir_perms}", "INFO")
-                
+    def _assembly_stats(self, remote_dir, output_dir):
+        """
+        Calcula no servidor as estatísticas da montagem (sequências, tamanho total, maior sequência e N50)
+        
+        Returns:
+            dict: path, sequences, total_length, longest e n50 ou None se não houver resultado
+        """
+        directory = quote_remote_path(f"{remote_dir.rstrip('/')}/{output_dir}")
+        command = (
+            f"cd {directory} && for f in scaffolds.fasta contigs.fasta transcripts.fasta; do "
+            "[ -f \"$f\" ] || continue; "
+            "awk '/^>/ {if (l) print l; l = 0; next} {l += length($0)} END {if (l) print l}' \"$f\" | sort -rn | "
+            "awk -v f=\"$f\" '{a[NR] = $1; t += $1} END {h = 0; n50 = 0; "
+            "for (i = 1; i <= NR; i++) {h += a[i]; if (h * 2 >= t) {n50 = a[i]; break}} print f, NR, t + 0, a[1] + 0, n50}'; "
+            "break; done"
+        )
+        try:
+            status, output, _ = self.link.exec_idempotent(command, timeout=300)
+        except Exception as e:
+            log_warning(f"Estatísticas da montagem indisponíveis: {str(e)}")
+            return None
+        fields = output.split()
+        if status != 0 or len(fields) != 5 or not all(value.isdigit() for value in fields[1:]):
+            return None
+        sequences, total, longest, n50 = (int(value) for value in fields[1:])
+        return {
+            "path": f"{remote_dir.rstrip('/')}/{output_dir}/{fields[0]}",
+            "sequences": sequences,
+            "total_length": total,
+            "longest": longest,
+            "n50": n50,
+        }
+            
+    def run_spades(self, remote_dir, read1, read2, output_dir, threads, memory=None, mode="isolate", kmer=None, advanced_params=None, backend="direct",
+                   normalization=None, fast_scratch=False):
+        """
+        Executa o SPAdes no servidor remoto
+        
+        Args:
+            remote_dir: Diretório remoto
+            read1: Caminho do arquivo de leitura 1
+            read2: Caminho do arquivo de leitura 2
+            output_dir: Diretório de saída
+            threads: Número de threads
+            memory: Memória máxima (opcional)
+            mode: Modo de execução do SPAdes
+            kmer: Tamanhos de k-mer (opcional)
+            advanced_params: Opções adicionais do SPAdes (opcional, ver launch_job)
+            backend: Backend de execução (direct, slurm ou pbs)
+            normalization: Redução de cobertura antes da montagem (opcional, ver launch_job)
+            fast_scratch: Usar o diretório temporário mais rápido do servidor (--tmp-dir)
+            
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if not self.connected or not self.ssh:
+            return False
+        
+        try:
+            self.job_running = True
+            state = self.launch_job(remote_dir, read1, read2, output_dir, threads, memory, mode, kmer, backend=backend,
+                                    normalization=normalization, advanced_params=advanced_params,
+                                    fast_scratch=fast_scratch)
+            if state is None:
                 self.job_running = False
                 return False
+            self._track_job(state, threads, memory)
+            return True
+                
+        except Exception as e:
+            self.job_running = False
+            self.status_updater.update_log(f"Erro ao iniciar SPAdes: {str(e)}", "ERROR")
+            self.status_updater.update_status("Erro ao iniciar SPAdes")
+            return False
             
-            self.status_updater.update_log(f"SPAdes iniciado com PID: {pid}", "SUCCESS")
-            self.status_updater.update_status(f"SPAdes executando (PID: {pid})")
-            
-            # Iniciar thread para monitorar o processo
-            monitor_thread = threading.Thread(
-                target=self._monitor_job,
-                args=(remote_dir, pid, job_id, output_dir),
-                daemon=True
-            )
-            monitor_thread.start()
+    def check_checkpoint(self, remote_dir, output_dir):
+        """
+        Verifica se um diretório de saída contém uma montagem interrompida que pode ser retomada
+        
+        Args:
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
             
-            # Salvar a memória alocada
-            self.allocated_memory = int(memory)
+        Returns:
+            Checkpoint: Estado do diretório de saída ou None em caso de erro
+        """
+        if not self.connected or not self.ssh:
+            return None
             
-            # Modificar para salvar o comando em um arquivo temporário e executá-lo com controle de PID
-            job_script = f"job_spades_{int(time.time())}.sh"
-            job_output = f"spades_output_{int(time.time())}.log"
-            self.job_output_file = f"{remote_dir}/{job_output}"
+        try:
+            return inspect_output(self.link, remote_dir.strip().rstrip("/"), (output_dir or "assembly").strip())
+        except Exception as e:
+            self.status_updater.update_log(f"Erro ao verificar o diretório de saída: {str(e)}", "ERROR")
+            return None
             
-            # Criar script de execução
-            script_content = f"""#!/bin/bash
-{command} > {job_output} 2>&1 &
-echo $!  # Retorna o PID do processo
-"""
+    def resume_spades(self, remote_dir, output_dir, threads=None, memory=None, backend="direct"):
+        """
+        Retoma uma montagem interrompida (falta de memória, reinício do servidor ou cancelamento)
+        
+        Usa --continue quando os recursos são os mesmos da execução anterior, ou
+        --restart-from no estágio interrompido quando -t/-m mudaram, preservando
+        a correção de erros e as iterações de k já concluídas.
+        
+        Args:
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
+            threads: Novo número de threads (opcional)
+            memory: Nova memória máxima em GB (opcional)
+            backend: Backend de execução (direct, slurm ou pbs)
             
-            stdin, stdout, stderr = self.ssh.exec_command(
-                f"cd {remote_dir} && echo '{script_content}' > {job_script} && chmod +x {job_script} && ./{job_script}"
-            )
+        Returns:
+            bool: True se retomado com sucesso
+        """
+        checkpoint = self.check_checkpoint(remote_dir, output_dir)
+        if checkpoint is None:
+            return False
+        if not checkpoint.resumable:
+            reason = "a montagem já foi concluída" if checkpoint.finished else "não há estado salvo pelo SPAdes"
+            self.status_updater.update_log(f"Não é possível retomar {remote_dir}/{output_dir}: {reason}", "WARNING")
+            return False
             
-            # Capturar o PID do processo
-            self.job_pid = stdout.read().decode().strip()
-            if self.job_pid and self.job_pid.isdigit():
-                self.job_running = True
-                return True, f"SPAdes iniciado com sucesso. PID: {self.job_pid}"
-            else:
+        try:
+            self.job_running = True
+            remote_dir = remote_dir.strip().rstrip("/")
+            spades_command = self.spades_path if self.spades_path else "spades.py"
+            command = build_resume_command(spades_command, checkpoint, threads, memory)
+            self.status_updater.update_log(f"Retomando montagem em {remote_dir}/{checkpoint.output_dir}: {checkpoint.describe()}")
+            threads = threads or checkpoint.previous_threads
+            memory = memory or checkpoint.previous_memory
+            details = {"output_dir": checkpoint.output_dir, "threads": threads, "memory": memory,
+                       "backend": backend or DirectBackend.name}
+            state = self._start_supervised(remote_dir, checkpoint.output_dir, command, spades_command, details=details,
+                                           inputs=self._previous_inputs(remote_dir, checkpoint.output_dir))
+            if state is None:
                 self.job_running = False
-                return False, "Falha ao iniciar o SPAdes."
-            
+                return False
+            self._track_job(state, threads, memory)
             return True
-                
+            
         except Exception as e:
             self.job_running = False
-            self.status_updater.update_log(f"Erro ao iniciar SPAdes: {str(e)}", "ERROR")
-            self.status_updater.update_status("Erro ao iniciar SPAdes")
+            self.status_updater.update_log(f"Erro ao retomar SPAdes: {str(e)}", "ERROR")
+            self.status_updater.update_status("Erro ao retomar SPAdes")
             return False
             
+    def _previous_inputs(self, remote_dir, output_dir):
+        """
+        Leituras, modo, k-mers e normalização da execução original de uma montagem retomada
+
+        Args:
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
+
+        Returns:
+            dict: Entradas no formato de _record_submission (vazio se o job não estiver no histórico)
+        """
+        try:
+            job = get_job_registry().find_job(remote_dir, output_dir, self.connection_info.get("host"))
+        except Exception as e:
+            log_warning(f"Histórico indisponível para a montagem retomada: {str(e)}")
+            return {}
+        if job is None:
+            return {}
+        return {"read1": job["read1"], "read2": job["read2"], "mode": job["mode"], "kmer": job["kmer"],
+                "normalization": job["preprocess"]}
+            
+    def _track_job(self, state, threads, memory):
+        """
+        Adota um job recém-iniciado como job atual e inicia seu monitoramento
+        
+        Args:
+            state: Manifesto inicial retornado por _start_supervised
+            threads: Threads reservadas
+            memory: Memória reservada em GB (None = padrão do SPAdes)
+        """
+        # Jobs aguardando no escalonador ainda não têm PID
+        pid = str(state["pid"]) if state.get("pid") else None
+        self.job_id = pid or state.get("scheduler_id")
+        self.job_pid = pid
+        self.job_pgid = state.get("pgid")
+        self.job_manifest = state["manifest"]
+        self.job_key = state["job_id"]
+        self.job_state = state
+        self.job_output_file = state.get("log_file")
+        
+        # Salvar os recursos reservados (memória 0 = padrão do SPAdes)
+        self.job_threads = int(threads) if str(threads).isdigit() else 0
+        self.allocated_memory = int(memory) if memory and str(memory).isdigit() else 0
+        
+        if state.get("backend", DirectBackend.name) == DirectBackend.name:
+            self.status_updater.update_status(f"SPAdes executando (PID: {pid})")
+            self._start_monitor_agent([pid], [state.get("log_file"), state.get("error_file")])
+        else:
+            # O processo roda em um nó de cálculo: acompanhar pelo manifesto e pelos logs compartilhados
+            self.status_updater.update_status(f"SPAdes no escalonador {state.get('backend')} (job {state.get('scheduler_id')})")
+        
+        # Monitorar o job pelo manifesto (no event loop da interface, se configurado)
+        if self.monitor_scheduler is not None:
+            self.monitor_scheduler(state["remote_dir"], state["job_id"], state["output_dir"])
+            return
+        monitor_thread = threading.Thread(
+            target=self._monitor_job,
+            args=(state["remote_dir"], pid, state["job_id"], state["output_dir"]),
+            daemon=True
+        )
+        monitor_thread.start()
+            
+    def _report_launch_failure(self, remote_dir, job_id, spades_command):
+        """
+        Registra o diagnóstico de um SPAdes que não iniciou (logs do job, permissões e comando)
+        
+        Args:
+            remote_dir: Diretório remoto
+            job_id: ID do job
+            spades_command: Comando do SPAdes usado
+        """
+        files = job_files(remote_dir, job_id)
+        batch = RemoteBatch()
+        batch.add("err", f"tail -n 20 {quote_remote_path(files['error_file'])}")
+        batch.add("log", f"tail -n 20 {quote_remote_path(files['log_file'])}")
+        batch.add("perms", f"ls -ld {quote_remote_path(remote_dir)}")
+        batch.add("help", f"{spades_command} --help 2>/dev/null | head -5")
+        try:
+            results = self.link.run_batch(batch, timeout=30)
+        except Exception as e:
+            self.status_updater.update_log(f"Não foi possível obter o diagnóstico da falha: {str(e)}", "WARNING")
+            return
+            
+        if results.get("err"):
+            self.status_updater.update_log(f"Mensagens de erro: {results['err']}", "ERROR")
+        if results.get("log"):
+            self.status_updater.update_log(f"Log do SPAdes: {results['log']}", "INFO")
+        if results.get("perms"):
+            self.status_updater.update_log(f"Permissões do diretório remoto: {results['perms']}", "INFO")
+        if not results.get("help"):
+            self.status_updater.update_log(f"O comando SPAdes não pode ser executado. Verifique o caminho: {spades_command}", "ERROR")
+            
+    def read_job_manifest(self):
+        """
+        Lê o manifesto do job atual (estado, código de saída, tempos e pico de memória)
+        
+        Returns:
+            dict: Manifesto ou None se não houver job supervisionado
+        """
+        if not self.job_state or self.link is None:
+            return None
+        state = get_backend(self.job_state, self.link).read_state(self.job_state)
+        if state is not None:
+            self.job_state = state
+        return state
+        
+    def _report_job_end(self, state):
+        """Registra o resultado do job a partir do manifesto final"""
+        status = state.get("status")
+        exit_code = state.get("exit_code")
+        duration = ""
+        if state.get("start_time") and state.get("end_time"):
+            minutes, seconds = divmod(int(state["end_time"]) - int(state["start_time"]), 60)
+            duration = f" em {minutes // 60}h{minutes % 60:02d}m{seconds:02d}s"
+        peak = f", pico de memória {int(state.get('peak_rss_kb') or 0) / (1024 * 1024):.1f} GB"
+        
+        if status == JOB_FINISHED:
+            self.status_updater.update_log(f"Processo SPAdes concluído{duration}{peak}", "SUCCESS")
+            self.status_updater.update_status("SPAdes concluído")
+        elif status == JOB_CANCELLED:
+            self.status_updater.update_log(f"Processo SPAdes cancelado{duration}", "WARNING")
+            self.status_updater.update_status("SPAdes cancelado")
+        else:
+            self.status_updater.update_log(f"Processo SPAdes terminou com erro (código {exit_code}){duration}{peak}", "ERROR")
+            self.status_updater.update_status("SPAdes terminou com erro")
+            
+    def reattach_jobs(self):
+        """
+        Reencontra os jobs do usuário no servidor após a conexão (inclusive de sessões anteriores do aplicativo)
+        
+        Jobs encerrados enquanto o aplicativo estava fechado são informados no log.
+        O job em execução mais recente passa a ser o job atual (se não houver outro)
+        e tem o monitoramento retomado.
+        
+        Returns:
+            list: Manifestos dos demais jobs em execução (não adotados como job atual)
+        """
+        if not self.connected or self.link is None:
+            return []
+            
+        try:
+            jobs = JobSupervisor(self.link).scan()
+        except Exception as e:
+            self.status_updater.update_log(f"Erro ao procurar jobs no servidor: {str(e)}", "WARNING")
+            return []
+            
+        running = []
+        for state in sorted(jobs, key=lambda job: job.get("start_time") or 0, reverse=True):
+            location = f"{state.get('remote_dir')}/{state.get('output_dir')}"
+            # Jobs de escalonador: conferir o estado do job no SLURM/PBS
+            if state.get("backend", DirectBackend.name) != DirectBackend.name and state.get("status") in (JOB_RUNNING, JOB_PENDING):
+                try:
+                    state = get_backend(state, self.link).read_state(state) or state
+                except Exception as e:
+                    log_warning(f"Estado do job {state.get('job_id')} no escalonador indisponível: {str(e)}")
+            if state.get("status") in (JOB_RUNNING, JOB_PENDING):
+                running.append(state)
+                continue
+            if state.get("lost"):
+                self.status_updater.update_log(f"Job {state.get('job_id')} ({location}) foi interrompido sem registrar o término (servidor reiniciado?)", "ERROR")
+            else:
+                self.status_updater.update_log(f"Job {state.get('job_id')} ({location}) terminou enquanto o aplicativo estava fechado: {state.get('status')} (código {state.get('exit_code')})", "INFO")
+            self.record_job_end(state, state.get("remote_dir"), state.get("output_dir"))
+            if state.get("status") != JOB_FINISHED:
+                self._report_checkpoint(state.get("remote_dir"), state.get("output_dir"))
+            self._forget_job(state.get("job_id"))
+            
+        if running and not self.job_running:
+            state = running.pop(0)
+            self.status_updater.update_log(f"Reacompanhando job {state.get('job_id')} em {state['remote_dir']}/{state['output_dir']} (PID {state.get('pid')})", "SUCCESS")
+            self.job_running = True
+            self._track_job(state, state.get("threads"), state.get("memory"))
+        for state in running:
+            self.status_updater.update_log(f"Job {state.get('job_id')} continua em execução em {state['remote_dir']}/{state['output_dir']} (PID {state.get('pid')})", "INFO")
+        return running
+        
+    def _forget_job(self, job_id):
+        """Remove do registro remoto o ponteiro de um job cujo término já foi informado"""
+        try:
+            JobSupervisor(self.link).forget(job_id)
+        except Exception as e:
+            log_warning(f"Não foi possível remover o job {job_id} do registro remoto: {str(e)}")
+            
+    def _report_checkpoint(self, remote_dir, output_dir):
+        """Informa se uma montagem interrompida pode ser retomada e a partir de qual estágio"""
+        checkpoint = self.check_checkpoint(remote_dir, output_dir)
+        if checkpoint is not None and checkpoint.resumable:
+            self.status_updater.update_log(
+                f"A montagem pode ser retomada sem perder o que já foi feito ({checkpoint.describe()}). "
+                "Use SPAdes > Retomar Montagem, alterando threads e memória se necessário.", "WARNING"
+            )
+            
     def _monitor_job(self, remote_dir, pid, job_id, output_dir):
         """
-        Monitora o progresso do job em execução
+        Monitora o progresso do job em execução pelo manifesto do supervisor (thread própria)
+        
+        Usado quando nenhum monitor_scheduler foi configurado (ex: uso sem interface).
         
         Args:
             remote_dir: Diretório remoto
@@ -768,104 +1535,191 @@ echo $!  # Retorna o PID do processo
             job_id: ID do job
             output_dir: Diretório de saída
         """
+        monitor = {}
+        try:
+            while True:
+                delay = self.monitor_step(remote_dir, job_id, output_dir, monitor)
+                if delay is None:
+                    break
+                time.sleep(delay)
+        except Exception as e:
+            self.status_updater.update_log(f"Erro ao monitorar o job: {str(e)}", "ERROR")
+            self.job_running = False
+            
+    def monitor_step(self, remote_dir, job_id, output_dir, monitor):
+        """
+        Faz uma verificação do job em execução pelo manifesto do supervisor
+        
+        Args:
+            remote_dir: Diretório remoto
+            job_id: ID do job
+            output_dir: Diretório de saída
+            monitor: dict mantido entre as verificações (falhas consecutivas)
+            
+        Returns:
+            float: Segundos até a próxima verificação, ou None quando o monitoramento terminou
+        """
+        if not self.job_running or not self.connected:
+            return None
+            
+        # Com o agente remoto ativo, métricas e logs chegam por eventos:
+        # apenas aguardar o término do processo
+        agent = self.monitor_agent
+        if agent is not None and agent.is_running() and not agent.process_exited.is_set():
+            return AGENT_POLL_SECONDS
+            
+        files = job_files(remote_dir, job_id)
         try:
-            # Contador de tentativas sem resposta
-            no_response_count = 0
-            max_no_response = 5  # Número máximo de tentativas sem resposta
+            state = self.read_job_manifest()
+            if state is None:
+                raise IOError(f"manifesto do job não encontrado: {files['manifest']}")
+            monitor["failures"] = 0
             
-            # Verificar se o processo está rodando a cada 30 segundos
-            while self.job_running and self.connected:
-                try:
-                    # Verificar se o processo ainda existe
-                    stdin, stdout, stderr = self.ssh.exec_command(f"ps -p {pid} -o pid,pcpu,pmem,time,comm | tail -n 1")
-                    process_info = stdout.read().decode().strip()
+            if state.get("status") == JOB_PENDING:
+                self.status_updater.update_status(f"SPAdes aguardando na fila do escalonador ({state.get('scheduler_state') or 'pendente'})")
+                return MONITOR_POLL_SECONDS
+                
+            if state.get("status") != JOB_RUNNING:
+                self.job_running = False
+                self._report_job_end(state)
+                self.record_job_end(state, remote_dir, output_dir)
+                self._forget_job(job_id)
+                self._finalize_job(remote_dir, output_dir)
+                if state.get("status") != JOB_FINISHED:
+                    self._report_checkpoint(remote_dir, output_dir)
+                return None
+                
+            if agent is None or not agent.is_running():
+                # Sem agente: acompanhar os logs por consultas periódicas
+                batch = RemoteBatch()
+                batch.add("log", f"tail -n 20 {quote_remote_path(files['log_file'])}")
+                batch.add("err", f"tail -n 20 {quote_remote_path(files['error_file'])}")
+                results = self.link.run_batch(batch, timeout=30)
+                log_output, err_output = results.get("log", ""), results.get("err", "")
+                
+                # Combinar outputs se ambos existirem
+                if log_output and err_output:
+                    combined_output = f"=== Log de Saída ===\n{log_output}\n\n=== Log de Erro ===\n{err_output}"
+                elif err_output:
+                    combined_output = f"=== Log de Erro ===\n{err_output}"
+                else:
+                    combined_output = log_output
                     
-                    if process_info:
-                        # Processo ainda está rodando
-                        
-                        no_response_count = 0  # Resetar contador
-                        
-                        # Verificar log do SPAdes
-                        # Usar tail com o caminho completo para maior compatibilidade
-                        log_cmd = f"/usr/bin/tail -n 20 {remote_dir}/spades_{job_id}.log 2>/dev/null || echo ''"
-                        stdin, stdout, stderr = self.ssh.exec_command(log_cmd)
-                        log_output = stdout.read().decode().strip()
-                        
-                        # Verificar também o arquivo de erro
-                        err_cmd = f"/usr/bin/tail -n 20 {remote_dir}/spades_{job_id}.err 2>/dev/null || echo ''"
-                        stdin, stdout, stderr = self.ssh.exec_command(err_cmd)
-                        err_output = stdout.read().decode().strip()
+                # Extrair informações de progresso, se disponíveis
+                if combined_output:
+                    progress_info = self._parse_spades_progress(combined_output)
+                    if progress_info:
+                        self.status_updater.update_status(f"SPAdes executando - {progress_info}")
                         
-                        # Combinar outputs se ambos existirem
-                        if log_output and err_output:
-                            combined_output = f"=== Log de Saída ===\n{log_output}\n\n=== Log de Erro ===\n{err_output}"
-                        elif log_output:
-                            combined_output = log_output
-                        elif err_output:
-                            combined_output = f"=== Log de Erro ===\n{err_output}"
-                        else:
-                            combined_output = ""
-                        
-                        # Extrair informações de progresso, se disponíveis
-                        if combined_output:
-                            progress_info = self._parse_spades_progress(combined_output)
-                            if progress_info:
-                                self.status_updater.update_status(f"SPAdes executando - {progress_info}")
-                            
-                            # Registrar para depuração
-                            self.status_updater.update_log("Conteúdo do log do SPAdes:", "INFO")
-                            if len(combined_output) > 500:  # Se for muito grande, mostrar apenas parte
-                                self.status_updater.update_log(combined_output[:500] + "...", "INFO")
-                            else:
-                                self.status_updater.update_log(combined_output, "INFO")
-                                
+                    self.status_updater.update_log("Conteúdo do log do SPAdes:", "INFO")
+                    if len(combined_output) > 500:  # Se for muito grande, mostrar apenas parte
+                        self.status_updater.update_log(combined_output[:500] + "...", "INFO")
                     else:
-                        # Processo não encontrado ou terminado
-                        no_response_count += 1
-                        
-                        if no_response_count >= max_no_response:
-                            # Várias tentativas sem resposta, considerar processo terminado
-                            self.status_updater.update_log("Processo SPAdes concluído", "SUCCESS")
-                            self.status_updater.update_status("SPAdes concluído")
-                            self.job_running = False
-                            
-                            # Verificar resultado
-                            stdin, stdout, stderr = self.ssh.exec_command(f"ls -la {remote_dir}/{output_dir} 2>/dev/null || echo 'NOT_FOUND'")
-                            output_files = stdout.read().decode().strip()
-                            
-                            if output_files != 'NOT_FOUND':
-                                self.status_updater.update_log(f"Arquivos de saída:\n{output_files}")
-                                
-                                # Verificar se o arquivo de scaffolds foi gerado
-                                stdin, stdout, stderr = self.ssh.exec_command(f"[ -f {remote_dir}/{output_dir}/scaffolds.fasta ] && echo 'OK' || echo 'NOT_FOUND'")
-                                scaffolds_exists = stdout.read().decode().strip()
-                                
-                                if scaffolds_exists == 'OK':
-                                    self.status_updater.update_log("Montagem concluída com sucesso! O arquivo scaffolds.fasta foi gerado.", "SUCCESS")
-                                else:
-                                    self.status_updater.update_log("Aviso: O arquivo scaffolds.fasta não foi encontrado. A montagem pode ter falhado.", "WARNING")
-                            else:
-                                self.status_updater.update_log(f"Diretório de saída não encontrado: {remote_dir}/{output_dir}", "ERROR")
-                            
-                            break
-                            
-                        self.status_updater.update_log(f"Processo {pid} não encontrado. Tentativa {no_response_count}/{max_no_response}.", "WARNING")
+                        self.status_updater.update_log(combined_output, "INFO")
                         
-                except Exception as e:
-                    self.status_updater.update_log(f"Erro ao monitorar processo: {str(e)}", "ERROR")
-                    no_response_count += 1
-                    
-                    if no_response_count >= max_no_response:
-                        self.status_updater.update_log("Muitas falhas ao monitorar o processo. Considerando finalizado.", "WARNING")
-                        self.job_running = False
-                        break
-                        
-                time.sleep(30)
+        except Exception as e:
+            self.status_updater.update_log(f"Erro ao monitorar processo: {str(e)}", "ERROR")
+            monitor["failures"] = monitor.get("failures", 0) + 1
+            
+            if monitor["failures"] >= MONITOR_MAX_FAILURES:
+                self.status_updater.update_log("Muitas falhas ao monitorar o processo. Considerando finalizado.", "WARNING")
+                self.job_running = False
+                return None
                 
+        if agent is None or not agent.is_running():
+            return MONITOR_POLL_SECONDS
+        # Processo encerrado: aguardar o supervisor gravar o estado final
+        return SUPERVISOR_SAMPLE_SECONDS
+            
+    def _finalize_job(self, remote_dir, output_dir):
+        """
+        Verifica os arquivos de saída após o término do SPAdes
+        
+        Args:
+            remote_dir: Diretório remoto
+            output_dir: Diretório de saída
+        """
+        self._stop_monitor_agent()
+        
+        # Verificar resultado (listagem e scaffolds em uma única ida e volta)
+        batch = RemoteBatch()
+        batch.add("listing", f"ls -la {quote_remote_path(f'{remote_dir}/{output_dir}')} || echo 'NOT_FOUND'")
+        batch.file_exists("scaffolds", f"{remote_dir}/{output_dir}/scaffolds.fasta")
+        try:
+            results = self.link.run_batch(batch, timeout=30)
         except Exception as e:
-            self.status_updater.update_log(f"Erro ao monitorar o job: {str(e)}", "ERROR")
-            self.job_running = False
+            self.status_updater.update_log(f"Não foi possível verificar os resultados: {str(e)}", "WARNING")
+            return
+        output_files = results.get("listing", "NOT_FOUND")
+        
+        if output_files != 'NOT_FOUND':
+            self.status_updater.update_log(f"Arquivos de saída:\n{output_files}")
+            
+            # Verificar se o arquivo de scaffolds foi gerado
+            if results.get("scaffolds") == '1':
+                self.status_updater.update_log("Montagem concluída com sucesso! O arquivo scaffolds.fasta foi gerado.", "SUCCESS")
+            else:
+                self.status_updater.update_log("Aviso: O arquivo scaffolds.fasta não foi encontrado. A montagem pode ter falhado.", "WARNING")
+        else:
+            self.status_updater.update_log(f"Diretório de saída não encontrado: {remote_dir}/{output_dir}", "ERROR")
+            
+    def _start_monitor_agent(self, pids, log_files):
+        """
+        Inicia o agente remoto de monitoramento para o job atual
+        
+        Args:
+            pids: PIDs dos processos principais do job
+            log_files: Arquivos de log remotos a acompanhar
+            
+        Returns:
+            bool: True se o agente foi iniciado (caso contrário, o monitoramento usa consultas periódicas)
+        """
+        self._stop_monitor_agent()
+        if not self.use_monitor_agent or not self.ssh:
+            return False
+            
+        try:
+            agent = RemoteMonitorAgent(self.ssh)
+            agent.add_listener(self._on_agent_event)
+            if not agent.start(pids=pids, log_files=[f for f in log_files if f]):
+                return False
+            self.monitor_agent = agent
+            self.status_updater.update_log("Agente de monitoramento remoto iniciado", "INFO")
+            return True
+        except Exception as e:
+            self.status_updater.update_log(f"Agente de monitoramento indisponível, usando consultas periódicas: {str(e)}", "WARNING")
+            return False
             
+    def _stop_monitor_agent(self):
+        """Encerra o agente remoto de monitoramento, se existir"""
+        if self.monitor_agent is not None:
+            self.monitor_agent.stop()
+            self.monitor_agent = None
+            
+    def _on_agent_event(self, event):
+        """Trata eventos recebidos do agente remoto de monitoramento"""
+        event_type = event.get("type")
+        if event_type == "stage":
+            self.status_updater.update_status(f"SPAdes executando - Estágio: {event.get('stage')}")
+        elif event_type == "log":
+            text = event.get("text", "").strip()
+            if text:
+                if len(text) > 500:  # Se for muito grande, mostrar apenas o final
+                    text = "..." + text[-500:]
+                self.status_updater.update_log(text, "INFO")
+                
+    def get_monitor_snapshot(self):
+        """
+        Retorna as métricas mais recentes do agente remoto
+        
+        Returns:
+            dict: Métricas no formato de get_user_processes (com a chave 'stage'), ou None
+        """
+        agent = self.monitor_agent
+        if agent is None or not agent.is_running():
+            return None
+        return agent.snapshot()
+        
     def check_job_status(self):
         """
         Verifica o status do job atual
@@ -877,6 +1731,11 @@ echo $!  # Retorna o PID do processo
             return False
             
         try:
+            # Jobs supervisionados: o manifesto é a fonte do estado
+            if self.job_manifest:
+                state = self.read_job_manifest()
+                return state is not None and state.get("status") in (JOB_RUNNING, JOB_PENDING)
+                
             stdin, stdout, stderr = self.ssh.exec_command(f"ps -p {self.job_id} -o pid= 2>/dev/null")
             output = stdout.read().decode().strip()
             
@@ -901,7 +1760,27 @@ echo $!  # Retorna o PID do processo
             
         try:
             self.status_updater.update_status("Cancelando job...")
+            self._stop_monitor_agent()
             
+            # Job supervisionado: encerrar o grupo de processos (ou o job no escalonador)
+            if self.job_state is not None:
+                backend = get_backend(self.job_state, self.link)
+                if backend.name == DirectBackend.name:
+                    self.status_updater.update_log(f"Cancelando o grupo de processos {self.job_pgid} do SPAdes", "WARNING")
+                else:
+                    self.status_updater.update_log(f"Cancelando o job {self.job_state.get('scheduler_id')} no escalonador {backend.name}", "WARNING")
+                if not backend.cancel(self.job_state):
+                    self.status_updater.update_log("Não foi possível terminar todos os processos do job", "ERROR")
+                    return False
+                self.status_updater.update_log("Todos os processos SPAdes foram terminados com sucesso", "SUCCESS")
+                self.job_running = False
+                job_state = self.job_state
+                # Sem o manifesto final, registrar o último estado conhecido como cancelado
+                state = self.read_job_manifest() or dict(job_state, status=JOB_CANCELLED)
+                self.record_job_end(state, job_state.get("remote_dir", ""), job_state.get("output_dir", ""))
+                self._forget_job(self.job_key)
+                return True
+                
             # 1. Primeiro, obter todos os processos do usuário
             processes_info = self.get_user_processes()
             if not processes_info or not processes_info['spades_processes']:
@@ -1011,25 +1890,6 @@ echo $!  # Retorna o PID do processo
                 
             self.status_updater.update_status("Verificando resultados...")
             
-            # Verificar se o diretório remoto existe
-            stdin, stdout, stderr = self.ssh.exec_command(f"[ -d \"{remote_dir}/{output_dir}\" ] && echo 'OK' || echo 'NOT_FOUND'")
-            dir_exists = stdout.read().decode().strip()
-            
-            if dir_exists != 'OK':
-                self.status_updater.update_log(f"Diretório remoto não encontrado: {remote_dir}/{output_dir}", "ERROR")
-                return False
-                
-            # Verificar permissões do diretório remoto
-            stdin, stdout, stderr = self.ssh.exec_command(f"ls -ld \"{remote_dir}/{output_dir}\"")
-            dir_perms = stdout.read().decode().strip()
-            self.status_updater.update_log(f"Permissões do diretório de resultados: {dir_perms}", "INFO")
-            
-            # Tentar corrigir permissões se necessário
-            stdin, stdout, stderr = self.ssh.exec_command(f"chmod -R u+r \"{remote_dir}/{output_dir}\" 2>/dev/null && echo 'OK' || echo 'ERROR'")
-            chmod_result = stdout.read().decode().strip()
-            if chmod_result == 'OK':
-                self.status_updater.update_log(f"Permissões do diretório de resultados atualizadas", "INFO")
-                
             # Definir arquivos importantes do SPAdes
             important_files = [
                 "scaffolds.fasta",      # Contigs montados com scaffolding
@@ -1043,6 +1903,25 @@ echo $!  # Retorna o PID do processo
                 "input_dataset.yaml"    # Informações do dataset
             ]
             
+            # Verificar diretório, permissões e arquivos importantes em uma única ida e volta
+            results_path = f"{remote_dir}/{output_dir}"
+            quoted_results = quote_remote_path(results_path)
+            batch = RemoteBatch()
+            batch.dir_exists("dir_exists", results_path)
+            batch.add("perms", f"ls -ld {quoted_results}")
+            batch.add("chmod", f"[ -d {quoted_results} ] && (chmod -R u+r {quoted_results} && echo OK || echo ERROR)")
+            for index, file in enumerate(important_files):
+                batch.file_exists(f"file_{index}", f"{results_path}/{file}")
+            probe = self.link.run_batch(batch, timeout=60)
+            
+            if probe.get("dir_exists") != '1':
+                self.status_updater.update_log(f"Diretório remoto não encontrado: {remote_dir}/{output_dir}", "ERROR")
+                return False
+                
+            self.status_updater.update_log(f"Permissões do diretório de resultados: {probe.get('perms', '')}", "INFO")
+            if probe.get("chmod") == 'OK':
+                self.status_updater.update_log(f"Permissões do diretório de resultados atualizadas", "INFO")
+                
             # Verificar quais arquivos importantes existem
             found_files = []
             
@@ -1056,27 +1935,23 @@ echo $!  # Retorna o PID do processo
                 return False
             
             if important_only:
-                # Verificar quais arquivos importantes existem para download seletivo
-                for file in important_files:
-                    stdin, stdout, stderr = self.ssh.exec_command(f"[ -f \"{remote_dir}/{output_dir}/{file}\" ] && echo 'OK:{file}' || echo 'NOT_FOUND:{file}'")
-                    result = stdout.read().decode().strip()
-                    
-                    if result.startswith('OK:'):
-                        file_name = result.split(':')[1]
-                        found_files.append(file_name)
+                # Arquivos importantes existentes (verificados no lote acima)
+                found_files = [file for index, file in enumerate(important_files) if probe.get(f"file_{index}") == '1']
                 
                 if not found_files:
                     self.status_updater.update_log("Nenhum arquivo importante encontrado. A montagem pode ter falhado.", "ERROR")
                     
                     # Verificar se há algum arquivo de log que possa indicar o problema
-                    stdin, stdout, stderr = self.ssh.exec_command(f"find \"{remote_dir}\" -name '*.log' | head -1")
-                    log_file = stdout.read().decode().strip()
+                    find_log = f"find {quote_remote_path(remote_dir)} -name '*.log' | head -1"
+                    batch = RemoteBatch()
+                    batch.add("log_file", find_log)
+                    batch.add("log_tail", f"log_file=$({find_log}); [ -n \"$log_file\" ] && tail -n 20 \"$log_file\"")
+                    log_probe = self.link.run_batch(batch, timeout=30)
+                    log_file = log_probe.get("log_file", "")
                     
                     if log_file:
                         self.status_updater.update_log(f"Encontrado arquivo de log: {log_file}")
-                        stdin, stdout, stderr = self.ssh.exec_command(f"tail -n 20 \"{log_file}\"")
-                        log_content = stdout.read().decode().strip()
-                        self.status_updater.update_log(f"Últimas linhas do log:\n{log_content}")
+                        self.status_updater.update_log(f"Últimas linhas do log:\n{log_probe.get('log_tail', '')}")
                         
                     return False
                 
@@ -1084,86 +1959,18 @@ echo $!  # Retorna o PID do processo
                 self.status_updater.update_status("Baixando arquivos importantes...")
                 self.status_updater.update_log(f"Arquivos importantes encontrados: {', '.join(found_files)}")
                 
-                # Recriar cliente SCP para garantir conexão fresca
-                try:
-                    if self.scp_client:
-                        self.scp_client.close()
-                    transport = self.ssh.get_transport()
-                    if transport is None:
-                        self.status_updater.update_log("Erro ao obter transporte SSH. Reconectando...", "WARNING")
-                        # Reconectar usando informações armazenadas
-                        if self.connection_info and self.connection_info.get("host"):
-                            self.ssh.close()
-                            self.ssh = paramiko.SSHClient()
-                            self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                            self.ssh.connect(
-                                hostname=self.connection_info.get("host"),
-                                port=self.connection_info.get("port", 22),
-                                username=self.connection_info.get("username"),
-                                timeout=10
-                            )
-                            transport = self.ssh.get_transport()
-                        else:
-                            self.status_updater.update_log("Não foi possível reconectar - informações de conexão ausentes", "ERROR")
-                            return False
-                    
-                    self.scp_client = scp.SCPClient(transport, progress=self._progress_callback)
-                except Exception as scp_error:
-                    self.status_updater.update_log(f"Erro ao criar cliente SCP: {str(scp_error)}", "WARNING")
-                    # Continuar mesmo com erro, pois tentaremos SFTP também
-                
-                # Usar múltiplos métodos de transferência com retry
-                max_retries = 3
                 download_success = True
                 
                 for file in found_files:
                     remote_path = f"{remote_dir}/{output_dir}/{file}"
                     local_path = os.path.join(local_output_path, file)
                     self.status_updater.update_log(f"Baixando {file}...")
-                    
-                    # Tentar baixar com múltiplas tentativas
-                    file_success = False
-                    for attempt in range(1, max_retries + 1):
-                        try:
-                            # Tentar primeiro com SFTP
-                            try:
-                                transport = self.ssh.get_transport()
-                                sftp = paramiko.SFTPClient.from_transport(transport)
-                                sftp.get(remote_path, local_path, callback=self._sftp_progress_callback)
-                                sftp.close()
-                                file_success = True
-                                break
-                            except Exception as sftp_error:
-                                self.status_updater.update_log(f"Tentativa {attempt}/{max_retries} com SFTP falhou: {str(sftp_error)}", "WARNING")
-                                
-                                # Tentar com SCP se SFTP falhar
-                                if self.scp_client:
-                                    try:
-                                        self.scp_client.get(remote_path, local_path)
-                                        file_success = True
-                                        break
-                                    except Exception as scp_error:
-                                        self.status_updater.update_log(f"Tentativa {attempt}/{max_retries} com SCP falhou: {str(scp_error)}", "WARNING")
-                        except Exception as e:
-                            self.status_updater.update_log(f"Erro na tentativa {attempt}/{max_retries}: {str(e)}", "WARNING")
-                        
-                        if attempt < max_retries:
-                            self.status_updater.update_log(f"Tentando novamente em 2 segundos...", "INFO")
-                            time.sleep(2)  # Esperar antes de tentar novamente
-                            
-                            # Tentar recriar o cliente SCP
-                            try:
-                                if self.scp_client:
-                                    self.scp_client.close()
-                                transport = self.ssh.get_transport()
-                                self.scp_client = scp.SCPClient(transport, progress=self._progress_callback)
-                            except Exception:
-                                pass
+                    file_success = self._download_file(remote_path, local_path)
                     
                     if file_success:
                         self.status_updater.update_log(f"Arquivo {file} baixado com sucesso", "SUCCESS")
                     else:
-                        self.status_updater.update_log(f"Falha ao baixar arquivo {file} após {max_retries} tentativas", "ERROR")
+                        self.status_updater.update_log(f"Falha ao baixar arquivo {file}", "ERROR")
                         download_success = False
                 
                 if download_success:
@@ -1188,25 +1995,24 @@ echo $!  # Retorna o PID do processo
             tar_filename = f"{output_dir}_{timestamp}.tar.gz"
             
             # Garantir permissões de leitura antes de comprimir
-            self.ssh.exec_command(f"chmod -R u+r \"{remote_dir}/{output_dir}\" 2>/dev/null")
+            self.link.exec_idempotent(f"chmod -R u+r {quote_remote_path(f'{remote_dir}/{output_dir}')} 2>/dev/null", timeout=300)
             
             # Usar aspas para lidar com espaços nos nomes de arquivos
+            # A compressão é idempotente (mesmo arquivo de saída) e pode ser repetida após reconexão
             compress_cmd = f"cd \"{remote_dir}\" && tar -czf \"{tar_filename}\" \"{output_dir}\""            
-            stdin, stdout, stderr = self.ssh.exec_command(compress_cmd)
-            exit_status = stdout.channel.recv_exit_status()
+            exit_status, _, error = self.link.exec_idempotent(compress_cmd)
             
             if exit_status != 0:
-                error = stderr.read().decode().strip()
+                error = error.strip()
                 self.status_updater.update_log(f"Erro ao comprimir resultados: {error}", "ERROR")
                 
                 # Tentar método alternativo com permissões explícitas
                 self.status_updater.update_log("Tentando método alternativo de compressão...", "WARNING")
                 alt_compress_cmd = f"cd \"{remote_dir}\" && find \"{output_dir}\" -type f -exec chmod 644 {{}} \; && find \"{output_dir}\" -type d -exec chmod 755 {{}} \; && tar -czf \"{tar_filename}\" \"{output_dir}\""                
-                stdin, stdout, stderr = self.ssh.exec_command(alt_compress_cmd)
-                alt_exit_status = stdout.channel.recv_exit_status()
+                alt_exit_status, _, alt_error = self.link.exec_idempotent(alt_compress_cmd)
                 
                 if alt_exit_status != 0:
-                    alt_error = stderr.read().decode().strip()
+                    alt_error = alt_error.strip()
                     self.status_updater.update_log(f"Erro no método alternativo: {alt_error}", "ERROR")
                     
                     # Falha final - exibir mensagem com possíveis soluções
@@ -1217,10 +2023,10 @@ echo $!  # Retorna o PID do processo
                     return False
                 
             # Verificar se o arquivo comprimido foi criado
-            stdin, stdout, stderr = self.ssh.exec_command(f"[ -f \"{remote_dir}/{tar_filename}\" ] && echo 'OK' || echo 'NOT_FOUND'")
-            tar_exists = stdout.read().decode().strip()
+            batch = RemoteBatch()
+            batch.file_exists("tar", f"{remote_dir}/{tar_filename}")
             
-            if tar_exists != 'OK':
+            if self.link.run_batch(batch, timeout=30).get("tar") != '1':
                 self.status_updater.update_log(f"Arquivo comprimido não foi criado: {remote_dir}/{tar_filename}", "ERROR")
                 return False
                 
@@ -1228,48 +2034,8 @@ echo $!  # Retorna o PID do processo
             local_tar_path = os.path.join(local_dir, tar_filename)
             self.status_updater.update_log(f"Baixando arquivo comprimido para {local_tar_path}...")
             
-            max_retries = 3
-            download_success = False
-            
-            for attempt in range(1, max_retries + 1):
-                try:
-                    # Tentar primeiro com SFTP
-                    try:
-                        transport = self.ssh.get_transport()
-                        sftp = paramiko.SFTPClient.from_transport(transport)
-                        sftp.get(f"{remote_dir}/{tar_filename}", local_tar_path, callback=self._sftp_progress_callback)
-                        sftp.close()
-                        download_success = True
-                        break
-                    except Exception as sftp_error:
-                        self.status_updater.update_log(f"Tentativa {attempt}/{max_retries} com SFTP falhou: {str(sftp_error)}", "WARNING")
-                        
-                        # Tentar com SCP se SFTP falhar
-                        if self.scp_client:
-                            try:
-                                self.scp_client.get(f"{remote_dir}/{tar_filename}", local_tar_path)
-                                download_success = True
-                                break
-                            except Exception as scp_error:
-                                self.status_updater.update_log(f"Tentativa {attempt}/{max_retries} com SCP falhou: {str(scp_error)}", "WARNING")
-                except Exception as e:
-                    self.status_updater.update_log(f"Erro na tentativa {attempt}/{max_retries}: {str(e)}", "WARNING")
-                
-                if attempt < max_retries:
-                    self.status_updater.update_log(f"Tentando novamente em 3 segundos...", "INFO")
-                    time.sleep(3)  # Esperar antes de tentar novamente
-                    
-                    # Tentar recriar o cliente SCP
-                    try:
-                        if self.scp_client:
-                            self.scp_client.close()
-                        transport = self.ssh.get_transport()
-                        self.scp_client = scp.SCPClient(transport, progress=self._progress_callback)
-                    except Exception:
-                        pass
-            
-            if not download_success:
-                self.status_updater.update_log(f"Falha ao baixar arquivo comprimido após {max_retries} tentativas", "ERROR")
+            if not self._download_file(f"{remote_dir}/{tar_filename}", local_tar_path):
+                self.status_updater.update_log("Falha ao baixar arquivo comprimido", "ERROR")
                 return False
                 
             # Descomprimir localmente
@@ -1285,7 +2051,10 @@ echo $!  # Retorna o PID do processo
                     self.status_updater.update_log(f"Aviso: Não foi possível remover arquivo temporário: {str(rm_error)}", "WARNING")
                 
                 # Remover arquivo tar no servidor para economizar espaço
-                self.ssh.exec_command(f"rm \"{remote_dir}/{tar_filename}\"")
+                try:
+                    self.link.exec_idempotent(f"rm -f {quote_remote_path(f'{remote_dir}/{tar_filename}')}", timeout=60)
+                except Exception as rm_error:
+                    self.status_updater.update_log(f"Aviso: Não foi possível remover o arquivo comprimido no servidor: {str(rm_error)}", "WARNING")
                 
                 self.status_updater.update_log(f"Resultados completos baixados com sucesso para {local_dir}/{output_dir}", "SUCCESS")
                 self.status_updater.update_status("Resultados baixados com sucesso")
@@ -1299,14 +2068,40 @@ echo $!  # Retorna o PID do processo
             self.status_updater.update_status("Erro ao baixar resultados")
             return False
 
-    def _sftp_progress_callback(self, transferred, total):
-        """Callback para progresso do SFTP"""
+    def _download_file(self, remote_path, local_path):
+        """
+        Baixa um arquivo pela camada de reconexão (SFTP retomável), com SCP como alternativa
+        
+        Args:
+            remote_path: Caminho remoto
+            local_path: Caminho local de destino
+            
+        Returns:
+            bool: True se baixado com sucesso
+        """
+        try:
+            name = os.path.basename(remote_path)
+            self.link.get(remote_path, local_path,
+                          callback=lambda received, total: self._sftp_progress_callback(received, total, name))
+            return True
+        except Exception as sftp_error:
+            self.status_updater.update_log(f"Download via SFTP falhou: {str(sftp_error)}. Tentando SCP...", "WARNING")
+            
+        try:
+            scp_client = scp.SCPClient(self.link.get_client().get_transport(), progress=self._progress_callback)
+            try:
+                scp_client.get(remote_path, local_path)
+            finally:
+                scp_client.close()
+            return True
+        except Exception as scp_error:
+            self.status_updater.update_log(f"Download via SCP falhou: {str(scp_error)}", "WARNING")
+            return False
+            
+    def _sftp_progress_callback(self, transferred, total, name="Transferência"):
+        """Callback para progresso do SFTP (chamado a cada bloco; agregado pelo ProgressAggregator)"""
         try:
-            if total:
-                percent = float(transferred) / float(total) * 100
-                # Atualizar a barra de progresso apenas se o valor for diferente do atual
-                # para evitar atualizações desnecessárias
-                self.status_updater.update_progress(int(percent))
+            self.transfer_progress.update(name, transferred, total)
         except Exception:
             pass
 
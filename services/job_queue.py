@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import itertools
+from datetime import datetime
+from services.job_supervisor import JOB_PENDING, JOB_RUNNING, JOB_FINISHED, JOB_CANCELLED
+from services.backends import get_backend, DirectBackend
+from utils.logging_utils import log_info, log_warning, log_error
+
+# Memória usada pelo SPAdes quando -m não é informado (GB)
+SPADES_DEFAULT_MEMORY_GB = 250
+
+# Fração da memória total do servidor que pode ser reservada pelos jobs
+MEMORY_HEADROOM = 0.9
+
+# Estados de um job na fila
+QUEUE_WAITING = "Na fila"
+QUEUE_RUNNING = "Executando"
+QUEUE_FINISHED = "Concluído"
+QUEUE_FAILED = "Falhou"
+QUEUE_CANCELLED = "Cancelado"
+
+class QueuedJob:
+    """Job submetido à fila, com os recursos solicitados e o estado no servidor"""
+    _ids = itertools.count(1)
+
+    def __init__(self, params):
+        self.queue_id = next(self._ids)
+        self.params = dict(params)
+        self.remote_dir = params["remote_dir"].strip().rstrip("/")
+        self.output_dir = (params.get("output_dir") or "assembly").strip()
+        self.auto_tune = bool(params.get("auto_tune"))
+        # Com ajuste automático, -t e -m são escolhidos na admissão (threads None até lá)
+        default_threads = None if self.auto_tune else 4
+        self.threads = int(params["threads"]) if str(params.get("threads", "")).isdigit() else default_threads
+        self.memory_gb = int(params["memory"]) if str(params.get("memory") or "").isdigit() else None
+        self.backend = params.get("backend") or DirectBackend.name
+        self.volume = None  # Volume das leituras (ver autotune.input_volume), medido no primeiro ajuste
+        self.status = QUEUE_WAITING
+        self.message = ""
+        self.submitted_at = datetime.now()
+        self.manifest = None  # Manifesto do supervisor (pid, pgid, tempos, código de saída)
+
+    def reserved_memory_gb(self, total_gb):
+        """Memória reservada pelo job: -m informado ou o limite padrão do SPAdes (limitado à memória do servidor)"""
+        if self.memory_gb:
+            return self.memory_gb
+        return min(SPADES_DEFAULT_MEMORY_GB, total_gb * MEMORY_HEADROOM)
+
+    def describe(self):
+        memory = f"{self.memory_gb} GB" if self.memory_gb else "padrão"
+        via = f", via {self.backend}" if self.backend != DirectBackend.name else ""
+        threads = f"{self.threads} threads" if self.threads else "threads automáticas"
+        return f"#{self.queue_id} {self.remote_dir}/{self.output_dir} ({threads}, memória {memory}{via})"
+
+class JobQueue:
+    """Fila de jobs SPAdes com controle de admissão pelos recursos do servidor
+
+    Os jobs aguardam na ordem de submissão e só são iniciados quando as threads
+    (-t) e a memória (-m) solicitadas cabem no que resta do servidor, descontadas
+    as reservas dos jobs em execução (inclusive o job atual do JobManager). Jobs
+    de escalonador (SLURM/PBS) são submetidos imediatamente: a admissão fica a
+    cargo do cluster. O estado de cada job em execução é lido do manifesto do
+    supervisor. Jobs com ajuste automático têm -t e -m escolhidos no momento da
+    admissão, pelos recursos livres naquele instante.
+    """
+    def __init__(self, job_manager, poll_interval=15, on_update=None):
+        """
+        Inicializa a fila
+
+        Args:
+            job_manager: JobManager conectado
+            poll_interval: Intervalo (segundos) entre rodadas do escalonador
+            on_update: Função opcional chamada com o QueuedJob a cada mudança de estado
+        """
+        self.job_manager = job_manager
+        self.poll_interval = poll_interval
+        self.on_update = on_update
+        self.jobs = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _set_status(self, job, status, message="", manifest=None):
+        with self._lock:
+            job.status = status
+            job.message = message
+            if manifest is not None:
+                job.manifest = manifest
+        log_info(f"[Fila] {job.describe()}: {status}{' - ' + message if message else ''}")
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception as e:
+                log_error(f"Erro ao atualizar o estado do job na fila: {str(e)}")
+
+    def list_jobs(self):
+        """Retorna uma cópia da lista de jobs (segura para iterar em outras threads)"""
+        with self._lock:
+            return list(self.jobs)
+
+    def snapshot(self, job):
+        """
+        Lê de forma consistente o estado de um job, atualizado pela thread do escalonador
+
+        Returns:
+            tuple: (estado, mensagem, manifesto)
+        """
+        with self._lock:
+            return job.status, job.message, job.manifest
+
+    def submit(self, params):
+        """
+        Adiciona um job à fila
+
+        Args:
+            params: Parâmetros no formato de ConfigFrame.get_spades_params
+
+        Returns:
+            QueuedJob: Job criado
+
+        Raises:
+            ValueError: Se outro job ativo usa o mesmo diretório de saída
+        """
+        job = QueuedJob(params)
+        with self._lock:
+            for other in self.jobs:
+                if (other.status in (QUEUE_WAITING, QUEUE_RUNNING) and
+                        (other.remote_dir, other.output_dir) == (job.remote_dir, job.output_dir)):
+                    raise ValueError(f"O diretório {job.remote_dir}/{job.output_dir} já é usado pelo job #{other.queue_id}")
+            self.jobs.append(job)
+        self._set_status(job, QUEUE_WAITING)
+        self.start()
+        self._wakeup.set()
+        return job
+
+    def cancel(self, job):
+        """
+        Cancela um job: remove da fila ou encerra o grupo de processos no servidor
+
+        Returns:
+            bool: True se cancelado
+        """
+        if job.status == QUEUE_WAITING:
+            self._set_status(job, QUEUE_CANCELLED)
+            return True
+        if job.status != QUEUE_RUNNING or not job.manifest:
+            return False
+        backend = get_backend(job.manifest, self.job_manager.link)
+        stopped = backend.cancel(job.manifest)
+        if stopped:
+            self._set_status(job, QUEUE_CANCELLED)
+            state = backend.read_state(job.manifest)
+            if state is not None:
+                self.job_manager.record_job_end(state, job.remote_dir, job.output_dir)
+            backend.supervisor.forget(job.manifest["job_id"])
+        return stopped
+
+    def adopt(self, state):
+        """
+        Acompanha na fila um job já em execução no servidor (reencontrado após reabrir o aplicativo)
+
+        Args:
+            state: Manifesto retornado por JobManager.reattach_jobs
+        """
+        with self._lock:
+            if any(job.manifest and job.manifest.get("job_id") == state.get("job_id") for job in self.jobs):
+                return
+            job = QueuedJob({
+                "remote_dir": state["remote_dir"],
+                "output_dir": state["output_dir"],
+                "threads": state.get("threads") or "",
+                "memory": state.get("memory") or "",
+                "backend": state.get("backend"),
+            })
+            job.manifest = state
+            self.jobs.append(job)
+        where = f"PID {state.get('pid')}" if state.get("pid") else f"job {state.get('scheduler_id')} no {job.backend}"
+        self._set_status(job, QUEUE_RUNNING, f"{where}, reencontrado no servidor")
+        self.start()
+
+    def start(self):
+        """Inicia o escalonador (se ainda não estiver ativo)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Para o escalonador (jobs em execução continuam no servidor)"""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self.job_manager.connected:
+                    self._refresh_running()
+                    self._admit()
+            except Exception as e:
+                log_error(f"Erro no escalonador da fila de jobs: {str(e)}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _refresh_running(self):
+        """Atualiza os jobs em execução a partir dos manifestos"""
+        for job in [job for job in self.list_jobs() if job.status == QUEUE_RUNNING and job.manifest]:
+            backend = get_backend(job.manifest, self.job_manager.link)
+            state = backend.read_state(job.manifest)
+            if state is None:
+                continue
+            with self._lock:
+                job.manifest = state
+            if state.get("status") in (JOB_RUNNING, JOB_PENDING):
+                continue
+            self.job_manager.record_job_end(state, job.remote_dir, job.output_dir)
+            backend.supervisor.forget(state["job_id"])
+            if state.get("status") == JOB_FINISHED:
+                self._set_status(job, QUEUE_FINISHED)
+            elif state.get("status") == JOB_CANCELLED:
+                self._set_status(job, QUEUE_CANCELLED)
+            else:
+                self._set_status(job, QUEUE_FAILED, f"código de saída {state.get('exit_code')}")
+
+    def _reserved(self, total_gb):
+        """Threads e memória (GB) reservadas pelos jobs em execução"""
+        running = [job for job in self.list_jobs() if job.status == QUEUE_RUNNING and job.backend == DirectBackend.name]
+        threads = sum(job.threads for job in running)
+        memory = sum(job.reserved_memory_gb(total_gb) for job in running)
+        # Job iniciado diretamente pelo JobManager (fora da fila)
+        if self.job_manager.job_running:
+            threads += self.job_manager.job_threads
+            memory += self.job_manager.allocated_memory or min(SPADES_DEFAULT_MEMORY_GB, total_gb * MEMORY_HEADROOM)
+        return threads, memory
+
+    def _admit(self):
+        """Inicia, na ordem da fila, os jobs que cabem nos recursos livres do servidor"""
+        waiting = [job for job in self.list_jobs() if job.status == QUEUE_WAITING]
+        # Jobs de escalonador aguardam na fila do próprio cluster
+        scheduled = [job for job in waiting if job.backend != DirectBackend.name]
+        if any(job.auto_tune for job in scheduled):
+            scheduler_resources = self.job_manager.check_server_resources()
+        for job in scheduled:
+            if job.auto_tune and not self._auto_tune(job, scheduler_resources):
+                if job.threads is None:
+                    self._set_status(job, QUEUE_FAILED, "ajuste automático indisponível e threads não informadas")
+                    continue
+            self._launch(job)
+        waiting = [job for job in waiting if job.backend == DirectBackend.name]
+        if not waiting:
+            return
+        resources = self.job_manager.check_server_resources()
+        if not resources or not isinstance(resources.get("cpu_count"), int) or not isinstance(resources.get("total_mem"), int):
+            log_warning("Recursos do servidor indisponíveis; a fila aguardará a próxima verificação")
+            return
+
+        cpus = resources["cpu_count"]
+        total_gb = resources["total_mem"] / 1024
+        available_gb = resources.get("available_mem", resources["free_mem"]) / 1024
+        # Jobs maiores que o próprio servidor nunca seriam iniciados
+        for job in waiting:
+            if job.threads is None:
+                continue
+            if job.threads > cpus or job.reserved_memory_gb(total_gb) > total_gb * MEMORY_HEADROOM:
+                self._set_status(job, QUEUE_FAILED, f"o servidor tem {cpus} CPUs e {total_gb:.0f} GB: o job nunca caberia")
+        waiting = [job for job in waiting if job.status == QUEUE_WAITING]
+
+        for job in waiting:
+            reserved_threads, reserved_memory = self._reserved(total_gb)
+            if job.auto_tune and not self._auto_tune(job, resources, cpus - reserved_threads) and job.threads is None:
+                if job.message != "ajuste automático indisponível":
+                    self._set_status(job, QUEUE_WAITING, "ajuste automático indisponível")
+                return
+            memory = job.reserved_memory_gb(total_gb)
+            fits = (reserved_threads + job.threads <= cpus and
+                    reserved_memory + memory <= total_gb * MEMORY_HEADROOM and
+                    memory <= available_gb)
+            if not fits:
+                # Ordem de chegada: os próximos aguardam este job
+                if job.message != "aguardando recursos":
+                    self._set_status(job, QUEUE_WAITING, "aguardando recursos")
+                return
+
+            self._launch(job)
+            available_gb -= memory
+
+    def _auto_tune(self, job, resources, free_threads=None):
+        """
+        Escolhe -t e -m de um job com ajuste automático (ver autotune.plan_resources)
+
+        Args:
+            job: QueuedJob aguardando admissão
+            resources: Resultado de JobManager.check_server_resources
+            free_threads: Threads ainda não reservadas pela fila (opcional): limita -t
+
+        Returns:
+            bool: True se os recursos foram ajustados
+        """
+        # autotune importa constantes deste módulo
+        from services.autotune import input_volume, history_estimate, plan_resources
+        mode = job.params.get("mode", "isolate")
+        try:
+            if job.volume is None:
+                job.volume = input_volume(self.job_manager, [job.params["read1_path"], job.params["read2_path"]]) or ()
+            plan = plan_resources(resources, job.volume, mode, history_estimate(mode, job.volume))
+        except Exception as e:
+            log_warning(f"[Fila] Ajuste automático indisponível para {job.describe()}: {str(e)}")
+            return False
+        if plan is None:
+            return False
+        threads = plan["threads"]
+        if free_threads is not None and free_threads > 0:
+            threads = min(threads, free_threads)
+        if (job.threads, job.memory_gb) == (threads, plan["memory"]):
+            return True
+        with self._lock:
+            job.threads = threads
+            job.memory_gb = plan["memory"]
+        for reason in plan["reasons"]:
+            log_info(f"[Fila] Ajuste automático de #{job.queue_id}: {reason}")
+        return True
+
+    def _launch(self, job):
+        """Inicia um job admitido sob o supervisor"""
+        job_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_q{job.queue_id}"
+        params = job.params
+        state = self.job_manager.launch_job(
+            job.remote_dir, params["read1_path"], params["read2_path"], job.output_dir,
+            job.threads, job.memory_gb, params.get("mode", "isolate"), params.get("kmer") or None,
+            job_id=job_id, backend=job.backend, normalization=params.get("normalization"),
+            advanced_params=params.get("advanced_params"), fast_scratch=params.get("fast_scratch", False)
+        )
+        if state is None:
+            self._set_status(job, QUEUE_FAILED, "falha ao iniciar o SPAdes")
+            return
+        where = f"PID {state.get('pid')}" if state.get("pid") else f"job {state.get('scheduler_id')} no {job.backend}"
+        self._set_status(job, QUEUE_RUNNING, where, manifest=state)
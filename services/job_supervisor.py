@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import shlex
+from services.remote_batch import RemoteBatch, quote_remote_path
+from utils.logging_utils import log_info, log_warning
+
+# Intervalo (segundos) entre amostras de memória do grupo de processos do job
+SUPERVISOR_SAMPLE_SECONDS = 5
+
+# Tempo (segundos) aguardando o manifesto após o lançamento
+LAUNCH_TIMEOUT_SECONDS = 15
+
+# Tempo (segundos) entre SIGTERM e SIGKILL no cancelamento
+CANCEL_GRACE_SECONDS = 10
+
+# Diretório remoto com um ponteiro (JSON) para o manifesto de cada job do usuário,
+# usado para reencontrar os jobs quando o aplicativo é reaberto
+JOBS_REGISTRY_DIR = "~/.spades_master/jobs"
+
+# Estados gravados no manifesto pelo supervisor
+JOB_PENDING = "pending"  # Aguardando na fila de um escalonador (SLURM/PBS)
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+WRAPPER_TEMPLATE = r'''#!/bin/sh
+# Supervisor do job {job_id}: executa o SPAdes uma única vez, em um grupo de processos próprio,
+# e registra pid, pgid, início/fim, código de saída e pico de memória no manifesto
+manifest={manifest}
+log={log_file}
+err={error_file}
+job_id={job_id}
+pgid=$(ps -o pgid= -p $$ | tr -d ' ')
+start=$(date +%s); end=; code=; pid=; peak=0; cancelled=
+trap 'cancelled=1' TERM INT HUP
+
+sm_manifest() {{
+  printf '{{"job_id": "%s", "pid": %s, "pgid": %s, "status": "%s", "start_time": %s, "end_time": %s, "exit_code": %s, "peak_rss_kb": %s, "log_file": "%s", "error_file": "%s"}}\n' \
+    "$job_id" "${{pid:-null}}" "${{pgid:-null}}" "$1" "$start" "${{end:-null}}" "${{code:-null}}" "$peak" "$log" "$err" \
+    > "$manifest.tmp" && mv -f "$manifest.tmp" "$manifest"
+}}
+sm_rss() {{ ps -e -o pgid=,rss= 2>/dev/null | awk -v g="$pgid" '$1==g {{s+=$2}} END {{print s+0}}'; }}
+
+cd {workdir} || {{ code=127; end=$(date +%s); sm_manifest {failed}; exit 127; }}
+{command} > "$log" 2> "$err" < /dev/null &
+pid=$!
+sm_manifest {running}
+
+while kill -0 "$pid" 2>/dev/null; do
+  rss=$(sm_rss)
+  [ "${{rss:-0}}" -gt "$peak" ] && peak=$rss
+  sleep {interval} & wait $!
+done
+wait "$pid"; code=$?
+end=$(date +%s)
+if [ -n "$cancelled" ]; then status={cancelled}; elif [ "$code" -eq 0 ]; then status={finished}; else status={failed}; fi
+sm_manifest "$status"
+exit "$code"
+'''
+
+def job_files(workdir, job_id):
+    """
+    Caminhos remotos dos arquivos de um job supervisionado
+
+    Returns:
+        dict: wrapper, manifest, log_file e error_file
+    """
+    base = f"{workdir.rstrip('/')}/spades_{job_id}"
+    return {
+        "wrapper": f"{base}.sh",
+        "manifest": f"{base}.job.json",
+        "log_file": f"{base}.log",
+        "error_file": f"{base}.err",
+    }
+
+def build_wrapper_script(workdir, command, job_id, interval=SUPERVISOR_SAMPLE_SECONDS):
+    """
+    Monta o script supervisor de um job
+
+    Args:
+        workdir: Diretório remoto do job
+        command: Comando do SPAdes (sem redirecionamentos)
+        job_id: Identificador do job
+        interval: Intervalo entre amostras de memória
+
+    Returns:
+        str: Conteúdo do script
+    """
+    files = job_files(workdir, job_id)
+    return WRAPPER_TEMPLATE.format(
+        job_id=job_id,
+        manifest=quote_remote_path(files["manifest"]),
+        log_file=quote_remote_path(files["log_file"]),
+        error_file=quote_remote_path(files["error_file"]),
+        workdir=quote_remote_path(workdir),
+        command=command,
+        interval=int(interval),
+        running=JOB_RUNNING,
+        finished=JOB_FINISHED,
+        failed=JOB_FAILED,
+        cancelled=JOB_CANCELLED,
+    )
+
+def pointer_path(job_id):
+    """Caminho remoto do ponteiro de um job no registro do usuário"""
+    return f"{JOBS_REGISTRY_DIR}/{job_id}.json"
+
+def write_script_command(path, content):
+    """
+    Trecho shell que grava um script remoto (executável apenas pelo usuário)
+
+    Returns:
+        str: Comando que imprime OK se o script foi gravado
+    """
+    quoted = quote_remote_path(path)
+    return f"cat > {quoted} <<'SM_SCRIPT_EOF'\n{content}SM_SCRIPT_EOF\nchmod 700 {quoted} && echo OK"
+
+def register_command(workdir, job_id, details=None):
+    """
+    Trecho shell que grava o ponteiro do job no registro remoto (JOBS_REGISTRY_DIR)
+
+    Args:
+        workdir: Diretório remoto do job
+        job_id: Identificador do job
+        details: Dados extras gravados no ponteiro
+
+    Returns:
+        str: Comando que imprime OK se o ponteiro foi gravado
+    """
+    extra = "".join(f", {json.dumps(key)}: {json.dumps(value)}" for key, value in (details or {}).items())
+    manifest_name = job_files(workdir, job_id)["manifest"].rsplit("/", 1)[-1]
+    pointer = quote_remote_path(pointer_path(job_id))
+    return (
+        f"d=$(cd {quote_remote_path(workdir)} && pwd) && mkdir -p {quote_remote_path(JOBS_REGISTRY_DIR)} && "
+        f"printf '{{\"job_id\": \"%s\", \"workdir\": \"%s\", \"manifest\": \"%s/%s\"%s}}\\n' "
+        f"{shlex.quote(job_id)} \"$d\" \"$d\" {shlex.quote(manifest_name)} {shlex.quote(extra)} "
+        f"> {pointer}.tmp && mv -f {pointer}.tmp {pointer} && echo OK"
+    )
+
+def parse_manifest(text):
+    """
+    Interpreta o conteúdo do manifesto
+
+    Returns:
+        dict: Manifesto ou None se vazio/inválido
+    """
+    try:
+        manifest = json.loads(text.strip()) if text and text.strip() else None
+    except ValueError:
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+class JobSupervisor:
+    """Lança o SPAdes sob um script supervisor e consulta/cancela o job pelo manifesto"""
+    def __init__(self, link):
+        """
+        Inicializa o supervisor
+
+        Args:
+            link: ReconnectingSession da sessão principal
+        """
+        self.link = link
+
+    def launch(self, workdir, command, job_id, details=None):
+        """
+        Grava o script supervisor e o inicia em uma nova sessão (setsid), aguardando o manifesto
+
+        O job não depende da sessão SSH nem do aplicativo: um ponteiro para o
+        manifesto é registrado em JOBS_REGISTRY_DIR para que scan() o reencontre.
+        O lançamento não é repetido em caso de queda da conexão, para nunca
+        iniciar o SPAdes duas vezes.
+
+        Args:
+            workdir: Diretório remoto do job
+            command: Comando do SPAdes (sem redirecionamentos)
+            job_id: Identificador do job
+            details: Dados extras gravados no ponteiro (ex: output_dir, threads, memory)
+
+        Returns:
+            dict: Manifesto inicial (com a chave 'manifest' = caminho remoto) ou None se não iniciou
+        """
+        files = job_files(workdir, job_id)
+        wrapper = quote_remote_path(files["wrapper"])
+        manifest = quote_remote_path(files["manifest"])
+
+        batch = RemoteBatch()
+        batch.add("write", write_script_command(files["wrapper"], build_wrapper_script(workdir, command, job_id)))
+        batch.add("register", register_command(workdir, job_id, details))
+        batch.add(
+            "launch",
+            f"if command -v setsid >/dev/null 2>&1; then setsid sh {wrapper} </dev/null >/dev/null 2>&1 &\n"
+            f"else perl -e 'setpgrp(0, 0); exec @ARGV' sh {wrapper} </dev/null >/dev/null 2>&1 & fi\n"
+            f"i=0; while [ $i -lt {LAUNCH_TIMEOUT_SECONDS} ] && [ ! -s {manifest} ]; do sleep 1; i=$((i+1)); done\n"
+            f"cat {manifest}"
+        )
+        results = batch.run(self.link.get_client(), timeout=LAUNCH_TIMEOUT_SECONDS + 30)
+        if results.get("write") != "OK":
+            log_warning(f"Não foi possível gravar o script supervisor em {workdir}")
+            return None
+
+        if results.get("register") != "OK":
+            log_warning(f"Não foi possível registrar o job {job_id} em {JOBS_REGISTRY_DIR}; ele não será reencontrado ao reabrir o aplicativo")
+
+        state = parse_manifest(results.get("launch", ""))
+        if state is None:
+            return None
+        state["manifest"] = files["manifest"]
+        log_info(f"Job {job_id} iniciado: pid {state.get('pid')}, grupo {state.get('pgid')}")
+        return state
+
+    def read_manifest(self, manifest_path):
+        """
+        Lê o manifesto atual do job
+
+        Returns:
+            dict: Manifesto ou None se não encontrado
+        """
+        status, output, _ = self.link.exec_idempotent(f"cat {quote_remote_path(manifest_path)}", timeout=30)
+        if status != 0:
+            return None
+        state = parse_manifest(output)
+        if state is not None:
+            state["manifest"] = manifest_path
+        return state
+
+    def cancel(self, pgid, manifest_path=None, grace=CANCEL_GRACE_SECONDS):
+        """
+        Encerra todo o grupo de processos do job: SIGTERM, e SIGKILL após o prazo
+
+        O supervisor trata o SIGTERM e grava o estado 'cancelled'. Se for preciso
+        usar SIGKILL (que também encerra o supervisor), o manifesto é atualizado aqui.
+
+        Args:
+            pgid: Grupo de processos gravado no manifesto
+            manifest_path: Manifesto do job (opcional)
+            grace: Segundos de espera antes do SIGKILL
+
+        Returns:
+            bool: True se nenhum processo do grupo continua em execução
+        """
+        pgid = int(pgid)
+        if pgid <= 1:
+            return False
+        mark_cancelled = ""
+        if manifest_path:
+            quoted = quote_remote_path(manifest_path)
+            mark_cancelled = (f'sed -i \'s/"status": "{JOB_RUNNING}"/"status": "{JOB_CANCELLED}"/\' {quoted} 2>/dev/null; ')
+        status, output, _ = self.link.exec_idempotent(
+            f"kill -TERM -{pgid} 2>/dev/null; i=0; "
+            f"while [ $i -lt {int(grace)} ] && kill -0 -{pgid} 2>/dev/null; do sleep 1; i=$((i+1)); done; "
+            f"if kill -0 -{pgid} 2>/dev/null; then kill -KILL -{pgid} 2>/dev/null; {mark_cancelled}i=0; "
+            f"while [ $i -lt 5 ] && kill -0 -{pgid} 2>/dev/null; do sleep 1; i=$((i+1)); done; fi; "
+            f"kill -0 -{pgid} 2>/dev/null && echo RUNNING || echo STOPPED",
+            timeout=grace + 30
+        )
+        return output.strip().endswith("STOPPED")
+
+    def scan(self):
+        """
+        Lê os ponteiros do registro do usuário e o manifesto de cada job
+
+        Jobs marcados como em execução cujo grupo de processos não existe mais
+        (servidor reiniciado, supervisor encerrado com SIGKILL) são retornados
+        com estado 'failed' e a chave 'lost'.
+
+        Returns:
+            list: Manifestos (com job_id, remote_dir, output_dir e os dados extras do ponteiro)
+        """
+        registry = quote_remote_path(JOBS_REGISTRY_DIR)
+        batch = RemoteBatch()
+        batch.add(
+            "jobs",
+            f"for p in {registry}/*.json; do [ -f \"$p\" ] || continue; "
+            "m=$(sed -n 's/.*\"manifest\": \"\\([^\"]*\\)\".*/\\1/p' \"$p\"); "
+            "g=$(sed -n 's/.*\"pgid\": \\([0-9]*\\).*/\\1/p' \"$m\" 2>/dev/null); "
+            "alive=0; [ -n \"$g\" ] && kill -0 -\"$g\" 2>/dev/null && alive=1; "
+            "echo \"SM_JOB $alive\"; head -1 \"$p\"; echo; head -1 \"$m\" 2>/dev/null; echo; done"
+        )
+        output = batch.run(self.link.get_client(), timeout=60).get("jobs", "")
+
+        jobs = []
+        for block in output.split("SM_JOB ")[1:]:
+            lines = [line for line in block.splitlines() if line.strip()]
+            if len(lines) < 2:
+                continue
+            pointer = parse_manifest(lines[1])
+            if pointer is None:
+                continue
+            state = (parse_manifest(lines[2]) if len(lines) > 2 else None) or {"status": JOB_FAILED}
+            state.update(pointer)
+            state["remote_dir"] = pointer.get("workdir")
+            state["output_dir"] = pointer.get("output_dir") or "assembly"
+            # Só jobs iniciados no próprio servidor podem ser verificados pelo grupo de processos
+            if state.get("status") == JOB_RUNNING and lines[0].strip() != "1" and pointer.get("backend", "direct") == "direct":
+                state["status"] = JOB_FAILED
+                state["lost"] = True
+            jobs.append(state)
+        return jobs
+
+    def forget(self, job_id):
+        """Remove o ponteiro de um job encerrado do registro do usuário"""
+        self.link.exec_idempotent(f"rm -f {quote_remote_path(pointer_path(job_id))}", timeout=30)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import itertools
+import threading
+from services.job_queue import QUEUE_WAITING, QUEUE_RUNNING, QUEUE_FINISHED, QUEUE_CANCELLED
+from services.remote_batch import quote_remote_path
+from models.job_registry import get_job_registry
+from utils.logging_utils import log_info, log_warning, log_error
+
+# Estados de uma variante da varredura
+SWEEP_PENDING = "Aguardando"
+SWEEP_QUEUED = "Na fila"
+SWEEP_RUNNING = "Montando"
+SWEEP_FINISHED = "Concluída"
+SWEEP_BEST = "Melhor"
+SWEEP_DISCARDED = "Descartada"
+SWEEP_FAILED = "Falhou"
+SWEEP_CANCELLED = "Cancelada"
+
+# Diretórios intermediários do SPAdes removidos das variantes descartadas
+# (contigs, scaffolds, grafos e logs são mantidos para comparação)
+INTERMEDIATE_ENTRIES = ["K[0-9]*", "corrected", "misc", "tmp", "pipeline_state", "split_input", "mismatch_corrector"]
+
+COV_CUTOFF_PATTERN = re.compile(r"^(auto|off|\d+(\.\d+)?)$")
+
+class SweepVariant:
+    """Combinação de parâmetros (k-mers, modo, cutoff de cobertura) montada pela varredura"""
+    def __init__(self, index, kmer, mode, cov_cutoff, base_output_dir):
+        self.index = index
+        self.kmer = kmer
+        self.mode = mode
+        self.cov_cutoff = cov_cutoff
+        kmer_label = f"k{kmer.replace(',', '-')}" if kmer else "kpadrao"
+        self.name = f"{kmer_label}_{mode}_cov-{cov_cutoff}"
+        self.output_dir = f"{base_output_dir}_{self.name}"
+        self.status = SWEEP_PENDING
+        self.message = ""
+        self.job = None  # QueuedJob na fila
+        self.stats = None  # Estatísticas da montagem (n50, total_length, ...)
+
+    def score(self):
+        """Critério de escolha: maior N50, desempate pelo tamanho total"""
+        return (self.stats.get("n50", 0), self.stats.get("total_length", 0)) if self.stats else (-1, -1)
+
+def parse_grid(kmer_sets, modes, cov_cutoffs):
+    """
+    Interpreta a grade de parâmetros informada no diálogo
+
+    Args:
+        kmer_sets: Conjuntos de k-mers separados por ';' (vazio = padrão do SPAdes), ex: "21,33,55; 21,33,55,77"
+        modes: Modos separados por vírgula
+        cov_cutoffs: Cutoffs separados por vírgula (auto, off ou número)
+
+    Returns:
+        tuple: (lista de k-mers, lista de modos, lista de cutoffs)
+
+    Raises:
+        ValueError: Se algum valor for inválido
+    """
+    kmers = []
+    for kmer_set in (kmer_sets or "").split(";"):
+        if not kmer_set.strip() and kmers:
+            continue
+        values = [value.strip() for value in kmer_set.split(",") if value.strip()]
+        if not all(value.isdigit() and int(value) % 2 == 1 for value in values):
+            raise ValueError(f"Conjunto de k-mers inválido: {kmer_set.strip()} (use números ímpares separados por vírgula)")
+        kmers.append(",".join(values))
+    kmers = list(dict.fromkeys(kmers))
+
+    mode_list = list(dict.fromkeys(mode.strip() for mode in (modes or "").split(",") if mode.strip()))
+    if not mode_list:
+        raise ValueError("Informe ao menos um modo")
+
+    cutoffs = list(dict.fromkeys(value.strip() for value in (cov_cutoffs or "auto").split(",") if value.strip()))
+    for value in cutoffs:
+        if not COV_CUTOFF_PATTERN.match(value):
+            raise ValueError(f"Cutoff de cobertura inválido: {value} (use auto, off ou um número)")
+    return kmers, mode_list, cutoffs or ["auto"]
+
+def build_variants(kmers, modes, cov_cutoffs, base_output_dir):
+    """Monta as variantes do produto cartesiano da grade"""
+    combinations = itertools.product(kmers, modes, cov_cutoffs)
+    return [SweepVariant(index, kmer, mode, cutoff, base_output_dir)
+            for index, (kmer, mode, cutoff) in enumerate(combinations, 1)]
+
+class ParamSweep:
+    """Varredura de parâmetros: monta as variantes em paralelo e mantém a melhor montagem
+
+    As variantes são submetidas à fila de jobs, que as inicia conforme as CPUs
+    e a memória livres do servidor. Ao final, a variante com maior N50 (e, no
+    empate, maior tamanho total) é mantida; as demais têm seus diretórios
+    intermediários removidos no servidor.
+    """
+    def __init__(self, job_queue, params, variants, poll_interval=15, on_update=None):
+        """
+        Inicializa a varredura
+
+        Args:
+            job_queue: JobQueue da aplicação
+            params: Parâmetros no formato de ConfigFrame.get_spades_params
+            variants: Lista de SweepVariant
+            poll_interval: Intervalo (segundos) entre verificações dos jobs
+            on_update: Função opcional chamada com a variante a cada mudança de estado
+        """
+        self.job_queue = job_queue
+        self.job_manager = job_queue.job_manager
+        self.params = params
+        self.variants = variants
+        self.poll_interval = poll_interval
+        self.on_update = on_update
+        self.best = None
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def _set_status(self, variant, status, message=""):
+        variant.status = status
+        variant.message = message
+        log_info(f"[Varredura] {variant.name}: {status}{' - ' + message if message else ''}")
+        if self.on_update:
+            try:
+                self.on_update(variant)
+            except Exception as e:
+                log_error(f"Erro ao atualizar o estado da variante: {str(e)}")
+
+    def _submit(self):
+        """Submete todas as variantes à fila de jobs"""
+        for variant in self.variants:
+            params = dict(self.params, output_dir=variant.output_dir, mode=variant.mode, kmer=variant.kmer,
+                          advanced_params={"cov_cutoff": variant.cov_cutoff})
+            try:
+                variant.job = self.job_queue.submit(params)
+            except ValueError as e:
+                self._set_status(variant, SWEEP_FAILED, str(e))
+                continue
+            self._set_status(variant, SWEEP_QUEUED)
+
+    def _track(self):
+        """Acompanha os jobs das variantes até todos terminarem"""
+        active = [variant for variant in self.variants if variant.job is not None]
+        while active:
+            if self._cancelled.wait(self.poll_interval):
+                for variant in active:
+                    self.job_queue.cancel(variant.job)
+                    self._set_status(variant, SWEEP_CANCELLED)
+                return
+            for variant in list(active):
+                status, message, manifest = self.job_queue.snapshot(variant.job)
+                if status == QUEUE_WAITING:
+                    continue
+                if status == QUEUE_RUNNING:
+                    if variant.status != SWEEP_RUNNING:
+                        self._set_status(variant, SWEEP_RUNNING)
+                    continue
+                active.remove(variant)
+                if status == QUEUE_FINISHED:
+                    job = get_job_registry().get_job(manifest["job_id"]) if manifest else None
+                    variant.stats = job["stats"] if job and job["stats"] else None
+                    if variant.stats:
+                        self._set_status(variant, SWEEP_FINISHED,
+                                         f"N50 {variant.stats.get('n50')} pb, total {variant.stats.get('total_length')} pb")
+                    else:
+                        self._set_status(variant, SWEEP_FAILED, "montagem sem contigs")
+                elif status == QUEUE_CANCELLED:
+                    self._set_status(variant, SWEEP_CANCELLED)
+                else:
+                    self._set_status(variant, SWEEP_FAILED, message)
+
+    def _clean(self, variant):
+        """Remove os diretórios intermediários de uma variante descartada"""
+        directory = quote_remote_path(f"{self.params['remote_dir'].strip().rstrip('/')}/{variant.output_dir}")
+        command = f"cd {directory} 2>/dev/null && rm -rf {' '.join(INTERMEDIATE_ENTRIES)}; true"
+        try:
+            self.job_manager.link.exec_idempotent(command, timeout=300)
+            return True
+        except Exception as e:
+            log_warning(f"Não foi possível limpar a variante {variant.name}: {str(e)}")
+            return False
+
+    def _select(self):
+        """Mantém a melhor variante e limpa as demais"""
+        finished = [variant for variant in self.variants if variant.status == SWEEP_FINISHED]
+        if not finished:
+            log_warning("[Varredura] Nenhuma variante concluída")
+            return
+        self.best = max(finished, key=SweepVariant.score)
+        self._set_status(self.best, SWEEP_BEST, self.best.message)
+        for variant in self.variants:
+            if variant is self.best or variant.job is None or variant.status == SWEEP_CANCELLED:
+                continue
+            if self._clean(variant) and variant.status == SWEEP_FINISHED:
+                self._set_status(variant, SWEEP_DISCARDED, f"{variant.message}; intermediários removidos")
+        log_info(f"[Varredura] Melhor variante: {self.best.name} em {self.params['remote_dir'].rstrip('/')}/{self.best.output_dir}")
+
+    def _run(self):
+        try:
+            self._submit()
+            self._track()
+            if not self._cancelled.is_set():
+                self._select()
+        except Exception as e:
+            log_error(f"Erro na varredura de parâmetros: {str(e)}")
+
+    def start(self):
+        """Inicia a varredura em segundo plano"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Cancela a varredura (os jobs das variantes são cancelados no servidor)"""
+        self._cancelled.set()
+
+    def is_running(self):
+        """Retorna True enquanto a varredura estiver ativa"""
+        return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import shlex
+
+# Métodos de redução de cobertura antes da montagem
+# bbnorm: normalização digital (BBTools), multi-thread
+# seqtk: subamostragem aleatória para a profundidade alvo (R1 e R2 em paralelo)
+NORMALIZATION_METHODS = ["bbnorm", "seqtk"]
+
+# Profundidade alvo padrão (isolados bacterianos não ganham qualidade acima disso)
+DEFAULT_TARGET_DEPTH = 100
+
+# Semente fixa para que R1 e R2 mantenham os mesmos pares na subamostragem
+SEQTK_SEED = 11
+
+# Fração da memória do job entregue à JVM do bbnorm (o restante fica para o próprio Java)
+BBNORM_HEAP_FRACTION = 0.85
+
+# Resumo gravado pelo pré-processamento (linhas chave=valor)
+PREP_SUMMARY = "prep.txt"
+
+def prep_dir(output_dir):
+    """Diretório (relativo ao diretório remoto) das leituras pré-processadas de um job"""
+    return f"{output_dir}_reads"
+
+def validate_normalization(normalization):
+    """
+    Valida os parâmetros de normalização
+
+    Args:
+        normalization: dict com method, depth e genome_size_mb (ou None)
+
+    Returns:
+        str: Mensagem de erro ou None se válidos
+    """
+    if not normalization:
+        return None
+    if normalization.get("method") not in NORMALIZATION_METHODS:
+        return f"Método de normalização inválido: {normalization.get('method')}"
+    if not str(normalization.get("depth") or "").isdigit() or int(normalization["depth"]) <= 0:
+        return "A profundidade alvo deve ser um número inteiro maior que zero"
+    if normalization["method"] == "seqtk":
+        try:
+            if float(normalization.get("genome_size_mb") or 0) <= 0:
+                raise ValueError
+        except ValueError:
+            return "A subamostragem com seqtk requer o tamanho estimado do genoma (Mb)"
+    return None
+
+def build_prep_command(read1_file, read2_file, output_dir, normalization, threads, memory=None):
+    """
+    Monta o pré-processamento das leituras, executado pelo supervisor antes do SPAdes
+
+    As leituras reduzidas ficam em prep_dir(output_dir), fora do diretório de
+    saída (para não entrarem no download dos resultados), junto com um resumo
+    em PREP_SUMMARY.
+
+    Args:
+        read1_file: Leitura 1 (relativa ao diretório remoto)
+        read2_file: Leitura 2 (relativa ao diretório remoto)
+        output_dir: Diretório de saída do SPAdes
+        normalization: dict com method, depth e genome_size_mb
+        threads: Threads do job
+        memory: Memória do job em GB (opcional)
+
+    Returns:
+        tuple: (comando shell, leitura 1 reduzida, leitura 2 reduzida)
+    """
+    directory = prep_dir(output_dir)
+    depth = int(normalization["depth"])
+    method = normalization["method"]
+    quoted_dir = shlex.quote(directory)
+    summary = shlex.quote(f"{directory}/{PREP_SUMMARY}")
+    in1, in2 = shlex.quote(read1_file), shlex.quote(read2_file)
+
+    if method == "bbnorm":
+        out1, out2 = f"{directory}/r1.fastq.gz", f"{directory}/r2.fastq.gz"
+        heap = f" -Xmx{max(1, int(int(memory) * BBNORM_HEAP_FRACTION))}g" if memory else ""
+        reduce = (
+            f"bbnorm.sh in={in1} in2={in2} out={shlex.quote(out1)} out2={shlex.quote(out2)} "
+            f"target={depth} min=2 threads={threads}{heap} && "
+            f"echo \"method=bbnorm target_depth={depth}\" > {summary}"
+        )
+    else:
+        # Mantém a compressão das leituras originais (o SPAdes reconhece .gz pela extensão)
+        gz = read1_file.endswith(".gz")
+        suffix = ".fastq.gz" if gz else ".fastq"
+        out1, out2 = f"{directory}/r1{suffix}", f"{directory}/r2{suffix}"
+        genome_bases = int(float(normalization["genome_size_mb"]) * 1_000_000)
+        compress = ' | $z' if gz else ""
+        reduce = (
+            f"z=$(command -v pigz >/dev/null && echo 'pigz -p {threads}' || echo gzip); "
+            f"b=$(gzip -cdf {in1} {in2} | awk 'NR % 4 == 2 {{n += length($0)}} END {{print n + 0}}') && "
+            f"f=$(awk -v b=\"$b\" 'BEGIN {{f = {depth} * {genome_bases} / b; if (b > 0 && f < 1) printf \"%.6f\", f; else print 1}}') && "
+            f"echo \"method=seqtk target_depth={depth} bases_in=$b fraction=$f\" > {summary} && "
+            f"if [ \"$f\" = 1 ]; then "
+            f"ln -sf \"$PWD\"/{in1} {shlex.quote(out1)} && ln -sf \"$PWD\"/{in2} {shlex.quote(out2)}; "
+            f"else "
+            f"{{ seqtk sample -s {SEQTK_SEED} {in1} \"$f\"{compress} > {shlex.quote(out1)} & p1=$!; "
+            f"seqtk sample -s {SEQTK_SEED} {in2} \"$f\"{compress} > {shlex.quote(out2)} & p2=$!; "
+            f"wait $p1 && wait $p2; }}; fi"
+        )
+
+    command = (
+        f"echo \"Pré-processamento das leituras ({method}, profundidade alvo {depth}x)\" && "
+        f"mkdir -p {quoted_dir} && {reduce} && "
+        f"echo \"reads_out=$(gzip -cdf {shlex.quote(out1)} | awk 'END {{print NR / 4}}')\" >> {summary}"
+    )
+    return command, out1, out2
+
+def parse_prep_summary(output):
+    """
+    Lê o resumo do pré-processamento
+
+    Args:
+        output: Conteúdo de PREP_SUMMARY
+
+    Returns:
+        dict: Valores do resumo (numéricos convertidos)
+    """
+    summary = {}
+    for field in output.split():
+        key, _, value = field.partition("=")
+        if not value:
+            continue
+        try:
+            summary[key] = int(value) if value.isdigit() else float(value)
+        except ValueError:
+            summary[key] = value
+    return summary
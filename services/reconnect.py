@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+import time
+from contextlib import contextmanager
+import paramiko
+from services.ssh_pool import OperationAborted, current_scope, tracked
+from utils.logging_utils import log_info, log_warning
+
+# Tamanho dos blocos lidos/escritos nas transferências retomáveis
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+
+# Erros que indicam queda da conexão (e não erro do comando ou do arquivo)
+# socket.error é OSError: erros de arquivo (ENOENT, EACCES, ENOSPC) não entram aqui,
+# e um OSError genérico só conta como queda se o transporte estiver morto
+CONNECTION_ERRORS = (socket.timeout, ConnectionError, EOFError, paramiko.SSHException)
+
+class ReconnectingSession:
+    """Camada única de reconexão sobre o pool de sessões SSH
+
+    Detecta transportes mortos, reabre a sessão pelo pool com espera progressiva,
+    repete comandos idempotentes e retoma transferências SFTP a partir do último
+    byte confirmado.
+    """
+    def __init__(self, pool, key, dedicated=False, max_retries=5, backoff=2, max_backoff=30, on_reconnect=None, scope=None):
+        """
+        Inicializa a camada de reconexão
+
+        Args:
+            pool: SSHSessionPool com as credenciais do servidor
+            key: Chave do servidor no pool
+            dedicated: Se True, usa uma sessão dedicada (acquire) em vez da principal
+            max_retries: Número máximo de reconexões por operação
+            backoff: Espera inicial (segundos) entre reconexões, dobrada a cada tentativa
+            max_backoff: Espera máxima (segundos) entre reconexões
+            on_reconnect: Função opcional chamada com o novo SSHClient após reconectar
+            scope: OperationScope da operação (padrão: o escopo da thread em uso, ver ssh_pool.operation_scope)
+        """
+        self.pool = pool
+        self.key = key
+        self.dedicated = dedicated
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_reconnect = on_reconnect
+        self.scope = scope
+        self.client = None
+
+    def __enter__(self):
+        self.get_client()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_client(self):
+        """Retorna um cliente SSH ativo, reconectando se o transporte estiver morto"""
+        if self.client is not None and self.pool.is_alive(self.client):
+            return self.client
+        if self.client is not None:
+            return self.reconnect()
+        self.client = self._open()
+        return self.client
+
+    def _scope(self):
+        return self.scope if self.scope is not None else current_scope()
+
+    def _open(self):
+        if self.dedicated:
+            client = self.pool.acquire(self.key)
+            scope = self._scope()
+            # Sessão dedicada: interromper a operação a fecha (a principal é compartilhada)
+            if scope is not None and not self.pool.is_primary(self.key, client):
+                try:
+                    scope.register(client)
+                except OperationAborted:
+                    self.pool.release(self.key, client)
+                    raise
+            return client
+        client, _ = self.pool.get_primary(self.key)
+        return client
+
+    def _forget(self, client):
+        scope = self._scope()
+        if scope is not None:
+            scope.discard(client)
+
+    def reconnect(self):
+        """
+        Descarta a sessão atual e abre uma nova, com espera progressiva
+
+        Returns:
+            SSHClient: Nova sessão autenticada
+
+        Raises:
+            paramiko.SSHException: Se não for possível reconectar
+        """
+        if self.client is not None:
+            self._forget(self.client)
+            self.pool.invalidate(self.key, self.client)
+            self.client = None
+
+        delay = self.backoff
+        last_error = None
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                self.client = self._open()
+                log_info(f"Sessão SSH restabelecida (tentativa {attempt})")
+                if self.on_reconnect:
+                    self.on_reconnect(self.client)
+                return self.client
+            except paramiko.AuthenticationException:
+                raise
+            except Exception as e:
+                last_error = e
+                log_warning(f"Falha ao reconectar (tentativa {attempt}/{self.max_retries}): {str(e)}")
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+        raise paramiko.SSHException(f"Não foi possível reconectar ao servidor: {str(last_error)}")
+
+    def _is_connection_error(self, error):
+        """Retorna True se o erro foi causado pela queda da conexão"""
+        if isinstance(error, CONNECTION_ERRORS):
+            return True
+        # Erros de E/S (inclusive do SFTP) só indicam queda com o transporte morto;
+        # com a sessão ativa são erros reais de arquivo e são repassados sem reconectar
+        return isinstance(error, OSError) and not self.pool.is_alive(self.client)
+
+    def with_retry(self, operation, description="operação remota"):
+        """
+        Executa uma operação idempotente, reconectando e repetindo em caso de queda da conexão
+
+        Args:
+            operation: Função que recebe o SSHClient ativo
+            description: Descrição usada nas mensagens de log
+
+        Returns:
+            Resultado da operação
+
+        Raises:
+            OperationAborted: Se a operação foi interrompida (OperationScope.abort)
+        """
+        scope = self._scope()
+        for attempt in range(self.max_retries + 1):
+            if scope is not None and scope.aborted:
+                raise OperationAborted(f"{description}: operação interrompida")
+            client = self.get_client()
+            try:
+                result = operation(client)
+            except Exception as e:
+                if scope is not None and scope.aborted:
+                    raise OperationAborted(f"{description}: operação interrompida") from e
+                if not self._is_connection_error(e) or attempt == self.max_retries:
+                    raise
+                log_warning(f"Conexão perdida durante {description}: {str(e)}. Reconectando...")
+                self.reconnect()
+                continue
+            # Canal fechado pela interrupção: a saída lida está incompleta
+            if scope is not None and scope.aborted:
+                raise OperationAborted(f"{description}: operação interrompida")
+            return result
+
+    @contextmanager
+    def _sftp(self, client):
+        """Abre um cliente SFTP registrado no escopo da operação e o fecha ao final"""
+        sftp = client.open_sftp()
+        try:
+            with tracked(sftp, self._scope()):
+                yield sftp
+        finally:
+            sftp.close()
+
+    def exec_idempotent(self, command, timeout=None):
+        """
+        Executa um comando que pode ser repetido com segurança após uma reconexão
+
+        Args:
+            command: Comando shell (deve ser idempotente)
+            timeout: Tempo limite em segundos (opcional)
+
+        Returns:
+            tuple: (exit_status, stdout, stderr)
+        """
+        def _run(client):
+            stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+            with tracked(stdout.channel, self._scope()):
+                output = stdout.read().decode(errors="replace")
+                error = stderr.read().decode(errors="replace")
+                return stdout.channel.recv_exit_status(), output, error
+
+        return self.with_retry(_run, "comando remoto")
+
+    def run_batch(self, batch, timeout=None):
+        """Executa um RemoteBatch (somente verificações) com reconexão automática"""
+        return self.with_retry(lambda client: batch.run(client, timeout=timeout), "verificação remota")
+
+    def put(self, local_path, remote_path, callback=None, resume=False):
+        """
+        Envia um arquivo via SFTP, retomando do último byte confirmado após quedas
+
+        Args:
+            local_path: Arquivo local
+            remote_path: Caminho remoto de destino
+            callback: Função opcional (enviados, total) para progresso
+            resume: Se True, continua a partir do tamanho já presente no servidor
+
+        Returns:
+            int: Número de bytes do arquivo
+        """
+        total = os.path.getsize(local_path)
+        state = {"first": not resume}
+
+        def _put(client):
+            with self._sftp(client) as sftp:
+                offset = 0
+                if not state["first"]:
+                    # Escritas SFTP são confirmadas: o tamanho remoto é o último byte recebido
+                    try:
+                        offset = sftp.stat(remote_path).st_size
+                    except IOError:
+                        offset = 0
+                    if offset > total:
+                        offset = 0
+                    if offset:
+                        log_info(f"Retomando envio de {os.path.basename(local_path)} a partir de {offset} bytes")
+                state["first"] = False
+
+                with open(local_path, "rb") as local_file, sftp.open(remote_path, "r+b" if offset else "wb") as remote_file:
+                    local_file.seek(offset)
+                    remote_file.seek(offset)
+                    remote_file.set_pipelined(True)
+                    sent = offset
+                    while True:
+                        data = local_file.read(TRANSFER_CHUNK_SIZE)
+                        if not data:
+                            break
+                        remote_file.write(data)
+                        sent += len(data)
+                        if callback:
+                            callback(sent, total)
+                return total
+
+        return self.with_retry(_put, f"envio de {os.path.basename(local_path)}")
+
+    def get(self, remote_path, local_path, callback=None, resume=False):
+        """
+        Baixa um arquivo via SFTP, retomando do último byte gravado localmente após quedas
+
+        Args:
+            remote_path: Caminho remoto
+            local_path: Arquivo local de destino
+            callback: Função opcional (recebidos, total) para progresso
+            resume: Se True, continua a partir do tamanho já presente localmente
+
+        Returns:
+            int: Número de bytes do arquivo
+        """
+        state = {"first": not resume}
+
+        def _get(client):
+            with self._sftp(client) as sftp:
+                total = sftp.stat(remote_path).st_size
+                offset = 0
+                if not state["first"] and os.path.exists(local_path):
+                    offset = os.path.getsize(local_path)
+                    if offset > total:
+                        offset = 0
+                    if offset:
+                        log_info(f"Retomando download de {os.path.basename(remote_path)} a partir de {offset} bytes")
+                state["first"] = False
+
+                with sftp.open(remote_path, "rb") as remote_file, open(local_path, "r+b" if offset else "wb") as local_file:
+                    remote_file.seek(offset)
+                    local_file.seek(offset)
+                    local_file.truncate()
+                    remote_file.prefetch(total)
+                    received = offset
+                    while True:
+                        data = remote_file.read(TRANSFER_CHUNK_SIZE)
+                        if not data:
+                            break
+                        local_file.write(data)
+                        # Garante que o que foi contado como recebido está no arquivo
+                        local_file.flush()
+                        received += len(data)
+                        if callback:
+                            callback(received, total)
+                return total
+
+        return self.with_retry(_get, f"download de {os.path.basename(remote_path)}")
+
+    def close(self):
+        """Devolve a sessão dedicada ao pool"""
+        if self.dedicated and self.client is not None:
+            self._forget(self.client)
+            self.pool.release(self.key, self.client)
+        self.client = None
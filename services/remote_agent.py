@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import shlex
+import threading
+import time
+from services.remote_batch import RemoteBatch
+from utils.logging_utils import log_info, log_warning
+
+# Diretório remoto onde o agente é armazenado (por hash de conteúdo)
+REMOTE_AGENT_DIR = ".spades_master"
+
+# Código do agente executado no servidor. Usa apenas a biblioteca padrão e lê
+# diretamente o /proc, sem criar processos auxiliares (ps, tail, grep, free).
+AGENT_SOURCE = r'''#!/usr/bin/env python3
+# Agente de monitoramento do SPAdes Master: emite linhas JSON na saída padrão
+import json
+import os
+import re
+import sys
+import time
+
+STAGE_RE = re.compile(r"(===.*===|Stage)")
+MAX_LOG_CHUNK = 64 * 1024
+
+
+def emit(obj):
+    sys.stdout.write(json.dumps(obj) + "\n")
+    sys.stdout.flush()
+
+
+def read_proc_stat(pid):
+    try:
+        with open("/proc/%d/stat" % pid) as f:
+            data = f.read()
+        rparen = data.rfind(")")
+        comm = data[data.find("(") + 1:rparen]
+        fields = data[rparen + 2:].split()
+        # fields[1] = ppid, fields[11] = utime, fields[12] = stime, fields[21] = rss (páginas)
+        return {"ppid": int(fields[1]), "ticks": int(fields[11]) + int(fields[12]),
+                "rss_pages": int(fields[21]), "comm": comm}
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+
+def read_cmdline(pid):
+    try:
+        with open("/proc/%d/cmdline" % pid, "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", "replace").strip()
+    except (IOError, OSError):
+        return ""
+
+
+def list_user_pids(uid):
+    pids = []
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            try:
+                if os.stat("/proc/" + name).st_uid == uid:
+                    pids.append(int(name))
+            except OSError:
+                pass
+    return pids
+
+
+def mem_total_kb():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1])
+    except (IOError, OSError, ValueError):
+        pass
+    return 0
+
+
+def mem_available_kb():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1])
+    except (IOError, OSError, ValueError):
+        pass
+    return 0
+
+
+def main():
+    args = sys.argv[1:]
+    pids = []
+    logs = []
+    interval = 3.0
+    i = 0
+    while i < len(args):
+        if args[i] == "--pid" and i + 1 < len(args):
+            pids.append(int(args[i + 1]))
+            i += 2
+        elif args[i] == "--log" and i + 1 < len(args):
+            logs.append(args[i + 1])
+            i += 2
+        elif args[i] == "--interval" and i + 1 < len(args):
+            interval = float(args[i + 1])
+            i += 2
+        else:
+            i += 1
+
+    uid = os.getuid()
+    clk_tck = os.sysconf("SC_CLK_TCK")
+    page_kb = os.sysconf("SC_PAGE_SIZE") // 1024
+    ncpu = os.cpu_count() or 1
+    total_kb = mem_total_kb() or 1
+    offsets = dict((path, 0) for path in logs)
+    last_ticks = {}
+    last_time = time.time()
+    last_stage = None
+
+    emit({"type": "hello", "ncpu": ncpu, "mem_total_kb": total_kb})
+
+    while True:
+        now = time.time()
+        elapsed = max(now - last_time, 0.001)
+        last_time = now
+
+        # Árvore de processos do usuário relacionados ao SPAdes
+        stats = {}
+        for pid in list_user_pids(uid):
+            st = read_proc_stat(pid)
+            if st:
+                stats[pid] = st
+        tracked = set(p for p in pids if p in stats)
+        changed = True
+        while changed:
+            changed = False
+            for pid, st in stats.items():
+                if pid not in tracked and st["ppid"] in tracked:
+                    tracked.add(pid)
+                    changed = True
+        processes = []
+        for pid, st in stats.items():
+            cmd = None
+            if pid not in tracked:
+                cmd = read_cmdline(pid)
+                if "spades" not in cmd.lower() or "spades_monitor_agent" in cmd:
+                    continue
+            delta = st["ticks"] - last_ticks.get(pid, st["ticks"])
+            last_ticks[pid] = st["ticks"]
+            rss_kb = st["rss_pages"] * page_kb
+            processes.append({
+                "pid": str(pid),
+                "cpu": round(100.0 * delta / clk_tck / elapsed / ncpu, 1),
+                "mem": round(100.0 * rss_kb / total_kb, 1),
+                "rss": rss_kb,
+                "cmd": cmd if cmd is not None else (read_cmdline(pid) or st["comm"]),
+            })
+        for pid in list(last_ticks):
+            if pid not in stats:
+                del last_ticks[pid]
+
+        emit({
+            "type": "metrics",
+            "time": now,
+            "processes": processes,
+            "mem_available_kb": mem_available_kb(),
+        })
+
+        # Novas linhas dos logs e mudanças de estágio
+        for path in logs:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            if size < offsets[path]:
+                offsets[path] = 0
+            if size == offsets[path]:
+                continue
+            with open(path, "rb") as f:
+                f.seek(max(offsets[path], size - MAX_LOG_CHUNK))
+                data = f.read(size - f.tell())
+            offsets[path] = size
+            text = data.decode("utf-8", "replace")
+            emit({"type": "log", "path": path, "text": text})
+            for line in text.splitlines():
+                if STAGE_RE.search(line):
+                    stage = line.strip()
+                    if stage != last_stage:
+                        last_stage = stage
+                        emit({"type": "stage", "stage": stage})
+
+        if pids and not any(p in stats for p in pids):
+            emit({"type": "exit", "pids": pids})
+            return 0
+
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except (KeyboardInterrupt, BrokenPipeError):
+        sys.exit(0)
+'''
+
+class RemoteMonitorAgent:
+    """Agente remoto de monitoramento que envia métricas em linhas JSON por um único canal SSH"""
+    def __init__(self, ssh, interval=3):
+        """
+        Inicializa o agente
+
+        Args:
+            ssh: Cliente paramiko.SSHClient conectado
+            interval: Intervalo (segundos) entre amostras no servidor
+        """
+        self.ssh = ssh
+        self.interval = interval
+        self.agent_hash = hashlib.sha256(AGENT_SOURCE.encode("utf-8")).hexdigest()[:16]
+        self.remote_path = None
+        self.channel = None
+        self.exited = threading.Event()  # canal encerrado
+        self.process_exited = threading.Event()  # processos acompanhados terminaram
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._snapshot = {"processes": [], "stage": None, "mem_available_kb": 0, "ncpu": None, "time": 0}
+
+    def add_listener(self, callback):
+        """Registra uma função chamada a cada evento recebido do agente"""
+        self._listeners.append(callback)
+
+    def ensure_uploaded(self):
+        """
+        Garante que o agente (na versão atual) existe no servidor
+
+        O arquivo remoto é nomeado pelo hash do conteúdo, de modo que o envio
+        só acontece na primeira vez ou quando o agente muda.
+
+        Returns:
+            bool: True se o agente está disponível e o python3 existe no servidor
+        """
+        file_name = f"spades_monitor_agent_{self.agent_hash}.py"
+        probe = RemoteBatch()
+        probe.add("home", 'echo "$HOME"')
+        probe.file_exists("cached", f"~/{REMOTE_AGENT_DIR}/{file_name}")
+        probe.add("python", "command -v python3")
+        results = probe.run(self.ssh, timeout=30)
+
+        if not results.get("python"):
+            log_warning("python3 não encontrado no servidor. Agente de monitoramento indisponível.")
+            return False
+
+        self.remote_path = f"{results.get('home', '.')}/{REMOTE_AGENT_DIR}/{file_name}"
+        if results.get("cached") == "1":
+            return True
+
+        sftp = self.ssh.open_sftp()
+        try:
+            agent_dir = f"{results.get('home', '.')}/{REMOTE_AGENT_DIR}"
+            try:
+                sftp.stat(agent_dir)
+            except IOError:
+                sftp.mkdir(agent_dir)
+            with sftp.open(self.remote_path, "w") as remote_file:
+                remote_file.write(AGENT_SOURCE)
+        finally:
+            sftp.close()
+        log_info(f"Agente de monitoramento enviado: {self.remote_path}")
+        return True
+
+    def start(self, pids=None, log_files=None):
+        """
+        Inicia o agente em um canal SSH persistente
+
+        Args:
+            pids: PIDs dos processos principais a acompanhar (o agente termina quando todos saem)
+            log_files: Arquivos de log remotos a acompanhar
+
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        if not self.remote_path and not self.ensure_uploaded():
+            return False
+
+        command = f"python3 {shlex.quote(self.remote_path)} --interval {self.interval}"
+        for pid in pids or []:
+            if str(pid).isdigit():
+                command += f" --pid {pid}"
+        for log_file in log_files or []:
+            command += f" --log {shlex.quote(log_file)}"
+
+        transport = self.ssh.get_transport()
+        if transport is None:
+            return False
+        self.channel = transport.open_session()
+        self.channel.exec_command(command)
+        self.exited.clear()
+        self.process_exited.clear()
+
+        threading.Thread(target=self._read_events, daemon=True).start()
+        return True
+
+    def _read_events(self):
+        """Lê as linhas JSON emitidas pelo agente até o canal ser fechado"""
+        try:
+            stream = self.channel.makefile("r")
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                self._handle_event(event)
+        except Exception as e:
+            log_warning(f"Canal do agente de monitoramento encerrado: {str(e)}")
+        finally:
+            self.exited.set()
+
+    def _handle_event(self, event):
+        """Atualiza o instantâneo de métricas e repassa o evento aos ouvintes"""
+        event_type = event.get("type")
+        with self._lock:
+            if event_type == "hello":
+                self._snapshot["ncpu"] = event.get("ncpu")
+            elif event_type == "metrics":
+                self._snapshot["processes"] = event.get("processes", [])
+                self._snapshot["mem_available_kb"] = event.get("mem_available_kb", 0)
+                self._snapshot["time"] = time.time()
+            elif event_type == "stage":
+                self._snapshot["stage"] = event.get("stage")
+            elif event_type == "exit":
+                self.process_exited.set()
+
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                log_warning(f"Erro ao processar evento do agente: {str(e)}")
+
+    def is_running(self):
+        """Retorna True se o canal do agente continua ativo"""
+        return self.channel is not None and not self.exited.is_set()
+
+    def snapshot(self):
+        """
+        Retorna as métricas mais recentes no mesmo formato de JobManager.get_user_processes
+
+        Returns:
+            dict: Informações dos processos ou None se ainda não houver amostra
+        """
+        with self._lock:
+            if not self._snapshot["time"]:
+                return None
+            processes = list(self._snapshot["processes"])
+            stage = self._snapshot["stage"]
+
+        for process in processes:
+            process["is_spades"] = True
+        spades_cpu = sum(p["cpu"] for p in processes)
+        spades_mem = sum(p["mem"] for p in processes)
+        spades_rss = sum(p["rss"] for p in processes)
+        return {
+            'all_processes': processes,
+            'spades_processes': processes,
+            'total_cpu': round(spades_cpu, 1),
+            'total_mem': round(spades_mem, 1),
+            'total_mem_mb': round(spades_rss / 1024, 1),
+            'spades_cpu': round(spades_cpu, 1),
+            'spades_mem': round(spades_mem, 1),
+            'spades_mem_mb': round(spades_rss / 1024, 1),
+            'stage': stage
+        }
+
+    def stop(self):
+        """Encerra o agente fechando o canal"""
+        if self.channel is not None:
+            try:
+                self.channel.close()
+            except Exception:
+                pass
+        self.exited.set()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import shlex
+from services.ssh_pool import tracked
+
+# Marcadores que delimitam o resultado de cada etapa na saída do script
+BEGIN_MARKER = "__SM_BEGIN__"
+END_MARKER = "__SM_END__"
+
+def quote_remote_path(path):
+    """
+    Escapa um caminho remoto para uso em shell, preservando a expansão de '~'
+
+    Args:
+        path: Caminho remoto (pode começar com '~/')
+
+    Returns:
+        str: Caminho pronto para ser inserido em um comando shell
+    """
+    if path == "~":
+        return '"$HOME"'
+    if path.startswith("~/"):
+        return '"$HOME"/' + shlex.quote(path[2:])
+    return shlex.quote(path)
+
+class RemoteBatch:
+    """Agrupa várias verificações remotas em um único script shell, executado em uma única ida e volta"""
+    def __init__(self):
+        self._steps = []
+
+    def add(self, key, snippet):
+        """
+        Adiciona uma etapa ao lote
+
+        Args:
+            key: Nome do resultado (deve ser único no lote)
+            snippet: Trecho shell cuja saída padrão será o valor do resultado
+
+        Returns:
+            RemoteBatch: A própria instância, para encadeamento
+        """
+        self._steps.append((key, snippet))
+        return self
+
+    def file_exists(self, key, path):
+        """Verifica se um arquivo regular existe (resultado '1' ou '0')"""
+        quoted = quote_remote_path(path)
+        return self.add(key, f"[ -f {quoted} ] && echo 1 || echo 0")
+
+    def dir_exists(self, key, path):
+        """Verifica se um diretório existe (resultado '1' ou '0')"""
+        quoted = quote_remote_path(path)
+        return self.add(key, f"[ -d {quoted} ] && echo 1 || echo 0")
+
+    def build_script(self):
+        """Monta o script shell com todas as etapas do lote"""
+        lines = []
+        for key, snippet in self._steps:
+            lines.append(f"echo '{BEGIN_MARKER} {key}'")
+            lines.append(f"{{\n{snippet}\n}} 2>/dev/null")
+            lines.append(f"echo; echo '{END_MARKER} {key}'")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def parse_output(output):
+        """
+        Interpreta a saída do script em um dicionário chave -> valor
+
+        Args:
+            output: Texto retornado pelo script
+
+        Returns:
+            dict: Resultados de cada etapa (texto sem espaços nas extremidades)
+        """
+        results = {}
+        current_key = None
+        buffer = []
+        for line in output.splitlines():
+            if line.startswith(BEGIN_MARKER + " "):
+                current_key = line[len(BEGIN_MARKER) + 1:].strip()
+                buffer = []
+            elif line.startswith(END_MARKER + " ") and current_key is not None:
+                results[current_key] = "\n".join(buffer).strip()
+                current_key = None
+            elif current_key is not None:
+                buffer.append(line)
+        return results
+
+    def run(self, ssh, timeout=None):
+        """
+        Executa o lote no servidor remoto
+
+        O script é enviado pela entrada padrão de um único 'sh -s', evitando
+        problemas de escape e uma ida e volta por verificação.
+
+        Args:
+            ssh: Cliente paramiko.SSHClient conectado
+            timeout: Tempo limite em segundos (opcional)
+
+        Returns:
+            dict: Resultados de cada etapa
+        """
+        stdin, stdout, stderr = ssh.exec_command("sh -s", timeout=timeout)
+        stdin.write(self.build_script())
+        stdin.flush()
+        stdin.channel.shutdown_write()
+        with tracked(stdout.channel):
+            output = stdout.read().decode(errors="replace")
+        return self.parse_output(output)
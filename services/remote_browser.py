@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import stat
+import time
+import threading
+from services.transfer_engine import ParallelUploader
+from utils.logging_utils import log_warning
+
+# Prefixo que identifica, nos campos de leitura, um arquivo que já está no servidor
+REMOTE_READ_PREFIX = "servidor:"
+
+# Entradas carregadas por página na listagem remota
+BROWSER_PAGE_SIZE = 200
+
+# Tempo (segundos) em que uma listagem em cache é considerada válida
+BROWSER_CACHE_SECONDS = 120
+
+def is_remote_read(path):
+    """Retorna True se o caminho indicar uma leitura que já está no servidor"""
+    return bool(path) and path.startswith(REMOTE_READ_PREFIX)
+
+def remote_read_path(path):
+    """Caminho absoluto no servidor de uma leitura remota (sem o prefixo)"""
+    return path[len(REMOTE_READ_PREFIX):] if is_remote_read(path) else path
+
+def make_remote_read(remote_path):
+    """Monta o valor do campo de leitura para um arquivo do servidor"""
+    return f"{REMOTE_READ_PREFIX}{remote_path}"
+
+class RemoteEntry:
+    """Entrada de uma listagem remota"""
+    def __init__(self, directory, attr):
+        self.name = attr.filename
+        self.path = f"{directory.rstrip('/')}/{attr.filename}"
+        self.is_dir = stat.S_ISDIR(attr.st_mode or 0)
+        self.is_link = stat.S_ISLNK(attr.st_mode or 0)
+        self.size = attr.st_size or 0
+        self.mtime = attr.st_mtime or 0
+
+class RemoteBrowser:
+    """Navegação paginada no sistema de arquivos remoto via SFTP, com cache dos diretórios já listados
+
+    A listagem usa listdir_iter (requisições de leitura antecipada), consumida
+    página a página: diretórios com milhares de arquivos de sequenciamento
+    exibem as primeiras entradas sem aguardar a listagem completa.
+    """
+    def __init__(self, link, page_size=BROWSER_PAGE_SIZE, cache_seconds=BROWSER_CACHE_SECONDS):
+        """
+        Inicializa o navegador
+
+        Args:
+            link: ReconnectingSession da sessão principal
+            page_size: Entradas por página
+            cache_seconds: Validade das listagens em cache
+        """
+        self.link = link
+        self.page_size = page_size
+        self.cache_seconds = cache_seconds
+        self._lock = threading.Lock()
+        self._client = None
+        self._sftp = None
+        self._listings = {}  # diretório -> {"time", "entries", "iterator"}
+
+    def _get_sftp(self, client):
+        """Canal SFTP reutilizado entre páginas (reaberto se a sessão mudou)"""
+        if self._client is not client or self._sftp is None:
+            self.close()
+            self._client = client
+            self._sftp = ParallelUploader.open_sftp(client)
+            # Listagens em andamento pertenciam ao canal anterior
+            for listing in self._listings.values():
+                if listing["iterator"] is not None:
+                    listing["entries"], listing["iterator"] = [], None
+                    listing["time"] = 0
+        return self._sftp
+
+    def normalize(self, path):
+        """
+        Resolve um caminho remoto para absoluto ('~', '.' e relativos ao diretório do usuário)
+
+        Returns:
+            str: Caminho absoluto
+        """
+        path = path.strip() or "."
+        if path == "~" or path.startswith("~/"):
+            path = "." + path[1:]
+        with self._lock:
+            return self.link.with_retry(lambda client: self._get_sftp(client).normalize(path), "resolução de caminho remoto")
+
+    def list_page(self, directory, page=0, refresh=False):
+        """
+        Retorna uma página da listagem de um diretório remoto
+
+        Args:
+            directory: Caminho absoluto do diretório
+            page: Índice da página (0 = primeira)
+            refresh: Se True, descarta o cache do diretório
+
+        Returns:
+            tuple: (lista de RemoteEntry, True se houver mais entradas)
+        """
+        needed = (page + 1) * self.page_size
+        with self._lock:
+            def _fetch(client):
+                sftp = self._get_sftp(client)
+                listing = self._listings.get(directory)
+                expired = listing is None or time.time() - listing["time"] > self.cache_seconds
+                if refresh or (expired and listing is not None and listing["iterator"] is None):
+                    listing = None
+                if listing is None:
+                    listing = {"time": time.time(), "entries": [], "iterator": sftp.listdir_iter(directory)}
+                    self._listings[directory] = listing
+                while listing["iterator"] is not None and len(listing["entries"]) < needed:
+                    try:
+                        attr = next(listing["iterator"])
+                    except StopIteration:
+                        listing["iterator"] = None
+                        break
+                    if not attr.filename.startswith("."):
+                        listing["entries"].append(RemoteEntry(directory, attr))
+                return listing
+
+            try:
+                listing = self.link.with_retry(_fetch, f"listagem de {directory}")
+            except Exception:
+                self._listings.pop(directory, None)
+                raise
+
+        entries = listing["entries"][page * self.page_size:needed]
+        has_more = listing["iterator"] is not None or len(listing["entries"]) > needed
+        return entries, has_more
+
+    def is_directory(self, path):
+        """Retorna True se o caminho remoto (seguindo links) for um diretório"""
+        with self._lock:
+            try:
+                attr = self.link.with_retry(lambda client: self._get_sftp(client).stat(path), f"consulta de {path}")
+            except IOError:
+                return False
+        return stat.S_ISDIR(attr.st_mode or 0)
+
+    def invalidate(self, directory=None):
+        """Descarta a listagem em cache de um diretório (ou de todos)"""
+        with self._lock:
+            if directory is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(directory, None)
+
+    def close(self):
+        """Fecha o canal SFTP do navegador"""
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception as e:
+                log_warning(f"Erro ao fechar canal SFTP do navegador remoto: {str(e)}")
+        self._sftp = None
+        self._client = None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from services.remote_agent import REMOTE_AGENT_DIR
+from services.remote_batch import RemoteBatch, quote_remote_path
+from utils.logging_utils import log_info
+
+# Índice remoto de arquivos já enviados: "sha256<TAB>tamanho<TAB>caminho absoluto" por linha,
+# com uma quarta coluna opcional (SHA-256 da leitura original) nos arquivos comprimidos no envio
+REMOTE_HASH_INDEX = f"~/{REMOTE_AGENT_DIR}/hashes.tsv"
+
+# Sufixo do arquivo lateral com o SHA-256 calculado no servidor
+HASH_SIDECAR_SUFFIX = ".sha256"
+
+# Funções shell compartilhadas pelas etapas do lote (o lote roda em um único shell)
+SHELL_FUNCTIONS = r'''
+sm_sha256() { { sha256sum "$1" 2>/dev/null || shasum -a 256 "$1"; } | cut -d' ' -f1; }
+sm_size() { wc -c < "$1" | tr -d ' '; }
+sm_cached_hash() {
+  if [ -f "$1.sha256" ] && [ ! "$1" -nt "$1.sha256" ]; then cat "$1.sha256"
+  else h=$(sm_sha256 "$1") && [ -n "$h" ] && { echo "$h" > "$1.sha256" 2>/dev/null; echo "$h"; }; fi
+}
+sm_matches() { [ -f "$1" ] && [ "$(sm_size "$1")" = "$3" ] && [ "$(sm_cached_hash "$1")" = "$2" ]; }
+'''
+
+class RemoteDeduplicator:
+    """Evita reenviar leituras que já estão no servidor, comparando o SHA-256 local com o remoto"""
+    def __init__(self, link):
+        """
+        Inicializa o deduplicador
+
+        Args:
+            link: ReconnectingSession da sessão principal
+        """
+        self.link = link
+
+    def place(self, entries):
+        """
+        Procura no servidor arquivos com o mesmo conteúdo e os coloca no destino
+
+        Para cada destino: se já existe com o mesmo hash, nada é feito; se o
+        índice remoto conhece uma cópia válida em outro diretório, ela é ligada
+        ao destino (hardlink, ou link simbólico entre sistemas de arquivos).
+
+        Args:
+            entries: Lista de tuplas (caminho_remoto, sha256, tamanho)
+
+        Returns:
+            dict: Caminho remoto -> "present", "hardlink", "symlink" ou "missing"
+        """
+        if not entries:
+            return {}
+
+        index = quote_remote_path(REMOTE_HASH_INDEX)
+        batch = RemoteBatch()
+        batch.add("setup", SHELL_FUNCTIONS)
+        for position, (remote_path, digest, size) in enumerate(entries):
+            dest = quote_remote_path(remote_path)
+            batch.add(
+                f"place_{position}",
+                f'if sm_matches {dest} {digest} {int(size)}; then echo present; else\n'
+                f'  result=missing; old_ifs=$IFS; IFS="$(printf \'\\n_\')"; IFS="${{IFS%_}}"\n'
+                f'  for src in $(awk -F"\\t" -v h={digest} -v s={int(size)} \'$1==h && $2==s {{print $3}}\' {index} 2>/dev/null); do\n'
+                f'    sm_matches "$src" {digest} {int(size)} || continue\n'
+                f'    rm -f {dest}\n'
+                f'    if ln "$src" {dest} 2>/dev/null; then result=hardlink; else ln -s "$src" {dest} && result=symlink; fi\n'
+                f'    [ "$result" != missing ] && break\n'
+                f'  done; IFS=$old_ifs\n'
+                f'  echo $result\n'
+                f'fi'
+            )
+        results = self.link.run_batch(batch, timeout=None)
+
+        placed = {}
+        for position, (remote_path, _, _) in enumerate(entries):
+            placed[remote_path] = results.get(f"place_{position}") or "missing"
+            if placed[remote_path] != "missing":
+                log_info(f"{remote_path}: já disponível no servidor ({placed[remote_path]})")
+        return placed
+
+    def place_compressed(self, entries):
+        """
+        Procura no servidor leituras já enviadas com compressão a partir do mesmo arquivo original
+
+        O índice remoto associa cada .gz comprimido no envio ao SHA-256 da
+        leitura original; a cópia encontrada é conferida pelo hash do próprio
+        .gz antes de ser reaproveitada, evitando comprimir e enviar de novo.
+
+        Args:
+            entries: Lista de tuplas (caminho_remoto_gz, sha256_original)
+
+        Returns:
+            dict: Caminho remoto -> "present", "hardlink", "symlink" ou "missing"
+        """
+        if not entries:
+            return {}
+
+        index = quote_remote_path(REMOTE_HASH_INDEX)
+        batch = RemoteBatch()
+        batch.add("setup", SHELL_FUNCTIONS)
+        for position, (remote_path, source_digest) in enumerate(entries):
+            dest = quote_remote_path(remote_path)
+            batch.add(
+                f"place_{position}",
+                f'abs="$(cd "$(dirname {dest})" 2>/dev/null && pwd)/$(basename {dest})"\n'
+                f'awk -F"\\t" -v h={source_digest} \'$4==h {{print $1, $2, $3}}\' {index} 2>/dev/null | {{\n'
+                f'  result=missing\n'
+                f'  while read -r digest size src; do\n'
+                f'    sm_matches "$src" "$digest" "$size" || continue\n'
+                f'    if [ "$src" = "$abs" ]; then result=present; break; fi\n'
+                f'    rm -f {dest}\n'
+                f'    if ln "$src" {dest} 2>/dev/null; then result=hardlink; else ln -s "$src" {dest} && result=symlink; fi\n'
+                f'    [ "$result" != missing ] && break\n'
+                f'  done; echo $result\n'
+                f'}}'
+            )
+        results = self.link.run_batch(batch, timeout=None)
+
+        placed = {}
+        for position, (remote_path, _) in enumerate(entries):
+            placed[remote_path] = results.get(f"place_{position}") or "missing"
+            if placed[remote_path] != "missing":
+                log_info(f"{remote_path}: já disponível no servidor ({placed[remote_path]})")
+        return placed
+
+    def record(self, entries):
+        """
+        Registra arquivos enviados no índice remoto e grava o hash no arquivo lateral
+
+        Args:
+            entries: Lista de tuplas (caminho_remoto, sha256, tamanho) já verificadas, com o
+                SHA-256 da leitura original como quarto item nos arquivos comprimidos no envio
+        """
+        if not entries:
+            return
+
+        index = quote_remote_path(REMOTE_HASH_INDEX)
+        batch = RemoteBatch()
+        batch.add("setup", f'mkdir -p "$HOME"/{REMOTE_AGENT_DIR}; touch {index}')
+        for position, (remote_path, digest, size, *source) in enumerate(entries):
+            dest = quote_remote_path(remote_path)
+            source_column = f"\\t{source[0]}" if source and source[0] else ""
+            batch.add(
+                f"record_{position}",
+                f'[ -f {dest} ] && echo {digest} > {dest}{HASH_SIDECAR_SUFFIX} && '
+                f'abs="$(cd "$(dirname {dest})" && pwd)/$(basename {dest})" && '
+                f'awk -F"\\t" -v p="$abs" \'$3!=p\' {index} > {index}.tmp && mv -f {index}.tmp {index} && '
+                f'printf "%s\\t%s\\t%s{source_column}\\n" {digest} {int(size)} "$abs" >> {index} && echo OK'
+            )
+        self.link.run_batch(batch, timeout=60)
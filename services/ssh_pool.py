@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+from contextlib import contextmanager
+import paramiko
+from utils.logging_utils import log_info, log_warning
+
+# Escopo da operação em andamento na thread atual (ver operation_scope)
+_current = threading.local()
+
+class OperationAborted(Exception):
+    """Operação interrompida por OperationScope.abort (tempo esgotado ou cancelamento): não é repetida"""
+
+class OperationScope:
+    """Canais, clientes SFTP e sessões dedicadas abertos por uma operação
+
+    Quando a operação esgota o tempo ou é cancelada, abort fecha apenas esses
+    recursos: a operação termina de fato sem derrubar a sessão principal nem as
+    transferências e consultas de outras operações.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resources = []
+        self.aborted = False
+
+    def register(self, resource):
+        """
+        Associa um recurso (qualquer objeto com close()) à operação
+
+        Raises:
+            OperationAborted: Se a operação já foi interrompida (o recurso é fechado)
+        """
+        with self._lock:
+            if not self.aborted:
+                self._resources.append(resource)
+                return resource
+        SSHSessionPool._safe_close(resource)
+        raise OperationAborted("operação interrompida")
+
+    def discard(self, resource):
+        """Remove um recurso já fechado ou devolvido ao pool"""
+        with self._lock:
+            if resource in self._resources:
+                self._resources.remove(resource)
+
+    def abort(self):
+        """Interrompe a operação fechando os recursos abertos por ela"""
+        with self._lock:
+            self.aborted = True
+            resources, self._resources = self._resources, []
+        for resource in resources:
+            SSHSessionPool._safe_close(resource)
+        if resources:
+            log_warning(f"{len(resources)} canal(is) SSH encerrado(s) para interromper a operação")
+
+    def run(self, func, *args):
+        """Executa func na thread atual dentro deste escopo"""
+        with operation_scope(self):
+            return func(*args)
+
+def current_scope():
+    """Retorna o escopo da operação em andamento na thread atual (ou None)"""
+    return getattr(_current, "scope", None)
+
+@contextmanager
+def operation_scope(scope):
+    """Define o escopo da operação da thread atual (threads auxiliares recebem o escopo explicitamente)"""
+    previous = current_scope()
+    _current.scope = scope
+    try:
+        yield scope
+    finally:
+        _current.scope = previous
+
+@contextmanager
+def tracked(resource, scope=None):
+    """Registra um canal (ou cliente SFTP) no escopo da operação enquanto estiver em uso"""
+    scope = scope if scope is not None else current_scope()
+    if scope is None:
+        yield resource
+        return
+    scope.register(resource)
+    try:
+        yield resource
+    finally:
+        scope.discard(resource)
+
+class SSHSessionPool:
+    """Pool de sessões SSH autenticadas e reutilizáveis, indexadas pelo perfil de conexão"""
+    def __init__(self, max_sessions=4, keepalive_interval=30):
+        """
+        Inicializa o pool
+
+        Args:
+            max_sessions: Número máximo de sessões simultâneas por servidor
+            keepalive_interval: Intervalo (segundos) entre pacotes keepalive
+        """
+        self.max_sessions = max_sessions
+        self.keepalive_interval = keepalive_interval
+        self._lock = threading.Lock()
+        # chave -> {"connect_kwargs": dict, "primary": SSHClient, "idle": [SSHClient], "in_use": set(),
+        #           "opening": int (sessões dedicadas em abertura), "primary_opening": Event ou None}
+        self._entries = {}
+
+    @staticmethod
+    def make_key(host, port, username):
+        """Gera a chave do pool a partir dos dados do perfil"""
+        return (host, int(port), username)
+
+    @staticmethod
+    def is_alive(client):
+        """Verifica se o transporte de um cliente SSH ainda está ativo"""
+        try:
+            transport = client.get_transport() if client else None
+            return transport is not None and transport.is_active()
+        except Exception:
+            return False
+
+    def _open(self, connect_kwargs):
+        """Abre uma nova sessão SSH autenticada"""
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(**connect_kwargs)
+
+        transport = client.get_transport()
+        if transport is not None and self.keepalive_interval:
+            transport.set_keepalive(self.keepalive_interval)
+
+        log_info(f"Nova sessão SSH aberta para {connect_kwargs.get('username')}@{connect_kwargs.get('hostname')}")
+        return client
+
+    def has_session(self, key):
+        """Retorna True se existe uma sessão principal ativa para a chave"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return bool(entry and self.is_alive(entry["primary"]))
+
+    def get_primary(self, key, connect_kwargs=None):
+        """
+        Obtém a sessão principal de um servidor, reutilizando-a se ainda estiver ativa
+
+        Args:
+            key: Chave do perfil (ver make_key)
+            connect_kwargs: Parâmetros para paramiko.SSHClient.connect
+
+        Returns:
+            tuple: (SSHClient, reused) onde reused indica se a sessão já estava aberta
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    if connect_kwargs is None:
+                        raise paramiko.SSHException("Nenhuma credencial registrada para este servidor")
+                    entry = {"connect_kwargs": dict(connect_kwargs), "primary": None, "idle": [], "in_use": set(),
+                             "opening": 0, "primary_opening": None}
+                    self._entries[key] = entry
+                elif connect_kwargs is not None and connect_kwargs != entry["connect_kwargs"]:
+                    # Credenciais mudaram: descartar sessões antigas
+                    self._close_entry(entry)
+                    entry["connect_kwargs"] = dict(connect_kwargs)
+
+                if self.is_alive(entry["primary"]):
+                    return entry["primary"], True
+
+                # Outra thread já está abrindo a sessão principal: aguardar fora do lock
+                opening = entry["primary_opening"]
+                if opening is None:
+                    if entry["primary"] is not None:
+                        log_warning("Sessão SSH principal inativa. Abrindo nova sessão...")
+                        self._safe_close(entry["primary"])
+                        entry["primary"] = None
+                    opening = entry["primary_opening"] = threading.Event()
+                    kwargs = entry["connect_kwargs"]
+                    break
+
+            opening.wait()
+
+        # O handshake TCP+SSH acontece fora do lock para não bloquear as demais operações do pool
+        try:
+            client = self._open(kwargs)
+        finally:
+            with self._lock:
+                entry["primary_opening"] = None
+            opening.set()
+
+        with self._lock:
+            if self._is_current(key, entry, kwargs):
+                entry["primary"] = client
+                return client, False
+        self._safe_close(client)
+        raise paramiko.SSHException("Sessão descartada durante a conexão")
+
+    def acquire(self, key):
+        """
+        Obtém uma sessão dedicada para uma operação concorrente (ex: transferências)
+
+        Reutiliza sessões ociosas quando possível. Se o limite de sessões for atingido,
+        retorna a sessão principal, que multiplexa canais.
+
+        Returns:
+            SSHClient: Sessão autenticada
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise paramiko.SSHException("Servidor não registrado no pool de sessões")
+
+            while entry["idle"]:
+                client = entry["idle"].pop()
+                if self.is_alive(client):
+                    entry["in_use"].add(client)
+                    return client
+                self._safe_close(client)
+
+            # A sessão principal e as sessões em abertura contam para o limite
+            reserved = len(entry["in_use"]) + entry["opening"] + 1 < self.max_sessions
+            if reserved:
+                entry["opening"] += 1
+                kwargs = entry["connect_kwargs"]
+            elif self.is_alive(entry["primary"]):
+                return entry["primary"]
+
+        if not reserved:
+            return self.get_primary(key)[0]
+
+        # Vaga reservada: abrir a sessão fora do lock e registrá-la depois
+        try:
+            client = self._open(kwargs)
+        except Exception:
+            with self._lock:
+                entry["opening"] -= 1
+            raise
+
+        with self._lock:
+            entry["opening"] -= 1
+            if self._is_current(key, entry, kwargs):
+                entry["in_use"].add(client)
+                return client
+        self._safe_close(client)
+        raise paramiko.SSHException("Sessão descartada durante a conexão")
+
+    def release(self, key, client):
+        """Devolve ao pool uma sessão obtida com acquire"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or client is None or client is entry["primary"]:
+                return
+            entry["in_use"].discard(client)
+            if self.is_alive(client):
+                entry["idle"].append(client)
+            else:
+                self._safe_close(client)
+
+    def invalidate(self, key, client):
+        """Descarta uma sessão com transporte morto"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or client is None:
+                return
+            if client is entry["primary"]:
+                entry["primary"] = None
+            entry["in_use"].discard(client)
+            if client in entry["idle"]:
+                entry["idle"].remove(client)
+            self._safe_close(client)
+
+    def _is_current(self, key, entry, kwargs):
+        """Verifica (com o lock adquirido) se a entrada não foi fechada nem teve as credenciais trocadas"""
+        return self._entries.get(key) is entry and entry["connect_kwargs"] is kwargs
+
+    def is_primary(self, key, client):
+        """Retorna True se o cliente é a sessão principal do servidor (compartilhada, nunca fechada por uma operação)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return bool(entry and client is entry["primary"])
+
+    @contextmanager
+    def session(self, key):
+        """Gerenciador de contexto para usar uma sessão dedicada e devolvê-la ao pool"""
+        client = self.acquire(key)
+        try:
+            yield client
+        finally:
+            self.release(key, client)
+
+    def close(self, key=None):
+        """
+        Fecha as sessões de um servidor, ou de todos se key for None
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries.keys())
+            for k in keys:
+                entry = self._entries.pop(k, None)
+                if entry:
+                    self._close_entry(entry)
+
+    def _close_entry(self, entry):
+        """Fecha todas as sessões de uma entrada do pool"""
+        for client in [entry["primary"]] + entry["idle"] + list(entry["in_use"]):
+            self._safe_close(client)
+        entry["primary"] = None
+        entry["idle"] = []
+        entry["in_use"] = set()
+
+    @staticmethod
+    def _safe_close(client):
+        """Fecha um cliente SSH ignorando erros"""
+        if client is None:
+            return
+        try:
+            client.close()
+        except Exception:
+            pass
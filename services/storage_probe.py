@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import shlex
+from services.remote_batch import RemoteBatch, quote_remote_path
+from utils.progress import format_bytes
+
+# Diretórios candidatos a área temporária do SPAdes (--tmp-dir), como expressões shell
+# (SSD local, memória compartilhada, área de scratch do cluster, /tmp e a home, que costuma ser NFS)
+SCRATCH_CANDIDATES = [
+    '"$TMPDIR"',
+    "/dev/shm",
+    '/scratch/"$USER"',
+    '/local/scratch/"$USER"',
+    "/scratch",
+    "/local",
+    "/tmp",
+    '"$HOME"',
+]
+
+# Volume gravado no teste de escrita sequencial (MB, com fdatasync)
+PROBE_SIZE_MB = 128
+
+# Espaço temporário estimado por byte de leituras descomprimidas (correção de erros e contagem de k-mers)
+SCRATCH_SPACE_FACTOR = 2.0
+
+# Espaço mínimo exigido quando o volume das leituras é desconhecido (bytes)
+MIN_SCRATCH_BYTES = 20 * 1024 ** 3
+
+# Sistemas de arquivos em memória: no máximo metade do espaço livre, descontada a memória
+# reservada pelo próprio job (-m), já que os arquivos temporários disputam a mesma RAM
+MEMORY_FILESYSTEMS = ("tmpfs", "ramfs")
+MEMORY_FS_MAX_FRACTION = 0.5
+
+# Só vale trocar de diretório se o candidato for bem mais rápido que o diretório de saída
+MIN_SPEEDUP = 1.5
+
+def _probe_snippet(expression):
+    """Trecho shell que mede um diretório: tipo de sistema de arquivos, dispositivo, KB livres, ns da escrita e caminho real"""
+    return (
+        f'd={expression}; '
+        f'if [ -n "$d" ] && [ -d "$d" ] && [ -w "$d" ]; then '
+        f'd=$(cd "$d" && pwd -P); fs=$(stat -f -c %T "$d"); dev=$(stat -c %d "$d"); free=$(df -Pk "$d" | awk \'NR == 2 {{print $4}}\'); '
+        f'f="$d/.spades_master_probe_$$"; t0=$(date +%s%N); '
+        f'if dd if=/dev/zero of="$f" bs=1M count={PROBE_SIZE_MB} conv=fdatasync 2>/dev/null; then '
+        f't1=$(date +%s%N); echo "$fs $dev $free $((t1 - t0)) $d"; fi; rm -f "$f"; fi'
+    )
+
+def probe_scratch(link, remote_dir):
+    """
+    Mede espaço livre e velocidade de escrita sequencial dos diretórios candidatos, em uma única ida e volta
+
+    Args:
+        link: ReconnectingSession da sessão principal
+        remote_dir: Diretório remoto do job (referência: onde o SPAdes gravaria sem --tmp-dir)
+
+    Returns:
+        list: dicts com path, fs_type, device, free_bytes, speed (bytes/s) e is_output (o diretório do job)
+    """
+    batch = RemoteBatch()
+    expressions = [quote_remote_path(remote_dir)] + SCRATCH_CANDIDATES
+    for index, expression in enumerate(expressions):
+        batch.add(f"dir{index}", _probe_snippet(expression))
+    results = link.run_batch(batch, timeout=60 + 15 * len(expressions))
+
+    probes, seen = [], set()
+    for index in range(len(expressions)):
+        fields = results.get(f"dir{index}", "").split(" ", 4)
+        if len(fields) != 5 or not all(value.isdigit() for value in fields[1:4]):
+            continue
+        fs_type, device, free_kb, nanoseconds, path = fields
+        if path in seen:
+            continue
+        seen.add(path)
+        probes.append({
+            "path": path,
+            "fs_type": fs_type,
+            "device": device,
+            "free_bytes": int(free_kb) * 1024,
+            "speed": PROBE_SIZE_MB * 1024 ** 2 / max(int(nanoseconds) / 1e9, 1e-3),
+            "is_output": index == 0,
+        })
+    return probes
+
+def required_space(volume):
+    """Espaço temporário necessário para um job, pelo volume de leituras (ver autotune.input_volume)"""
+    if not volume:
+        return MIN_SCRATCH_BYTES
+    return int(volume[1] * SCRATCH_SPACE_FACTOR)
+
+def choose_scratch(probes, needed_bytes, memory_gb=None):
+    """
+    Escolhe o diretório temporário mais rápido com espaço suficiente
+
+    Args:
+        probes: Resultado de probe_scratch
+        needed_bytes: Espaço temporário necessário
+        memory_gb: Memória reservada pelo job (-m); sem ela, sistemas de arquivos em memória são descartados
+
+    Returns:
+        tuple: (probe escolhido ou None para manter o padrão do SPAdes, lista de explicações)
+    """
+    reasons = []
+    usable = []
+    output = next((probe for probe in probes if probe["is_output"]), None)
+    for probe in probes:
+        free = probe["free_bytes"]
+        description = (f"{probe['path']} ({probe['fs_type']}): {format_bytes(probe['speed'])}/s, "
+                       f"{format_bytes(probe['free_bytes'])} livres")
+        if probe["fs_type"] in MEMORY_FILESYSTEMS:
+            if not memory_gb:
+                reasons.append(f"{description} - em memória, e a memória do job (-m) não foi informada")
+                continue
+            free = min(int(free * MEMORY_FS_MAX_FRACTION), free - int(memory_gb) * 1024 ** 3)
+        if free < needed_bytes:
+            reasons.append(f"{description} - espaço insuficiente")
+            continue
+        if output and not probe["is_output"] and probe["device"] == output["device"]:
+            # Mesmo dispositivo do diretório do job: a diferença medida é só variação do cache
+            reasons.append(f"{description} - mesmo dispositivo do diretório do job")
+            continue
+        reasons.append(description)
+        usable.append(probe)
+    if not usable:
+        return None, reasons
+
+    best = max(usable, key=lambda probe: probe["speed"])
+    if best["is_output"] or (output and best["speed"] < output["speed"] * MIN_SPEEDUP):
+        reasons.append("o diretório do job já é o mais rápido: mantido o padrão do SPAdes")
+        return None, reasons
+    return best, reasons
+
+def scratch_tmp_dir(base, name):
+    """
+    Caminho (já escapado para shell) do diretório temporário de um job
+
+    Args:
+        base: Diretório escolhido ou None para o $TMPDIR do nó de cálculo (backends de escalonador)
+        name: Nome único do job
+
+    Returns:
+        str: Expressão shell do diretório
+    """
+    if base is None:
+        return f'"${{TMPDIR:-/tmp}}"/{shlex.quote(f"spades_tmp_{name}")}'
+    return shlex.quote(f"{base.rstrip('/')}/spades_tmp_{name}")
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import queue
+import hashlib
+import threading
+import paramiko
+from services.remote_batch import quote_remote_path
+from services.reconnect import ReconnectingSession, TRANSFER_CHUNK_SIZE
+from services.ssh_pool import current_scope
+from utils.logging_utils import log_info, log_warning, log_error
+
+# Tamanho de cada faixa do arquivo distribuída entre os fluxos
+DEFAULT_RANGE_SIZE = 64 * 1024 * 1024
+
+# Sufixos do arquivo parcial e do diário de faixas confirmadas
+PART_SUFFIX = ".part"
+JOURNAL_SUFFIX = ".part.done"
+
+# Janela SSH por canal SFTP: maior que o produto banda x atraso (1 Gbit/s x 80 ms ~ 10 MB)
+SFTP_WINDOW_SIZE = 16 * 1024 * 1024
+
+def local_sha256(path, limit=None, block_size=4 * 1024 * 1024):
+    """
+    Calcula o SHA-256 de um arquivo local (ou dos primeiros 'limit' bytes)
+
+    Returns:
+        str: Hash em hexadecimal
+    """
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            data = f.read(block_size if remaining is None else min(block_size, remaining))
+            if not data:
+                break
+            digest.update(data)
+            if remaining is not None:
+                remaining -= len(data)
+    return digest.hexdigest()
+
+def remote_sha256_command(remote_path, limit=None):
+    """Monta o comando remoto que calcula o SHA-256 de um arquivo (ou de um prefixo)"""
+    quoted = quote_remote_path(remote_path)
+    source = f"head -c {int(limit)} {quoted}" if limit is not None else f"cat {quoted}"
+    return f"{source} | {{ sha256sum 2>/dev/null || shasum -a 256; }} | cut -d' ' -f1"
+
+def contiguous_watermark(ranges):
+    """
+    Calcula o maior prefixo coberto por uma lista de faixas (posição, tamanho)
+
+    Returns:
+        int: Tamanho do prefixo contíguo
+    """
+    watermark = 0
+    for offset, length in sorted(ranges):
+        if offset > watermark:
+            break
+        watermark = max(watermark, offset + length)
+    return watermark
+
+class ParallelUploader:
+    """Envio de arquivos em faixas, escritas em paralelo por vários canais SFTP com requisições em pipeline"""
+    def __init__(self, pool, key, streams=None, range_size=DEFAULT_RANGE_SIZE, progress_callback=None):
+        """
+        Inicializa o mecanismo de envio
+
+        Args:
+            pool: SSHSessionPool com as credenciais do servidor
+            key: Chave do servidor no pool
+            streams: Número de fluxos simultâneos (padrão: sessões livres do pool)
+            range_size: Tamanho (bytes) de cada faixa enviada por um fluxo
+            progress_callback: Função opcional (enviados, total) com o progresso somado de todos os arquivos
+        """
+        self.pool = pool
+        self.key = key
+        self.streams = streams or max(1, pool.max_sessions - 1)
+        self.range_size = range_size
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._sent = 0
+        self._total = 0
+
+    @staticmethod
+    def open_sftp(client):
+        """Abre um canal SFTP com janela ampliada para enlaces de alta latência"""
+        return paramiko.SFTPClient.from_transport(client.get_transport(), window_size=SFTP_WINDOW_SIZE)
+
+    def _add_progress(self, count):
+        with self._lock:
+            self._sent += count
+            sent, total = self._sent, self._total
+        if self.progress_callback:
+            self.progress_callback(sent, total)
+
+    def _build_ranges(self, files, starts):
+        """Divide os arquivos em faixas intercaladas, para que todos avancem ao mesmo tempo"""
+        per_file = []
+        for local_path, remote_path in files:
+            size = os.path.getsize(local_path)
+            ranges = [(local_path, remote_path, offset, min(self.range_size, size - offset))
+                      for offset in range(starts.get(remote_path, 0), size, self.range_size)]
+            per_file.append(ranges)
+
+        interleaved = []
+        for index in range(max((len(r) for r in per_file), default=0)):
+            for ranges in per_file:
+                if index < len(ranges):
+                    interleaved.append(ranges[index])
+        return interleaved
+
+    def _read_journal(self, sftp, journal_path):
+        """Lê as faixas já confirmadas de um envio anterior"""
+        ranges = []
+        try:
+            with sftp.open(journal_path, "r") as journal:
+                for line in journal.read().decode(errors="replace").splitlines():
+                    parts = line.split()
+                    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                        ranges.append((int(parts[0]), int(parts[1])))
+        except IOError:
+            pass
+        return ranges
+
+    def _prepare(self, link, local_path, remote_path):
+        """
+        Prepara o arquivo parcial no servidor e determina a partir de onde continuar
+
+        Se já existe um envio parcial do mesmo tamanho, o prefixo contíguo confirmado
+        no diário é verificado por hash (local x remoto) e apenas o restante é enviado.
+        Caso contrário, o arquivo parcial é recriado com o tamanho final.
+
+        Returns:
+            int: Posição a partir da qual o arquivo deve ser enviado
+        """
+        size = os.path.getsize(local_path)
+        part_path = remote_path + PART_SUFFIX
+        journal_path = remote_path + JOURNAL_SUFFIX
+
+        def _inspect(client):
+            sftp = self.open_sftp(client)
+            try:
+                try:
+                    part_size = sftp.stat(part_path).st_size
+                except IOError:
+                    return 0
+                if part_size != size:
+                    return 0
+                return contiguous_watermark(self._read_journal(sftp, journal_path))
+            finally:
+                sftp.close()
+
+        watermark = min(link.with_retry(_inspect, "verificação de envio parcial"), size)
+        if watermark:
+            status, remote_hash, _ = link.exec_idempotent(remote_sha256_command(part_path, watermark))
+            if status == 0 and remote_hash.strip() == local_sha256(local_path, watermark):
+                log_info(f"Retomando envio de {os.path.basename(local_path)}: {watermark} de {size} bytes já confirmados")
+                return watermark
+            log_warning(f"Envio parcial de {os.path.basename(local_path)} não confere com o arquivo local. Reiniciando.")
+
+        def _create(client):
+            sftp = self.open_sftp(client)
+            try:
+                with sftp.open(part_path, "wb"):
+                    pass
+                sftp.truncate(part_path, size)
+                with sftp.open(journal_path, "wb"):
+                    pass
+            finally:
+                sftp.close()
+
+        link.with_retry(_create, "criação do arquivo parcial")
+        return 0
+
+    def _finalize(self, link, local_path, remote_path, local_hash):
+        """
+        Confere o SHA-256 final e move o arquivo parcial para o nome definitivo
+
+        Returns:
+            str: Mensagem de erro ou None se concluído
+        """
+        part_path = remote_path + PART_SUFFIX
+        journal_path = remote_path + JOURNAL_SUFFIX
+        status, remote_hash, _ = link.exec_idempotent(remote_sha256_command(part_path))
+        remote_hash = remote_hash.strip()
+        if status != 0 or len(remote_hash) != 64:
+            log_warning(f"sha256sum indisponível no servidor. {os.path.basename(local_path)} não foi verificado.")
+        elif remote_hash != local_hash:
+            link.exec_idempotent(f"rm -f {quote_remote_path(part_path)} {quote_remote_path(journal_path)}")
+            return "SHA-256 do arquivo enviado não confere com o arquivo local"
+
+        status, _, error = link.exec_idempotent(
+            f"mv -f {quote_remote_path(part_path)} {quote_remote_path(remote_path)} && rm -f {quote_remote_path(journal_path)}"
+        )
+        if status != 0:
+            return f"Erro ao concluir o arquivo remoto: {error.strip()}"
+        return None
+
+    def _write_range(self, state, client, local_path, remote_path, offset, length):
+        """Escreve uma faixa do arquivo local na mesma posição do arquivo remoto"""
+        if state.get("client") is not client:
+            if state.get("sftp") is not None:
+                try:
+                    state["sftp"].close()
+                except Exception:
+                    pass
+            state["client"] = client
+            state["sftp"] = self.open_sftp(client)
+
+        written = 0
+        try:
+            with open(local_path, "rb") as local_file, state["sftp"].open(remote_path + PART_SUFFIX, "r+b") as remote_file:
+                local_file.seek(offset)
+                remote_file.seek(offset)
+                remote_file.set_pipelined(True)
+                while written < length:
+                    data = local_file.read(min(TRANSFER_CHUNK_SIZE, length - written))
+                    if not data:
+                        break
+                    remote_file.write(data)
+                    written += len(data)
+                    self._add_progress(len(data))
+            # O fechamento aguarda a confirmação de todas as escritas em pipeline;
+            # só então a faixa é registrada no diário
+            with self._journal_lock, state["sftp"].open(remote_path + JOURNAL_SUFFIX, "a") as journal:
+                journal.write(f"{offset} {length}\n")
+        except Exception:
+            # A faixa será reenviada por inteiro: desfazer o progresso contado
+            self._add_progress(-written)
+            raise
+
+    def _worker(self, work, failures, scope=None):
+        """Consome faixas da fila usando uma sessão dedicada do pool (fechada se a operação for interrompida)"""
+        state = {}
+        link = ReconnectingSession(self.pool, self.key, dedicated=True, scope=scope)
+        try:
+            while True:
+                try:
+                    item = work.get_nowait()
+                except queue.Empty:
+                    return
+                local_path, remote_path, offset, length = item
+                with self._lock:
+                    if remote_path in failures:
+                        continue
+                try:
+                    link.with_retry(
+                        lambda client: self._write_range(state, client, local_path, remote_path, offset, length),
+                        f"envio de {os.path.basename(local_path)}"
+                    )
+                except Exception as e:
+                    log_error(f"Falha ao enviar {os.path.basename(local_path)} (posição {offset}): {str(e)}")
+                    with self._lock:
+                        failures[remote_path] = str(e)
+        finally:
+            if state.get("sftp") is not None:
+                try:
+                    state["sftp"].close()
+                except Exception:
+                    pass
+            link.close()
+
+    def upload(self, files, local_hashes=None):
+        """
+        Envia os arquivos em paralelo, retomando envios parciais e conferindo o SHA-256 final
+
+        Cada arquivo é escrito em '<destino>.part' e só recebe o nome definitivo
+        depois que o hash remoto confere com o local.
+
+        Args:
+            files: Lista de tuplas (caminho_local, caminho_remoto)
+            local_hashes: SHA-256 já conhecidos, por caminho remoto (opcional)
+
+        Returns:
+            dict: Erros por caminho remoto (vazio se todos foram enviados)
+        """
+        if not files:
+            return {}
+
+        # Hash local calculado em paralelo com o envio (se ainda não conhecido)
+        local_hashes = dict(local_hashes or {})
+        def _hash_locals():
+            for local_path, remote_path in files:
+                if not local_hashes.get(remote_path):
+                    local_hashes[remote_path] = local_sha256(local_path)
+        hasher = threading.Thread(target=_hash_locals, daemon=True)
+        hasher.start()
+
+        failures = {}
+        with ReconnectingSession(self.pool, self.key) as link:
+            starts = {}
+            for local_path, remote_path in files:
+                starts[remote_path] = self._prepare(link, local_path, remote_path)
+
+            self._sent = sum(starts.values())
+            self._total = sum(os.path.getsize(local_path) for local_path, _ in files)
+
+            work = queue.Queue()
+            ranges = self._build_ranges(files, starts)
+            for item in ranges:
+                work.put(item)
+
+            streams = min(self.streams, max(1, len(ranges)))
+            log_info(f"Enviando {len(files)} arquivo(s) em {len(ranges)} faixas por {streams} fluxos")
+
+            scope = current_scope()
+            workers = [threading.Thread(target=self._worker, args=(work, failures, scope), daemon=True) for _ in range(streams)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            hasher.join()
+
+            for local_path, remote_path in files:
+                if remote_path in failures:
+                    continue
+                error = self._finalize(link, local_path, remote_path, local_hashes.get(remote_path))
+                if error:
+                    log_error(f"{os.path.basename(local_path)}: {error}")
+                    failures[remote_path] = error
+        return failures
@@ -5,7 +5,7 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import platform
 import os
-import threading
+import asyncio
 from datetime import datetime
 
 try:
@@ -27,12 +27,23 @@ from utils.logging_utils import log_info, log_error
 from utils.ssh_utils import open_ssh_terminal
 from models.server_profile import ServerProfile
 from services.job_manager import JobManager
+from services.async_job_manager import AsyncJobManager, AsyncLoopThread
+from utils.hash_index import get_hash_index
+from utils.fastq_validator import get_fastq_validator
 from ui.frames.config_frame import ConfigFrame
 from ui.frames.execution_frame import ExecutionFrame  # Agora esse arquivo contém o UnifiedExecutionFrame
 from ui.frames.results_frame import ResultsFrame
 from ui.dialogs.profile_dialog import ProfileManagerDialog
 from ui.dialogs.params_dialog import SPAdesParamsDialog
 from ui.dialogs.spades_path_dialog import SpadesPathDialog
+from ui.dialogs.batch_dialog import BatchDialog
+from ui.dialogs.remote_browser_dialog import RemoteBrowserDialog
+from services.remote_browser import is_remote_read
+from services.job_queue import JobQueue
+from ui.dialogs.job_queue_dialog import JobQueueDialog
+from ui.dialogs.history_dialog import HistoryDialog
+from ui.dialogs.sweep_dialog import SweepDialog
+from services.autotune import plan_job
 
 
 class SPAdesMasterApp(BaseClass):
@@ -89,7 +100,13 @@ class SPAdesMasterApp(BaseClass):
         
         # Instanciar modelos e serviços
         self.server_profiles = ServerProfile()
-        self.job_manager = JobManager(self.status_updater)
+        self.job_manager = JobManager(self.status_updater, capability_store=self.server_profiles)
+        
+        # Event loop único para as operações remotas (em vez de uma thread por clique)
+        self.async_loop = AsyncLoopThread()
+        self.async_loop.start()
+        self.async_jobs = AsyncJobManager(self.job_manager, loop=self.async_loop.loop)
+        self.job_queue = JobQueue(self.job_manager)
         
         # Configurar frames específicos
         self._setup_frames()
@@ -109,15 +126,24 @@ class SPAdesMasterApp(BaseClass):
     def _on_close(self):
         """Função chamada ao fechar a aplicação"""
         try:
-            # Perguntar se deve cancelar o job em execução
+            # Os jobs rodam desacoplados da sessão SSH: continuam no servidor e são
+            # reencontrados na próxima conexão
             if self.job_manager.job_running:
-                if messagebox.askyesno("Job em Execução", "Há um job em execução. Deseja cancelá-lo antes de sair?"):
-                    self.job_manager.cancel_job()
+                messagebox.showinfo("Job em Execução", "O job continuará em execução no servidor.\n\n"
+                                    "Ao conectar novamente, o acompanhamento será retomado automaticamente.")
                     
-            # Desconectar do servidor
+            # Desconectar do servidor e encerrar as sessões mantidas no pool
             if self.job_manager.connected:
-                self.job_manager.disconnect()
+                self.job_manager.disconnect(keep_session=False)
+            self.job_manager.session_pool.close()
                 
+            # Parar o event loop das operações remotas e o cálculo de hashes
+            self.job_queue.stop()
+            self.async_jobs.shutdown()
+            self.async_loop.stop()
+            get_hash_index().shutdown()
+            get_fastq_validator().shutdown()
+            
             # Parar o processamento de log
             if hasattr(self, 'status_updater'):
                 self.status_updater.stop()
@@ -149,7 +175,13 @@ class SPAdesMasterApp(BaseClass):
         # Menu SPAdes
         spades_menu = tk.Menu(menubar, tearoff=0)
         spades_menu.add_command(label="Selecionar Arquivos", command=self._browse_reads)
+        spades_menu.add_command(label="Leituras no Servidor", command=self._browse_remote_reads)
         spades_menu.add_command(label="Configurar Parâmetros", command=self._show_spades_params)
+        spades_menu.add_command(label="Processamento em Lote", command=self._show_batch_dialog)
+        spades_menu.add_command(label="Fila de Jobs", command=self._show_job_queue)
+        spades_menu.add_command(label="Varredura de Parâmetros", command=self._show_sweep)
+        spades_menu.add_command(label="Retomar Montagem", command=self._resume_job)
+        spades_menu.add_command(label="Histórico de Jobs", command=self._show_history)
         menubar.add_cascade(label="SPAdes", menu=spades_menu)
         
         # Menu Ajuda
@@ -258,6 +290,7 @@ class SPAdesMasterApp(BaseClass):
         """Vincula eventos dos frames para a classe principal"""
         # Eventos do ConfigFrame
         self.config_frame.bind("<<TestConnection>>", lambda e: self._test_connection())
+        self.config_frame.bind("<<BrowseRemoteReads>>", lambda e: self._browse_remote_reads())
         
         # Eventos do ExecutionFrame (agora unificado)
         self.execution_frame.bind("<<ConnectToServer>>", lambda e: self._connect_to_server())
@@ -353,146 +386,243 @@ class SPAdesMasterApp(BaseClass):
                 messagebox.showerror("Erro", "Informe a senha do usuário")
                 return
                 
-        # Testar conexão em thread separada
-        threading.Thread(
-            target=self._do_test_connection,
-            args=(params["host"], params["port"], params["username"], 
-                  params["password"], params["key_path"], params["use_key"]),
-            daemon=True
-        ).start()
-        
-    def _do_test_connection(self, host, port, username, password, key_path, use_key):
-        """Executa o teste de conexão em thread separada"""
-        # Desconectar se já estiver conectado
+        # Testar conexão no event loop compartilhado
+        self.async_loop.submit(
+            self._do_test_connection(params["host"], params["port"], params["username"],
+                                     params["password"], params["key_path"], params["use_key"])
+        )
+        
+    async def _ask(self, dialog, *args, **kwargs):
+        """
+        Exibe um diálogo na thread da interface e aguarda a resposta sem bloquear o event loop
+        
+        Args:
+            dialog: Função do diálogo (ex: messagebox.askyesno)
+            
+        Returns:
+            Resultado do diálogo
+        """
+        loop = asyncio.get_running_loop()
+        answer = loop.create_future()
+        
+        def _show():
+            try:
+                result = dialog(*args, **kwargs)
+            except Exception as e:
+                loop.call_soon_threadsafe(lambda error=e: answer.done() or answer.set_exception(error))
+                return
+            loop.call_soon_threadsafe(lambda: answer.done() or answer.set_result(result))
+            
+        self.after(0, _show)
+        return await answer
+        
+    def _ui(self, func, *args):
+        """Executa uma atualização da interface na thread do Tk (chamado a partir do event loop)"""
+        self.after(0, lambda: func(*args))
+        
+    def _ask_spades_path(self):
+        """Abre o diálogo de configuração manual do SPAdes e retorna True se configurado"""
+        return bool(SpadesPathDialog(self, self.job_manager, self.status_updater).result)
+        
+    async def _do_test_connection(self, host, port, username, password, key_path, use_key):
+        """Executa o teste de conexão no event loop"""
+        # Desconectar se já estiver conectado (a sessão permanece no pool e é reutilizada)
         if self.job_manager.connected:
             self.job_manager.disconnect()
             
         # Testar conexão
-        success = self.job_manager.connect(host, port, username, password, key_path, use_key)
+        try:
+            success = await self.async_jobs.connect(host, port, username, password, key_path, use_key)
+        except asyncio.TimeoutError:
+            self.status_updater.update_log("Tempo esgotado ao conectar com o servidor", "ERROR")
+            success = False
         
         if success:
             # Se conectou mas SPAdes não foi encontrado, exibir diálogo para configurar manualmente
             if not self.job_manager.spades_path:
-                path_dialog = SpadesPathDialog(self, self.job_manager, self.status_updater)
-                if not path_dialog.result:
+                if not await self._ask(self._ask_spades_path):
                     # Usuário cancelou ou não conseguiu configurar
                     self.job_manager.disconnect()
-                    messagebox.showerror("Erro", "Não foi possível configurar o SPAdes. A conexão será encerrada.")
+                    await self._ask(messagebox.showerror, "Erro", "Não foi possível configurar o SPAdes. A conexão será encerrada.")
                     return
-            # Verificar versão do SPAdes
-            try:
-                # Usar o caminho do SPAdes encontrado durante a conexão
-                spades_command = self.job_manager.spades_path if self.job_manager.spades_path else "spades.py"
-                stdin, stdout, stderr = self.job_manager.ssh.exec_command(f"{spades_command} --version")
-                version = stdout.read().decode().strip()
-                self.status_updater.update_log(f"Versão do SPAdes: {version}", "SUCCESS")
-            except Exception as e:
-                self.status_updater.update_log(f"Não foi possível determinar a versão do SPAdes: {str(e)}", "WARNING")
+            # Verificar versão do SPAdes (já registrada na conexão quando conhecida)
+            if not self.job_manager.capabilities.get("spades_version"):
+                try:
+                    # Usar o caminho do SPAdes encontrado durante a conexão
+                    spades_command = self.job_manager.spades_path if self.job_manager.spades_path else "spades.py"
+                    _, version, _ = await self.async_jobs.exec_command(f"{spades_command} --version", timeout=60)
+                    self.status_updater.update_log(f"Versão do SPAdes: {version.strip()}", "SUCCESS")
+                except Exception as e:
+                    self.status_updater.update_log(f"Não foi possível determinar a versão do SPAdes: {str(e)}", "WARNING")
                 
             # Verificar recursos básicos
-            resources = self.job_manager.check_server_resources()
+            resources = await self.async_jobs.check_server_resources()
             if resources:
-                self.execution_frame.update_server_info(resources)
+                self._ui(self.execution_frame.update_server_info, resources)
                 
-            # Desconectar após o teste
-            self.job_manager.disconnect()
+            # Retomar o acompanhamento dos jobs iniciados em sessões anteriores
+            for state in await self.async_jobs.reattach():
+                self.job_queue.adopt(state)
+            if self.job_manager.job_running:
+                self._ui(self.execution_frame.start_monitoring)
+                self._ui(self.execution_frame.update_job_status,
+                         f"Acompanhando job em execução no servidor (PID {self.job_manager.job_pid})")
+                
+            # A sessão testada permanece aberta e é usada diretamente pelas próximas operações
             
             # Mostrar mensagem de sucesso
-            messagebox.showinfo("Sucesso", "Conexão com o servidor estabelecida com sucesso!")
+            await self._ask(messagebox.showinfo, "Sucesso", "Conexão com o servidor estabelecida com sucesso!")
         else:
-            messagebox.showerror("Erro", "Falha ao conectar com o servidor. Verifique o log para mais detalhes.")
+            await self._ask(messagebox.showerror, "Erro", "Falha ao conectar com o servidor. Verifique o log para mais detalhes.")
         
-    def _connect_to_server(self):
-        """Conecta ao servidor configurado"""
-        # Obter parâmetros de conexão
-        params = self.config_frame.get_connection_params()
+    def _connection_error(self, params):
+        """
+        Valida os parâmetros de conexão
         
-        # Validar campos obrigatórios
-        if not params["host"] or not params["username"]:
-            self.status_updater.update_log("Informe o servidor e o usuário", "WARNING")
-            messagebox.showwarning("Atenção", "Informe o endereço do servidor e o nome de usuário.")
-            return False
+        Args:
+            params: Parâmetros no formato de ConfigFrame.get_connection_params
             
-        # Validar método de autenticação
+        Returns:
+            str: Mensagem de erro ou None se válidos
+        """
+        if not params["host"] or not params["username"]:
+            return "Informe o endereço do servidor e o nome de usuário."
         if params["use_key"]:
             if not params["key_path"] or not os.path.isfile(params["key_path"]):
-                self.status_updater.update_log("Arquivo de chave inválido ou não encontrado", "ERROR")
-                messagebox.showerror("Erro", "Arquivo de chave inválido ou não encontrado.")
-                return False
-        else:
-            if not params["password"]:
-                self.status_updater.update_log("Senha não informada", "WARNING")
-                messagebox.showerror("Erro", "Informe a senha do usuário.")
-                return False
+                return "Arquivo de chave inválido ou não encontrado."
+        elif not params["password"]:
+            return "Informe a senha do usuário."
+        return None
+        
+    def _connection_snapshot(self):
+        """Lê os parâmetros de conexão e o perfil selecionado (na thread da interface), para uso no event loop"""
+        params = self.config_frame.get_connection_params()
+        params["profile"] = self.config_frame.selected_profile.get()
+        return params
+        
+    def _connect_to_server(self, on_connected=None):
+        """
+        Conecta ao servidor configurado sem bloquear a interface
+        
+        Args:
+            on_connected: Função opcional chamada na thread da interface depois de conectar
             
-        # Desconectar se já estiver conectado
-        if self.job_manager.connected:
-            self.job_manager.disconnect()
+        Returns:
+            bool: True se já estava conectado a este servidor (nesse caso on_connected não é chamada)
+        """
+        params = self._connection_snapshot()
+        error = self._connection_error(params)
+        if error:
+            self.status_updater.update_log(error, "WARNING")
+            messagebox.showwarning("Atenção", error)
+            return False
             
-         # Conectar em thread separada
-        connect_thread = threading.Thread(
-            target=self._do_connect,
-            args=(params["host"], params["port"], params["username"], 
-                  params["password"], params["key_path"], params["use_key"]),
-            daemon=True
-        )
-        connect_thread.start()
+        # Reaproveitar a sessão se já estiver conectado ao mesmo servidor (ex: após testar a conexão)
+        if self.job_manager.is_connected_to(params["host"], params["port"], params["username"]):
+            self.status_updater.update_log("Já conectado a este servidor. Reutilizando a sessão existente.", "INFO")
+            return True
+            
+        # Conectar no event loop compartilhado; a ação pendente é retomada na thread da interface
+        def _done(connected):
+            if connected and on_connected:
+                self._ui(on_connected)
+                
+        self.async_loop.submit(self._reconnect(params, notify=True), callback=_done)
+        return False
         
-        # Aguardar um pouco para ver se a conexão é bem sucedida
-        connect_thread.join(2.0)
+    def _ensure_connected(self, action):
+        """
+        Garante a conexão antes de uma ação da interface
         
+        Args:
+            action: Ação repetida na thread da interface quando a conexão for estabelecida
+            
+        Returns:
+            bool: True se já está conectado (a ação pode prosseguir)
+        """
+        if self.job_manager.connected:
+            return True
+        self._connect_to_server(on_connected=action)
+        return False
+        
+    async def _reconnect(self, params, notify=False):
+        """
+        Conecta ao servidor a partir do event loop, configurando o SPAdes se necessário
+        
+        Args:
+            params: Resultado de _connection_snapshot (lido na thread da interface)
+            notify: Se True, exibe a mensagem de sucesso
+            
+        Returns:
+            bool: True se conectado
+        """
+        error = self._connection_error(params)
+        if error:
+            self.status_updater.update_log(error, "WARNING")
+            return False
+        if self.job_manager.is_connected_to(params["host"], params["port"], params["username"]):
+            return True
+            
+        # Desconectar se já estiver conectado a outro servidor
+        if self.job_manager.connected:
+            self.job_manager.disconnect()
+        await self._do_connect(params["host"], params["port"], params["username"], params["password"],
+                               params["key_path"], params["use_key"], params.get("profile"), notify)
+                               
         # Se conectado mas SPAdes não encontrado, exibir diálogo para configurar manualmente
         if self.job_manager.connected and not self.job_manager.spades_path:
-            path_dialog = SpadesPathDialog(self, self.job_manager, self.status_updater)
-            if not path_dialog.result:
+            if not await self._ask(self._ask_spades_path):
                 # Usuário cancelou ou não conseguiu configurar
                 self.job_manager.disconnect()
                 return False
-                
         return self.job_manager.connected
             
-    def _do_connect(self, host, port, username, password, key_path, use_key):
-        """Executa a conexão em thread separada"""
-        # Conectar ao servidor
-        success = self.job_manager.connect(host, port, username, password, key_path, use_key)
+    async def _do_connect(self, host, port, username, password, key_path, use_key, profile=None, notify=True):
+        """Executa a conexão no event loop"""
+        # Conectar ao servidor (o perfil selecionado é registrado no histórico de jobs)
+        self.job_manager.profile_name = profile
+        try:
+            success = await self.async_jobs.connect(host, port, username, password, key_path, use_key)
+        except asyncio.TimeoutError:
+            self.status_updater.update_log("Tempo esgotado ao conectar com o servidor", "ERROR")
+            success = False
         
         if success:
             # Verificar recursos após conectar
-            resources = self.job_manager.check_server_resources()
+            resources = await self.async_jobs.check_server_resources()
             if resources:
-                self.execution_frame.update_server_info(resources)
+                self._ui(self.execution_frame.update_server_info, resources)
                 
             # Mostrar mensagem de sucesso
             self.status_updater.update_log(f"Conectado com sucesso a {username}@{host}", "SUCCESS")
-            messagebox.showinfo("Sucesso", "Conexão com o servidor estabelecida com sucesso!")
+            if notify:
+                self._ui(messagebox.showinfo, "Sucesso", "Conexão com o servidor estabelecida com sucesso!")
         else:
-            messagebox.showerror("Erro", "Falha ao conectar com o servidor. Verifique o log para mais detalhes.")
+            self._ui(messagebox.showerror, "Erro", "Falha ao conectar com o servidor. Verifique o log para mais detalhes.")
             
     def _check_resources(self):
         """Verifica os recursos disponíveis no servidor"""
-        if not self.job_manager.connected:
-            if not self._connect_to_server():
-                return
+        if not self._ensure_connected(self._check_resources):
+            return
                 
-        # Verificar recursos em thread separada
-        threading.Thread(target=self._do_check_resources, daemon=True).start()
+        # Verificar recursos no event loop compartilhado
+        self.async_loop.submit(self._do_check_resources())
         
-    def _do_check_resources(self):
-        """Executa a verificação de recursos em thread separada"""
-        resources = self.job_manager.check_server_resources()
+    async def _do_check_resources(self):
+        """Executa a verificação de recursos no event loop"""
+        resources = await self.async_jobs.check_server_resources()
         
         if resources:
             # Atualizar informações do servidor
-            self.execution_frame.update_server_info(resources)
+            self._ui(self.execution_frame.update_server_info, resources)
             self.status_updater.update_log("Recursos do servidor verificados", "SUCCESS")
         else:
             self.status_updater.update_log("Não foi possível obter informações de recursos", "ERROR")
             
     def _prepare_and_upload(self):
         """Prepara o diretório remoto e envia os arquivos"""
-        if not self.job_manager.connected:
-            if not self._connect_to_server():
-                return
+        if not self._ensure_connected(self._prepare_and_upload):
+            return
                 
         # Obter parâmetros
         params = self.config_frame.get_spades_params()
@@ -503,7 +633,7 @@ class SPAdesMasterApp(BaseClass):
             messagebox.showwarning("Atenção", "Selecione os arquivos de leitura (R1 e R2).")
             return
             
-        if not os.path.exists(params["read1_path"]) or not os.path.exists(params["read2_path"]):
+        if not all(is_remote_read(path) or os.path.exists(path) for path in (params["read1_path"], params["read2_path"])):
             self.status_updater.update_log("Arquivo de leitura não encontrado", "ERROR")
             messagebox.showerror("Erro", "Um ou mais arquivos de leitura não foram encontrados.")
             return
@@ -514,33 +644,31 @@ class SPAdesMasterApp(BaseClass):
             messagebox.showwarning("Atenção", "Informe o diretório remoto.")
             return
             
-        # Preparar e enviar em thread separada
-        threading.Thread(
-            target=self._do_prepare_and_upload,
-            args=(params["remote_dir"], params["read1_path"], params["read2_path"]),
-            daemon=True
-        ).start()
+        # Preparar e enviar no event loop compartilhado
+        self.async_loop.submit(
+            self._do_prepare_and_upload(params["remote_dir"], params["read1_path"], params["read2_path"],
+                                        params.get("compress_upload", False))
+        )
         
-    def _do_prepare_and_upload(self, remote_dir, read1_path, read2_path):
-        """Executa a preparação e envio de arquivos em thread separada"""
+    async def _do_prepare_and_upload(self, remote_dir, read1_path, read2_path, compress=False):
+        """Executa a preparação e envio de arquivos no event loop"""
         # Preparar diretório remoto
-        if not self.job_manager.prepare_remote_dir(remote_dir):
+        if not await self.async_jobs.prepare_remote_dir(remote_dir):
             return
             
         # Enviar arquivos
         files_to_upload = [read1_path, read2_path]
-        success = self.job_manager.upload_files(files_to_upload, remote_dir)
+        success = await self.async_jobs.upload(files_to_upload, remote_dir, compress)
         
         if success:
             self.status_updater.update_status("Arquivos enviados com sucesso")
-            self.execution_frame.update_job_status("Arquivos enviados ao servidor. Pronto para iniciar o SPAdes.")
-            messagebox.showinfo("Sucesso", "Arquivos enviados com sucesso ao servidor.")
+            self._ui(self.execution_frame.update_job_status, "Arquivos enviados ao servidor. Pronto para iniciar o SPAdes.")
+            await self._ask(messagebox.showinfo, "Sucesso", "Arquivos enviados com sucesso ao servidor.")
             
     def _run_spades(self):
         """Inicia a execução do SPAdes no servidor"""
-        if not self.job_manager.connected:
-            if not self._connect_to_server():
-                return
+        if not self._ensure_connected(self._run_spades):
+            return
                 
         # Verificar se os arquivos foram enviados
         if not self.job_manager.ssh:
@@ -551,60 +679,102 @@ class SPAdesMasterApp(BaseClass):
         # Obter parâmetros
         params = self.config_frame.get_spades_params()
             
-        # Verificar campos obrigatórios
-        if not params["threads"]:
+        # Verificar campos obrigatórios (threads são escolhidas no ajuste automático)
+        if not params["threads"] and not params["auto_tune"]:
             self.status_updater.update_log("Informe o número de threads", "WARNING")
             messagebox.showwarning("Atenção", "Informe o número de threads a serem utilizados.")
             return
             
+        # Com um job em execução, o novo job vai para a fila (iniciado quando couber no servidor)
+        if self.job_manager.job_running:
+            if messagebox.askyesno("Job em Execução", "Já existe um job em execução. Deseja adicionar este job à fila?\n\n"
+                                   "Ele será iniciado quando houver CPUs e memória livres no servidor."):
+                self._enqueue_job(params)
+            return
+                
+        # Iniciar SPAdes no event loop compartilhado
+        self.async_loop.submit(self._do_run_spades(
+            params["remote_dir"],
+            params["read1_path"],
+            params["read2_path"],
+            params["output_dir"],
+            params["threads"],
+            params["memory"],
+            params["mode"],
+            params["kmer"],
+            params["auto_tune"],
+            params["backend"],
+            params["normalization"],
+            params["fast_scratch"]
+        ))
+        
+    async def _do_run_spades(self, remote_dir, read1_path, read2_path, output_dir, threads, memory, mode, kmer, auto_tune=False,
+                             backend="direct", normalization=None, fast_scratch=False):
+        """Executa o SPAdes no event loop"""
         # Verificar se job já está rodando
         if self.job_manager.job_running:
-            if not messagebox.askyesno("Job em Execução", "Já existe um job em execução. Deseja iniciar um novo?"):
+            if not await self._ask(messagebox.askyesno, "Job em Execução", "Já existe um job em execução. Deseja iniciar um novo?"):
                 return
                 
-        # Iniciar SPAdes em thread separada
-        threading.Thread(
-            target=self._do_run_spades,
-            args=(
-                params["remote_dir"],
-                params["read1_path"],
-                params["read2_path"],
-                params["output_dir"],
-                params["threads"],
-                params["memory"],
-                params["mode"],
-                params["kmer"]
-            ),
-            daemon=True
-        ).start()
-        
-    def _do_run_spades(self, remote_dir, read1_path, read2_path, output_dir, threads, memory, mode, kmer):
-        """Executa o SPAdes em thread separada"""
-         # Verificar se job já está rodando
-        if self.job_manager.job_running:
-            if not messagebox.askyesno("Job em Execução", "Já existe um job em execução. Deseja iniciar um novo?"):
+        # Escolher -t e -m pelos recursos atuais do servidor
+        if auto_tune:
+            try:
+                tuned = await self.async_jobs.call(self._auto_tune, read1_path, read2_path, mode, timeout=120)
+            except asyncio.TimeoutError:
+                self.status_updater.update_log("Tempo esgotado ao consultar recursos para o ajuste automático", "ERROR")
+                tuned = None
+            if tuned:
+                threads, memory = tuned
+            elif not threads:
+                await self._ask(messagebox.showwarning, "Atenção", "Não foi possível ajustar os recursos automaticamente. Informe o número de threads.")
                 return
                 
         # Verificar se o SPAdes funciona antes de tentar executar
+        # (dispensado quando a versão foi validada na conexão)
         spades_command = self.job_manager.spades_path if self.job_manager.spades_path else "spades.py"
-        stdin, stdout, stderr = self.job_manager.ssh.exec_command(f"{spades_command} --help | head -n 5")
-        help_output = stdout.read().decode().strip()
+        if "SPAdes" in self.job_manager.capabilities.get("spades_version", ""):
+            help_output = self.job_manager.capabilities["spades_version"]
+        else:
+            try:
+                help_output = await self.async_jobs.test_spades(spades_command)
+            except (ConnectionError, asyncio.TimeoutError) as e:
+                self.status_updater.update_log(f"Não foi possível verificar o SPAdes: {str(e)}", "WARNING")
+                help_output = ""
         
         if "SPAdes" not in help_output:
             self.status_updater.update_log("O comando SPAdes não está funcionando corretamente.", "ERROR")
-            messagebox.showerror("Erro", "O comando SPAdes não está funcionando corretamente. Verifique se está instalado no servidor.")
-            path_dialog = SpadesPathDialog(self, self.job_manager, self.status_updater)
-            if not path_dialog.result:
+            await self._ask(messagebox.showerror, "Erro", "O comando SPAdes não está funcionando corretamente. Verifique se está instalado no servidor.")
+            if not await self._ask(self._ask_spades_path):
+                return
+                
+        # Montagem interrompida no mesmo diretório de saída: oferecer a retomada
+        checkpoint = await self.async_jobs.check_checkpoint(remote_dir, output_dir)
+        if checkpoint is not None and checkpoint.resumable:
+            answer = await self._ask(
+                messagebox.askyesnocancel,
+                "Montagem Interrompida",
+                f"O diretório {remote_dir}/{output_dir} contém uma montagem interrompida "
+                f"({checkpoint.describe()}).\n\n"
+                "Sim: retomar a partir do último estágio concluído\n"
+                "Não: iniciar do zero (os resultados existentes serão sobrescritos)"
+            )
+            if answer is None:
+                return
+            if answer:
+                await self._do_resume_spades(remote_dir, output_dir, threads, memory, backend)
                 return
                 
         # Mostrar uma confirmação com o comando que será executado
-        params = self.config_frame.get_spades_params()
         # Usar o caminho do SPAdes que foi detectado durante a conexão
         spades_command = self.job_manager.spades_path if self.job_manager.spades_path else "spades.py"
-        cmd_preview = f"{spades_command} -1 {os.path.basename(params['read1_path'])} -2 {os.path.basename(params['read2_path'])} -t {params['threads']} --{params['mode']} -o {params['output_dir']}"
-        
-        if not messagebox.askyesno("Confirmar Execução", 
-            f"O seguinte comando será executado no servidor:\n\n{cmd_preview}\n\nDeseja continuar?"):
+        cmd_preview = f"{spades_command} -1 {self.job_manager.remote_read_name(read1_path)} -2 {self.job_manager.remote_read_name(read2_path)} -t {threads}{f' -m {memory}' if memory else ''} --{mode} -o {output_dir}"
+        
+        where = "no servidor" if backend == "direct" else f"no cluster (via {backend})"
+        if normalization:
+            cmd_preview = (f"{normalization['method']}: leituras reduzidas a ~{normalization['depth']}x, depois\n"
+                           f"{cmd_preview}")
+        if not await self._ask(messagebox.askyesno, "Confirmar Execução",
+                               f"O seguinte comando será executado {where}:\n\n{cmd_preview}\n\nDeseja continuar?"):
             return
             
         # Parâmetros
@@ -612,11 +782,11 @@ class SPAdesMasterApp(BaseClass):
         
         # Iniciar o monitoramento
         self.status_updater.update_status("Executando SPAdes...")
-        self.execution_frame.start_monitoring()
-        self.notebook.select(self.notebook.index(self.execution_frame))  # Mudar para a aba unificada
+        self._ui(self.execution_frame.start_monitoring)
+        self._ui(self.notebook.select, self.execution_frame)  # Mudar para a aba unificada
         
         # Executar SPAdes
-        success = self.job_manager.run_spades(
+        success = await self.async_jobs.run(
             remote_dir,
             read1_path,
             read2_path,
@@ -624,16 +794,71 @@ class SPAdesMasterApp(BaseClass):
             threads,
             memory_param,
             mode,
-            kmer
+            kmer,
+            backend=backend,
+            normalization=normalization,
+            fast_scratch=fast_scratch
         )
         
         if success:
             # Certifique-se de que o caminho completo do job_output_file seja definido corretamente
-            self.execution_frame.update_job_status(f"SPAdes iniciado. Monitorando progresso em {remote_dir}/{output_dir}...")
+            self._ui(self.execution_frame.update_job_status, f"SPAdes iniciado. Monitorando progresso em {remote_dir}/{output_dir}...")
             
             # Certificar-se de que o frame de execução está visível
-            self.notebook.select(self.notebook.index(self.execution_frame))
+            self._ui(self.notebook.select, self.execution_frame)
+            
+    def _resume_job(self):
+        """Retoma a montagem interrompida no diretório de saída atual"""
+        if not self._ensure_connected(self._resume_job):
+            return
+                
+        if self.job_manager.job_running:
+            messagebox.showwarning("Atenção", "Já existe um job em execução.")
+            return
             
+        params = self.config_frame.get_spades_params()
+        if not params["remote_dir"]:
+            messagebox.showwarning("Atenção", "Informe o diretório remoto.")
+            return
+            
+        self.async_loop.submit(
+            self._do_resume_spades(params["remote_dir"], params["output_dir"], params["threads"], params["memory"], params["backend"])
+        )
+        
+    async def _do_resume_spades(self, remote_dir, output_dir, threads, memory, backend="direct"):
+        """Retoma o SPAdes no event loop (com -t/-m alterados, se diferentes da execução anterior)"""
+        self.status_updater.update_status("Retomando SPAdes...")
+        self._ui(self.execution_frame.start_monitoring)
+        self._ui(self.notebook.select, self.execution_frame)
+        
+        if await self.async_jobs.resume(remote_dir, output_dir, threads or None, memory or None, backend=backend):
+            self._ui(self.execution_frame.update_job_status, f"SPAdes retomado. Monitorando progresso em {remote_dir}/{output_dir}...")
+        else:
+            await self._ask(messagebox.showerror, "Erro", "Não foi possível retomar a montagem. Verifique o log para mais detalhes.")
+            
+    def _auto_tune(self, read1_path, read2_path, mode):
+        """
+        Escolhe threads e memória pelos recursos do servidor e pelo volume das leituras, explicando a escolha no log
+        
+        Returns:
+            tuple: (threads, memória em GB) ou None se não for possível estimar
+        """
+        try:
+            plan = plan_job(self.job_manager, [read1_path, read2_path], mode)
+        except Exception as e:
+            self.status_updater.update_log(f"Erro ao consultar recursos para o ajuste automático: {str(e)}", "ERROR")
+            return None
+            
+        if plan is None:
+            self.status_updater.update_log("Recursos do servidor indisponíveis; ajuste automático não aplicado", "WARNING")
+            return None
+            
+        for reason in plan["reasons"]:
+            self.status_updater.update_log(f"Ajuste automático: {reason}")
+        self.status_updater.update_log(f"Ajuste automático: -t {plan['threads']} -m {plan['memory']}", "SUCCESS")
+        self.after(0, lambda: self.config_frame.set_resources(plan["threads"], plan["memory"]))
+        return plan["threads"], plan["memory"]
+        
     def _cancel_job(self):
         """Cancela o job em execução"""
         if not self.job_manager.connected or not self.job_manager.job_running:
@@ -643,24 +868,27 @@ class SPAdesMasterApp(BaseClass):
             
         # Confirmar cancelamento
         if messagebox.askyesno("Confirmar Cancelamento", "Deseja realmente cancelar o job em execução?"):
-            # Cancelar em thread separada
-            threading.Thread(target=self._do_cancel_job, daemon=True).start()
+            # Cancelar no event loop compartilhado (parâmetros lidos aqui, na thread da interface)
+            self.async_loop.submit(self._do_cancel_job(self.config_frame.get_spades_params(), self._connection_snapshot()))
             
-    def _do_cancel_job(self):
-        """Executa o cancelamento do job em thread separada"""
-        success = self.job_manager.cancel_job()
+    async def _do_cancel_job(self, params, connection):
+        """
+        Executa o cancelamento do job no event loop
+        
+        Args:
+            params: Parâmetros do job (ConfigFrame.get_spades_params)
+            connection: Parâmetros de conexão para reconectar (ver _connection_snapshot)
+        """
+        success = await self.async_jobs.cancel()
         
         if success:
-            self.execution_frame.update_job_status("Job cancelado pelo usuário.")
-            self.execution_frame.stop_monitoring()
+            self._ui(self.execution_frame.update_job_status, "Job cancelado pelo usuário.")
+            self._ui(self.execution_frame.stop_monitoring)
             
             # Perguntar ao usuário se deseja limpar os arquivos do job cancelado
             # Neste momento a conexão SSH ainda está ativa
-            if messagebox.askyesno("Limpar Arquivos", 
-                                  "Job cancelado com sucesso. Deseja limpar os arquivos remotos do job cancelado?"):
-                # Obter parâmetros do job
-                params = self.config_frame.get_spades_params()
-                
+            if await self._ask(messagebox.askyesno, "Limpar Arquivos",
+                               "Job cancelado com sucesso. Deseja limpar os arquivos remotos do job cancelado?"):
                 # Verificar se a conexão está ativa antes de prosseguir
                 if not self.job_manager.connected or not self.job_manager.ssh or (
                     hasattr(self.job_manager.ssh, 'get_transport') and (
@@ -668,17 +896,17 @@ class SPAdesMasterApp(BaseClass):
                         not self.job_manager.ssh.get_transport().is_active()
                     )):
                     # Tentar reconectar se a sessão já foi encerrada
-                    if not self._connect_to_server():
-                        messagebox.showwarning("Aviso", 
-                            "A conexão SSH foi perdida. Reconecte ao servidor e tente limpar os arquivos manualmente.")
+                    if not await self._reconnect(connection):
+                        await self._ask(messagebox.showwarning, "Aviso",
+                                        "A conexão SSH foi perdida. Reconecte ao servidor e tente limpar os arquivos manualmente.")
                         return
                 
                 # Chamar a função de limpeza específica para o diretório do job
-                self._do_clean_remote_files(params["remote_dir"], params["output_dir"])
+                await self._do_clean_remote_files(params["remote_dir"], params["output_dir"], connection)
             else:
-                messagebox.showinfo("Sucesso", "Job cancelado com sucesso.")
+                await self._ask(messagebox.showinfo, "Sucesso", "Job cancelado com sucesso.")
         else:
-            messagebox.showerror("Erro", "Não foi possível cancelar o job. Verifique o log para mais detalhes.")
+            await self._ask(messagebox.showerror, "Erro", "Não foi possível cancelar o job. Verifique o log para mais detalhes.")
     
     def _open_ssh_terminal(self):
         """Abre um terminal com comando SSH pronto para conectar ao servidor"""
@@ -730,9 +958,8 @@ class SPAdesMasterApp(BaseClass):
         Args:
             important_only: Se True, baixa apenas os arquivos importantes
         """
-        if not self.job_manager.connected:
-            if not self._connect_to_server():
-                return
+        if not self._ensure_connected(lambda: self._download_results(important_only)):
+            return
                 
         # Obter parâmetros
         params = self.config_frame.get_spades_params()
@@ -752,16 +979,14 @@ class SPAdesMasterApp(BaseClass):
         download_type = "arquivos importantes" if important_only else "todos os arquivos"
         self.status_updater.update_log(f"Iniciando download de {download_type}...", "INFO")
             
-        # Baixar em thread separada
-        threading.Thread(
-            target=self._do_download_results,
-            args=(params["remote_dir"], params["output_dir"], local_dir, important_only),
-            daemon=True
-        ).start()
+        # Baixar no event loop compartilhado
+        self.async_loop.submit(
+            self._do_download_results(params["remote_dir"], params["output_dir"], local_dir, important_only)
+        )
         
-    def _do_download_results(self, remote_dir, output_dir, local_dir, important_only):
+    async def _do_download_results(self, remote_dir, output_dir, local_dir, important_only):
         """
-        Executa o download dos resultados em thread separada
+        Executa o download dos resultados no event loop
         
         Args:
             remote_dir: Diretório remoto
@@ -769,18 +994,18 @@ class SPAdesMasterApp(BaseClass):
             local_dir: Diretório local
             important_only: Se True, baixa apenas arquivos importantes
         """
-        success = self.job_manager.download_results(remote_dir, output_dir, local_dir, important_only)
+        success = await self.async_jobs.download(remote_dir, output_dir, local_dir, important_only)
         
         if success:
             # Atualizar lista de arquivos baixados
-            self.results_frame.update_results_list(local_dir, output_dir)
+            self._ui(self.results_frame.update_results_list, local_dir, output_dir)
             
             # Mostrar mensagem de sucesso
             download_type = "arquivos importantes" if important_only else "todos os arquivos"
-            messagebox.showinfo("Sucesso", f"{download_type.capitalize()} baixados com sucesso.")
+            await self._ask(messagebox.showinfo, "Sucesso", f"{download_type.capitalize()} baixados com sucesso.")
             
             # Mudar para a aba de resultados
-            self.notebook.select(self.notebook.index(self.results_frame))
+            self._ui(self.notebook.select, self.results_frame)
 
     def _open_results_folder(self):
         """Abre o diretório de resultados no explorador de arquivos"""
@@ -830,6 +1055,15 @@ class SPAdesMasterApp(BaseClass):
         """Abre diálogo para selecionar arquivos de leitura"""
         # Método que chama a função correspondente no ConfigFrame
         self.config_frame._browse_reads()
+        
+    def _browse_remote_reads(self):
+        """Abre o navegador de arquivos do servidor para escolher leituras já disponíveis"""
+        if not self._ensure_connected(self._browse_remote_reads):
+            return
+        if self.job_manager.link is None:
+            messagebox.showerror("Erro", "Servidor não conectado. Conecte-se primeiro.")
+            return
+        RemoteBrowserDialog(self, self.job_manager, self.config_frame.set_remote_reads)
                 
     def _show_profile_manager(self):
         """Mostra o diálogo de gerenciamento de perfis"""
@@ -839,6 +1073,37 @@ class SPAdesMasterApp(BaseClass):
         """Mostra diálogo com parâmetros avançados do SPAdes"""
         SPAdesParamsDialog(self, self.config_frame)
         
+    def _enqueue_job(self, params):
+        """Adiciona um job à fila com os parâmetros informados"""
+        if not self._ensure_connected(lambda: self._enqueue_job(params)):
+            return
+        if not params["remote_dir"] or (not params["threads"] and not params["auto_tune"]):
+            messagebox.showwarning("Atenção", "Informe o diretório remoto e o número de threads (ou ative o ajuste automático).")
+            return
+        try:
+            job = self.job_queue.submit(params)
+        except ValueError as e:
+            self.status_updater.update_log(str(e), "WARNING")
+            messagebox.showwarning("Atenção", str(e))
+            return
+        self.status_updater.update_log(f"Job adicionado à fila: {job.describe()}", "SUCCESS")
+        
+    def _show_job_queue(self):
+        """Mostra a fila de jobs"""
+        JobQueueDialog(self, self.job_queue)
+        
+    def _show_history(self):
+        """Mostra o histórico local de jobs"""
+        HistoryDialog(self)
+        
+    def _show_sweep(self):
+        """Mostra a varredura de parâmetros (k-mers, modos e cutoffs de cobertura)"""
+        SweepDialog(self)
+        
+    def _show_batch_dialog(self):
+        """Mostra diálogo de processamento em lote de várias amostras"""
+        BatchDialog(self)
+        
     def _show_spades_info(self):
         """Mostra informações sobre o SPAdes"""
         info = """
@@ -893,9 +1158,8 @@ Desenvolvido para facilitar o uso do SPAdes em ambientes computacionais distribu
             
     def _clean_remote_files(self):
         """Limpa os arquivos remotos no servidor"""
-        if not self.job_manager.connected:
-            if not self._connect_to_server():
-                return
+        if not self._ensure_connected(self._clean_remote_files):
+            return
         
         # Verificar se job está em execução
         if self.job_manager.job_running:
@@ -916,20 +1180,17 @@ Desenvolvido para facilitar o uso do SPAdes em ambientes computacionais distribu
             self.status_updater.update_log("Operação de limpeza cancelada pelo usuário")
             return
         
-        # Iniciar thread para limpeza
-        threading.Thread(
-            target=self._do_clean_remote_files,
-            args=(params["remote_dir"], params["output_dir"]),
-            daemon=True
-        ).start()
+        # Limpar no event loop compartilhado
+        self.async_loop.submit(self._do_clean_remote_files(params["remote_dir"], params["output_dir"], self._connection_snapshot()))
 
-    def _do_clean_remote_files(self, remote_dir, output_dir=None):
+    async def _do_clean_remote_files(self, remote_dir, output_dir=None, connection=None):
         """
-        Executa a limpeza de arquivos remotos em thread separada
+        Executa a limpeza de arquivos remotos no event loop
         
         Args:
             remote_dir: Diretório remoto
             output_dir: Diretório específico de saída (opcional)
+            connection: Parâmetros de conexão para reconectar (ver _connection_snapshot)
         """
         # Verificar se ainda estamos conectados, reconectar se necessário
         if not self.job_manager.connected or not self.job_manager.ssh or (
@@ -938,9 +1199,9 @@ Desenvolvido para facilitar o uso do SPAdes em ambientes computacionais distribu
                 not self.job_manager.ssh.get_transport().is_active()
             )):
             self.status_updater.update_log("Sessão SSH não está ativa. Tentando reconectar...", "WARNING")
-            if not self._connect_to_server():
+            if connection is None or not await self._reconnect(connection):
                 self.status_updater.update_log("Não foi possível reconectar ao servidor. Impossível limpar arquivos.", "ERROR")
-                messagebox.showerror("Erro", "A conexão SSH foi perdida e não foi possível reconectar. Tente novamente mais tarde.")
+                await self._ask(messagebox.showerror, "Erro", "A conexão SSH foi perdida e não foi possível reconectar. Tente novamente mais tarde.")
                 return
                 
         # Mostrar mensagem de processamento
@@ -948,15 +1209,15 @@ Desenvolvido para facilitar o uso do SPAdes em ambientes computacionais distribu
         self.status_updater.update_log("Iniciando limpeza de arquivos remotos...", "INFO")
         
         # Chamar método do job_manager para limpar
-        success, message = self.job_manager.clean_remote_files(remote_dir, output_dir)
+        success, message = await self.async_jobs.clean(remote_dir, output_dir)
         
         if success:
             # Mostrar mensagem de sucesso
             self.status_updater.update_status("Arquivos remotos limpos com sucesso")
             self.status_updater.update_log(message, "SUCCESS")
-            messagebox.showinfo("Sucesso", f"Arquivos remotos limpos com sucesso.\n\n{message}")
+            await self._ask(messagebox.showinfo, "Sucesso", f"Arquivos remotos limpos com sucesso.\n\n{message}")
         else:
             # Mostrar mensagem de erro
             self.status_updater.update_status("Erro ao limpar arquivos remotos")
             self.status_updater.update_log(message, "ERROR")
-            messagebox.showerror("Erro", f"Erro ao limpar arquivos remotos.\n\n{message}")
+            await self._ask(messagebox.showerror, "Erro", f"Erro ao limpar arquivos remotos.\n\n{message}")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from services.batch_pipeline import BatchPipeline, pair_reads
+
+class BatchDialog:
+    """Diálogo para processar várias amostras em lote (envio, montagem e download sobrepostos)"""
+    def __init__(self, parent):
+        self.parent = parent
+        self.samples = []
+        self.pipeline = None
+
+        # Criar janela
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Processamento em Lote")
+        self.dialog.geometry("800x450")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self._close)
+
+        # Centralizar no pai
+        self.dialog.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.dialog.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.dialog.winfo_height()) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """Cria os widgets do diálogo"""
+        info = ("As amostras usam os parâmetros e diretórios da tela principal, em um subdiretório por amostra. "
+                "A próxima amostra é enviada enquanto a atual é montada no servidor.")
+        ttk.Label(self.dialog, text=info, wraplength=760).pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        # Lista de amostras
+        list_frame = ttk.Frame(self.dialog)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        columns = ("sample", "read1", "read2", "status")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        self.tree.heading("sample", text="Amostra")
+        self.tree.heading("read1", text="Leitura 1")
+        self.tree.heading("read2", text="Leitura 2")
+        self.tree.heading("status", text="Estado")
+        self.tree.column("sample", width=140)
+        self.tree.column("read1", width=220)
+        self.tree.column("read2", width=220)
+        self.tree.column("status", width=160)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Botões de ação
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        self.select_button = ttk.Button(button_frame, text="Selecionar Arquivos", command=self._select_files)
+        self.select_button.pack(side=tk.LEFT, padx=5)
+        self.start_button = ttk.Button(button_frame, text="Iniciar", command=self._start)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancelar Lote", command=self._cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fechar", command=self._close).pack(side=tk.RIGHT, padx=5)
+
+    def _select_files(self):
+        """Seleciona os arquivos de leitura e os agrupa em pares R1/R2"""
+        paths = filedialog.askopenfilenames(
+            parent=self.dialog,
+            title="Selecione os arquivos de leitura (R1 e R2 de cada amostra)",
+            filetypes=[("Arquivos FASTQ", "*.fastq *.fq *.fastq.gz *.fq.gz"), ("Todos os arquivos", "*.*")]
+        )
+        if not paths:
+            return
+
+        self.samples, unpaired = pair_reads(list(paths))
+        self._refresh()
+        if unpaired:
+            names = "\n".join(os.path.basename(path) for path in unpaired)
+            messagebox.showwarning("Atenção", f"Os arquivos abaixo não formam pares R1/R2 e serão ignorados:\n\n{names}",
+                                   parent=self.dialog)
+
+    def _refresh(self):
+        """Atualiza a lista de amostras e seus estados"""
+        if not self.dialog.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for sample in self.samples:
+            status = f"{sample.status} ({sample.message})" if sample.message else sample.status
+            self.tree.insert("", tk.END, values=(sample.name, os.path.basename(sample.read1),
+                                                 os.path.basename(sample.read2), status))
+        if self.pipeline is not None and not self.pipeline.is_running():
+            self.pipeline = None
+            self.select_button.config(state=tk.NORMAL)
+            self.start_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+
+    def _on_update(self, sample):
+        """Chamado pelas threads do pipeline: repassa a atualização para a thread da interface"""
+        try:
+            self.dialog.after(0, self._refresh)
+        except (tk.TclError, RuntimeError):
+            pass
+
+    def _poll(self):
+        """Verifica periodicamente se o pipeline terminou"""
+        if self.pipeline is None or not self.dialog.winfo_exists():
+            return
+        self._refresh()
+        if self.pipeline is not None:
+            self.dialog.after(1000, self._poll)
+
+    def _start(self):
+        """Inicia o processamento em lote"""
+        if not self.samples:
+            messagebox.showwarning("Atenção", "Selecione os arquivos de leitura das amostras.", parent=self.dialog)
+            return
+
+        params = self.parent.config_frame.get_spades_params()
+        if not params["remote_dir"] or not params["output_dir"] or not params["local_output_dir"]:
+            messagebox.showwarning("Atenção", "Informe os diretórios remoto, de saída e local na tela principal.",
+                                   parent=self.dialog)
+            return
+
+        if not params["auto_tune"] and not str(params["threads"]).strip().isdigit():
+            messagebox.showwarning("Atenção", "Informe o número de threads (ou ative o ajuste automático) na tela principal.",
+                                   parent=self.dialog)
+            return
+
+        if self.parent.job_manager.job_running:
+            messagebox.showwarning("Atenção", "Já existe um job em execução.", parent=self.dialog)
+            return
+
+        # Sem conexão: conecta em segundo plano e repete o início do lote
+        if not self.parent._ensure_connected(self._start):
+            return
+
+        self.pipeline = BatchPipeline(self.parent.job_manager, params, self.samples, on_update=self._on_update)
+        self.select_button.config(state=tk.DISABLED)
+        self.start_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.pipeline.start()
+        self._poll()
+
+    def _cancel(self):
+        """Cancela o lote em andamento"""
+        if self.pipeline is not None:
+            if messagebox.askyesno("Cancelar", "Deseja cancelar o processamento em lote?", parent=self.dialog):
+                self.pipeline.cancel()
+                self.cancel_button.config(state=tk.DISABLED)
+
+    def _close(self):
+        """Fecha o diálogo (o lote continua em segundo plano se estiver em andamento)"""
+        if self.pipeline is not None and self.pipeline.is_running():
+            if not messagebox.askyesno("Fechar", "O lote continuará em segundo plano. Deseja fechar a janela?",
+                                       parent=self.dialog):
+                return
+        self.dialog.destroy()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime
+from models.job_registry import get_job_registry
+from utils.progress import format_bytes, format_duration
+
+# Estados exibidos no filtro (valores gravados pelo supervisor)
+HISTORY_STATUSES = ["", "running", "finished", "failed", "cancelled"]
+
+# Registros exibidos por consulta
+HISTORY_LIMIT = 1000
+
+class HistoryDialog:
+    """Diálogo com o histórico local de jobs (SQLite), com filtros e detalhes do job selecionado"""
+    def __init__(self, parent):
+        self.parent = parent
+        self.registry = get_job_registry()
+        self.items = {}  # item da árvore -> registro do job
+
+        # Criar janela
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Histórico de Jobs")
+        self.dialog.geometry("1000x600")
+        self.dialog.transient(parent)
+
+        # Centralizar no pai
+        self.dialog.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.dialog.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.dialog.winfo_height()) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        self.status_var = tk.StringVar()
+        self.search_var = tk.StringVar()
+        self._create_widgets()
+        self._refresh()
+
+    def _create_widgets(self):
+        """Cria os widgets do diálogo"""
+        filter_frame = ttk.Frame(self.dialog)
+        filter_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
+        ttk.Label(filter_frame, text="Estado:").pack(side=tk.LEFT)
+        status_combo = ttk.Combobox(filter_frame, textvariable=self.status_var, values=HISTORY_STATUSES,
+                                    state="readonly", width=12)
+        status_combo.pack(side=tk.LEFT, padx=5)
+        status_combo.bind("<<ComboboxSelected>>", lambda e: self._refresh())
+        ttk.Label(filter_frame, text="Buscar:").pack(side=tk.LEFT, padx=(10, 0))
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind("<Return>", lambda e: self._refresh())
+        ttk.Button(filter_frame, text="Filtrar", command=self._refresh).pack(side=tk.LEFT)
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        paned = ttk.PanedWindow(self.dialog, orient=tk.VERTICAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        list_frame = ttk.Frame(paned)
+        columns = ("submitted", "host", "output", "mode", "threads", "memory", "status", "duration", "peak", "n50")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        for column, title, width in (("submitted", "Submetido", 130), ("host", "Servidor", 110), ("output", "Saída", 230),
+                                     ("mode", "Modo", 70), ("threads", "Threads", 60), ("memory", "Memória", 70),
+                                     ("status", "Estado", 80), ("duration", "Duração", 70), ("peak", "Pico", 70),
+                                     ("n50", "N50", 80)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<<TreeviewSelect>>", self._show_details)
+        paned.add(list_frame, weight=3)
+
+        self.details = tk.Text(paned, height=10, state="disabled", wrap="word")
+        paned.add(self.details, weight=1)
+
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text="Fechar", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=5)
+
+    def _refresh(self):
+        """Consulta o histórico com os filtros atuais"""
+        jobs = self.registry.list_jobs(limit=HISTORY_LIMIT, status=self.status_var.get() or None,
+                                       search=self.search_var.get().strip() or None)
+        self.tree.delete(*self.tree.get_children())
+        self.items.clear()
+        for job in jobs:
+            item = self.tree.insert("", tk.END, values=self._row_values(job))
+            self.items[item] = job
+        self.count_label.config(text=f"{len(jobs)} jobs" + (" (mais recentes)" if len(jobs) == HISTORY_LIMIT else ""))
+
+    @staticmethod
+    def _row_values(job):
+        """Valores das colunas de um job"""
+        submitted = datetime.fromtimestamp(job["submitted_at"]).strftime("%Y-%m-%d %H:%M") if job.get("submitted_at") else ""
+        duration = ""
+        if job.get("started_at") and job.get("ended_at"):
+            duration = format_duration(job["ended_at"] - job["started_at"])
+        peak = format_bytes(job["peak_rss_kb"] * 1024) if job.get("peak_rss_kb") else ""
+        memory = f"{job['memory_gb']} GB" if job.get("memory_gb") else "padrão"
+        n50 = job["stats"].get("n50", "")
+        return (submitted, job.get("host") or "", f"{job.get('remote_dir')}/{job.get('output_dir')}", job.get("mode") or "",
+                job.get("threads") or "", memory, job.get("status") or "", duration, peak, n50)
+
+    def _show_details(self, event=None):
+        """Mostra todos os campos do job selecionado"""
+        job = self.items.get(self.tree.focus())
+        if job is None:
+            return
+        lines = [
+            f"Job: {job['job_key']}  Perfil: {job.get('profile') or '-'}  Servidor: {job.get('username')}@{job.get('host')}",
+            f"R1: {job.get('read1')}  (SHA-256 {job.get('read1_sha256') or 'desconhecido'})",
+            f"R2: {job.get('read2')}  (SHA-256 {job.get('read2_sha256') or 'desconhecido'})",
+            f"Volume de entrada: {format_bytes(job['input_bytes']) if job.get('input_bytes') else 'desconhecido'}",
+            f"SPAdes: {job.get('spades_version') or '-'}",
+            f"Comando: {job.get('command')}",
+            f"Estado: {job.get('status')}  Código de saída: {job.get('exit_code') if job.get('exit_code') is not None else '-'}",
+            f"Resultado: {job.get('result_path') or '-'}",
+        ]
+        preprocess = job["preprocess"]
+        if preprocess:
+            kept = f"  Leituras mantidas: {preprocess['reads_out']}" if preprocess.get("reads_out") is not None else ""
+            fraction = f"  Fração: {preprocess['fraction']}" if preprocess.get("fraction") is not None else ""
+            lines.append(f"Pré-processamento: {preprocess.get('method')} (alvo {preprocess.get('depth')}x){fraction}{kept}")
+        stats = job["stats"]
+        if stats:
+            lines.append(f"Sequências: {stats.get('sequences')}  Tamanho total: {stats.get('total_length')} pb  "
+                         f"Maior: {stats.get('longest')} pb  N50: {stats.get('n50')} pb")
+        self.details.config(state="normal")
+        self.details.delete(1.0, tk.END)
+        self.details.insert(tk.END, "\n".join(lines))
+        self.details.config(state="disabled")
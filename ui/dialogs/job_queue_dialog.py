@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+class JobQueueDialog:
+    """Diálogo com a fila de jobs: submissões, estado e cancelamento"""
+    def __init__(self, parent, job_queue):
+        self.parent = parent
+        self.job_queue = job_queue
+        self.items = {}  # item da árvore -> QueuedJob
+
+        # Criar janela
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Fila de Jobs")
+        self.dialog.geometry("800x400")
+        self.dialog.transient(parent)
+
+        # Centralizar no pai
+        self.dialog.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.dialog.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.dialog.winfo_height()) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        self._create_widgets()
+        self._refresh()
+
+    def _create_widgets(self):
+        """Cria os widgets do diálogo"""
+        list_frame = ttk.Frame(self.dialog)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        columns = ("id", "output", "threads", "memory", "status", "submitted")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        for column, title, width in (("id", "#", 40), ("output", "Saída", 280), ("threads", "Threads", 70),
+                                     ("memory", "Memória", 80), ("status", "Estado", 200), ("submitted", "Submetido", 120)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text="Adicionar Job Atual", command=self._submit_current).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancelar Job", command=self._cancel_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fechar", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=5)
+
+    def _refresh(self):
+        """Atualiza a lista periodicamente enquanto o diálogo estiver aberto"""
+        if not self.dialog.winfo_exists():
+            return
+        selected = self.items.get(self.tree.focus())
+        self.tree.delete(*self.tree.get_children())
+        self.items.clear()
+        for job in self.job_queue.list_jobs():
+            status, message, _ = self.job_queue.snapshot(job)
+            status = f"{status} ({message})" if message else status
+            memory = f"{job.memory_gb} GB" if job.memory_gb else "padrão"
+            item = self.tree.insert("", tk.END, values=(job.queue_id, f"{job.remote_dir}/{job.output_dir}", job.threads or "auto",
+                                                        memory, status, job.submitted_at.strftime("%H:%M:%S")))
+            self.items[item] = job
+            if job is selected:
+                self.tree.focus(item)
+                self.tree.selection_set(item)
+        self.dialog.after(2000, self._refresh)
+
+    def _submit_current(self):
+        """Adiciona à fila um job com os parâmetros atuais da tela principal"""
+        self.parent._enqueue_job(self.parent.config_frame.get_spades_params())
+
+    def _cancel_selected(self):
+        """Cancela o job selecionado"""
+        job = self.items.get(self.tree.focus())
+        if job is None:
+            messagebox.showwarning("Atenção", "Selecione um job.", parent=self.dialog)
+            return
+        if not messagebox.askyesno("Cancelar", f"Deseja cancelar o job #{job.queue_id}?", parent=self.dialog):
+            return
+        if not self.job_queue.cancel(job):
+            messagebox.showerror("Erro", f"Não foi possível cancelar o job #{job.queue_id}.", parent=self.dialog)
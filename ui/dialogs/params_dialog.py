@@ -4,6 +4,7 @@
 import tkinter as tk
 from tkinter import ttk
 from config.settings import SPADES_MODES
+from services.read_prep import NORMALIZATION_METHODS, validate_normalization
 
 class SPAdesParamsDialog:
     """Diálogo para configurações avançadas do SPAdes"""
@@ -37,6 +38,12 @@ class SPAdesParamsDialog:
         self.only_assembler = tk.BooleanVar(value=False)
         self.careful = tk.BooleanVar(value=self.mode.get() == "careful")
         
+        # Pré-processamento das leituras
+        self.normalize = tk.BooleanVar(value=bool(self.config_frame.normalize_method.get()))
+        self.normalize_method = tk.StringVar(value=self.config_frame.normalize_method.get() or NORMALIZATION_METHODS[0])
+        self.normalize_depth = tk.StringVar(value=self.config_frame.normalize_depth.get())
+        self.genome_size = tk.StringVar(value=self.config_frame.genome_size.get())
+        
         # Criar notebook para organizar os parâmetros
         self._create_notebook()
         
@@ -55,10 +62,12 @@ class SPAdesParamsDialog:
         # Abas
         basic_tab = ttk.Frame(notebook, padding=10)
         advanced_tab = ttk.Frame(notebook, padding=10)
+        prep_tab = ttk.Frame(notebook, padding=10)
         help_tab = ttk.Frame(notebook, padding=10)
         
         notebook.add(basic_tab, text="Básico")
         notebook.add(advanced_tab, text="Avançado")
+        notebook.add(prep_tab, text="Pré-processamento")
         notebook.add(help_tab, text="Ajuda")
         
         # Preencher aba básica
@@ -67,6 +76,9 @@ class SPAdesParamsDialog:
         # Preencher aba avançada
         self._setup_advanced_tab(advanced_tab)
         
+        # Preencher aba de pré-processamento
+        self._setup_prep_tab(prep_tab)
+        
         # Preencher aba de ajuda
         self._setup_help_tab(help_tab)
         
@@ -221,6 +233,46 @@ Nota: As opções "Apenas correção de erros" e "Apenas montagem" são mutuamen
         
         ttk.Label(info_frame, text=info_text, justify=tk.LEFT, wraplength=550).pack(anchor=tk.W, padx=5, pady=5)
         
+    def _setup_prep_tab(self, parent):
+        """Configura a aba de normalização/subamostragem das leituras"""
+        ttk.Checkbutton(
+            parent,
+            text="Reduzir a cobertura das leituras antes da montagem",
+            variable=self.normalize
+        ).grid(row=0, column=0, columnspan=3, sticky=tk.W, padx=5, pady=10)
+        
+        ttk.Label(parent, text="Método:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Combobox(parent, textvariable=self.normalize_method, state="readonly", width=15,
+                     values=NORMALIZATION_METHODS).grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
+        ttk.Label(parent, text="bbnorm: normalização digital; seqtk: subamostragem aleatória").grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Label(parent, text="Profundidade alvo:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(parent, textvariable=self.normalize_depth, width=10).grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
+        ttk.Label(parent, text="Cobertura desejada (ex: 100)").grid(row=2, column=2, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Label(parent, text="Tamanho do genoma (Mb):").grid(row=3, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(parent, textvariable=self.genome_size, width=10).grid(row=3, column=1, sticky=tk.W, padx=5, pady=5)
+        ttk.Label(parent, text="Necessário para o seqtk (ex: 5 para E. coli)").grid(row=3, column=2, sticky=tk.W, padx=5, pady=5)
+        
+        info_frame = ttk.LabelFrame(parent, text="Informações")
+        info_frame.grid(row=4, column=0, columnspan=3, sticky=tk.W, padx=5, pady=10)
+        
+        info_text = """
+Isolados com cobertura muito alta (500x ou mais) deixam o SPAdes lento e com alto
+consumo de memória, sem ganho de qualidade. As leituras são reduzidas no servidor,
+antes da montagem, para a profundidade alvo:
+
+- bbnorm (BBTools): remove leituras redundantes mantendo regiões de baixa cobertura;
+  usa as threads e a memória do job
+- seqtk: sorteia uma fração dos pares (R1 e R2 em paralelo), calculada pelo
+  tamanho do genoma e pelo total de bases das leituras
+
+As leituras reduzidas ficam em <saída>_reads no diretório remoto, e o resultado
+(fração e número de leituras mantidas) é registrado no histórico do job.
+        """
+        
+        ttk.Label(info_frame, text=info_text, justify=tk.LEFT, wraplength=600).pack(anchor=tk.W, padx=5, pady=5)
+        
     def _setup_help_tab(self, parent):
         """Configura a aba de ajuda"""
         # Informações de ajuda
@@ -316,11 +368,25 @@ http://cab.spbu.ru/files/release3.15.5/manual.html
             tk.messagebox.showerror("Erro", "As opções 'Apenas correção de erros' e 'Apenas montagem' são mutuamente exclusivas.")
             return
             
+        # Validar normalização
+        if self.normalize.get():
+            error = validate_normalization({
+                "method": self.normalize_method.get(),
+                "depth": self.normalize_depth.get().strip(),
+                "genome_size_mb": self.genome_size.get().strip() or None
+            })
+            if error:
+                tk.messagebox.showerror("Erro", error)
+                return
+            
         # Salvar parâmetros básicos
         self.config_frame.threads.set(self.threads.get())
         self.config_frame.memory.set(self.memory.get())
         self.config_frame.mode.set(self.mode.get())
         self.config_frame.kmer.set(self.kmer.get())
+        self.config_frame.normalize_method.set(self.normalize_method.get() if self.normalize.get() else "")
+        self.config_frame.normalize_depth.set(self.normalize_depth.get().strip())
+        self.config_frame.genome_size.set(self.genome_size.get().strip())
         
         # Fechar diálogo
         self.dialog.destroy()
\ No newline at end of file
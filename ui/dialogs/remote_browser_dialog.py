@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import posixpath
+from datetime import datetime
+import tkinter as tk
+from tkinter import ttk, messagebox
+from services.remote_browser import RemoteBrowser, make_remote_read
+from utils.progress import format_bytes
+
+class RemoteBrowserDialog:
+    """Diálogo para escolher leituras R1/R2 que já estão no servidor"""
+    def __init__(self, parent, job_manager, on_select, start_dir="~"):
+        """
+        Args:
+            parent: Janela principal
+            job_manager: JobManager conectado
+            on_select: Função chamada com (leitura_r1, leitura_r2) no formato de remote_browser
+            start_dir: Diretório remoto inicial
+        """
+        self.parent = parent
+        self.on_select = on_select
+        self.browser = RemoteBrowser(job_manager.link)
+        self.current_dir = None
+        self.page = 0
+        self.entries = {}  # item da árvore -> RemoteEntry
+        self.read1 = None
+        self.read2 = None
+
+        # Criar janela
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Leituras no Servidor")
+        self.dialog.geometry("750x500")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self._close)
+
+        # Centralizar no pai
+        self.dialog.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.dialog.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.dialog.winfo_height()) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        self.path_var = tk.StringVar(value=start_dir)
+        self.read1_var = tk.StringVar(value="R1: (não selecionado)")
+        self.read2_var = tk.StringVar(value="R2: (não selecionado)")
+        self._create_widgets()
+        self._open(start_dir)
+
+    def _create_widgets(self):
+        """Cria os widgets do diálogo"""
+        path_frame = ttk.Frame(self.dialog)
+        path_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
+        ttk.Button(path_frame, text="Acima", command=self._go_up).pack(side=tk.LEFT)
+        path_entry = ttk.Entry(path_frame, textvariable=self.path_var)
+        path_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        path_entry.bind("<Return>", lambda e: self._open(self.path_var.get()))
+        ttk.Button(path_frame, text="Ir", command=lambda: self._open(self.path_var.get())).pack(side=tk.LEFT)
+        ttk.Button(path_frame, text="Atualizar", command=lambda: self._open(self.current_dir, refresh=True)).pack(side=tk.LEFT, padx=5)
+
+        # Listagem
+        list_frame = ttk.Frame(self.dialog)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree = ttk.Treeview(list_frame, columns=("name", "size", "modified"), show="headings")
+        self.tree.heading("name", text="Nome")
+        self.tree.heading("size", text="Tamanho")
+        self.tree.heading("modified", text="Modificado")
+        self.tree.column("name", width=400)
+        self.tree.column("size", width=100, anchor=tk.E)
+        self.tree.column("modified", width=150)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+        self.more_button = ttk.Button(self.dialog, text="Carregar mais", command=self._load_more, state=tk.DISABLED)
+        self.more_button.pack(pady=5)
+
+        # Seleção de R1/R2
+        selection_frame = ttk.Frame(self.dialog)
+        selection_frame.pack(fill=tk.X, padx=10)
+        ttk.Label(selection_frame, textvariable=self.read1_var).pack(anchor=tk.W)
+        ttk.Label(selection_frame, textvariable=self.read2_var).pack(anchor=tk.W)
+
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(button_frame, text="Usar como R1", command=lambda: self._choose(1)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Usar como R2", command=lambda: self._choose(2)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="OK", command=self._confirm).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Cancelar", command=self._close).pack(side=tk.RIGHT, padx=5)
+
+    def _run_in_background(self, work, on_done):
+        """Executa uma consulta ao servidor em thread separada e entrega o resultado à interface"""
+        def _target():
+            try:
+                result, error = work(), None
+            except Exception as e:
+                result, error = None, e
+            try:
+                self.dialog.after(0, lambda: on_done(result, error))
+            except (tk.TclError, RuntimeError):
+                pass
+        threading.Thread(target=_target, daemon=True).start()
+
+    def _open(self, path, refresh=False):
+        """Abre um diretório remoto (primeira página)"""
+        if not path:
+            return
+        self.dialog.config(cursor="watch")
+
+        def _work():
+            directory = self.browser.normalize(path)
+            return directory, self.browser.list_page(directory, 0, refresh)
+
+        def _done(result, error):
+            self.dialog.config(cursor="")
+            if error is not None:
+                messagebox.showerror("Erro", f"Não foi possível listar {path}:\n{str(error)}", parent=self.dialog)
+                return
+            directory, (entries, has_more) = result
+            self.current_dir = directory
+            self.path_var.set(directory)
+            self.page = 0
+            self.tree.delete(*self.tree.get_children())
+            self.entries.clear()
+            self._show_page(entries, has_more)
+
+        self._run_in_background(_work, _done)
+
+    def _load_more(self):
+        """Carrega a próxima página do diretório atual"""
+        directory, page = self.current_dir, self.page + 1
+        self.more_button.config(state=tk.DISABLED)
+
+        def _done(result, error):
+            if error is not None:
+                messagebox.showerror("Erro", f"Não foi possível listar {directory}:\n{str(error)}", parent=self.dialog)
+                return
+            if directory != self.current_dir:
+                return
+            self.page = page
+            self._show_page(*result)
+
+        self._run_in_background(lambda: self.browser.list_page(directory, page), _done)
+
+    def _show_page(self, entries, has_more):
+        """Acrescenta uma página de entradas à listagem"""
+        for entry in entries:
+            name = entry.name + ("/" if entry.is_dir else "")
+            size = "" if entry.is_dir else format_bytes(entry.size)
+            modified = datetime.fromtimestamp(entry.mtime).strftime("%Y-%m-%d %H:%M") if entry.mtime else ""
+            item = self.tree.insert("", tk.END, values=(name, size, modified))
+            self.entries[item] = entry
+        self.more_button.config(state=tk.NORMAL if has_more else tk.DISABLED)
+
+    def _go_up(self):
+        """Abre o diretório pai"""
+        if self.current_dir and self.current_dir != "/":
+            self._open(posixpath.dirname(self.current_dir.rstrip("/")) or "/")
+
+    def _on_double_click(self, event):
+        """Entra em diretórios (inclusive links para diretórios)"""
+        entry = self.entries.get(self.tree.focus())
+        if entry is None:
+            return
+        if entry.is_dir:
+            self._open(entry.path)
+        elif entry.is_link:
+            self._run_in_background(
+                lambda: self.browser.is_directory(entry.path),
+                lambda is_dir, error: self._open(entry.path) if is_dir else None
+            )
+
+    def _choose(self, mate):
+        """Marca o arquivo selecionado como R1 ou R2"""
+        entry = self.entries.get(self.tree.focus())
+        if entry is None or entry.is_dir:
+            messagebox.showwarning("Atenção", "Selecione um arquivo de leitura.", parent=self.dialog)
+            return
+        if mate == 1:
+            self.read1 = entry.path
+            self.read1_var.set(f"R1: {entry.path}")
+        else:
+            self.read2 = entry.path
+            self.read2_var.set(f"R2: {entry.path}")
+
+    def _confirm(self):
+        """Confirma a seleção de R1 e R2"""
+        if not self.read1 or not self.read2:
+            messagebox.showwarning("Atenção", "Selecione os arquivos R1 e R2.", parent=self.dialog)
+            return
+        self.on_select(make_remote_read(self.read1), make_remote_read(self.read2))
+        self._close()
+
+    def _close(self):
+        """Fecha o diálogo e o canal SFTP do navegador"""
+        self.browser.close()
+        self.dialog.destroy()
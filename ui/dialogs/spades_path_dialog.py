@@ -119,7 +119,7 @@ class SpadesPathDialog:
                 version = stdout.read().decode().strip()
                 
                 if "SPAdes" in version:
-                    self.job_manager.spades_path = path
+                    self.job_manager.set_spades_path(path, version)
                     self.status_updater.update_log(f"SPAdes encontrado: {path}", "SUCCESS")
                     self.status_updater.update_log(f"Versão do SPAdes: {version}", "SUCCESS")
                     self.result = True
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from services.param_sweep import ParamSweep, parse_grid, build_variants, SWEEP_BEST
+
+class SweepDialog:
+    """Diálogo da varredura de parâmetros: grade de k-mers, modos e cutoffs, com a melhor montagem destacada"""
+    def __init__(self, parent):
+        self.parent = parent
+        self.sweep = None
+        self.variants = []
+        params = parent.config_frame.get_spades_params()
+
+        # Criar janela
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Varredura de Parâmetros")
+        self.dialog.geometry("900x500")
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self._close)
+
+        # Centralizar no pai
+        self.dialog.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.dialog.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.dialog.winfo_height()) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        self.kmer_sets = tk.StringVar(value=params["kmer"] or "21,33,55; 21,33,55,77")
+        self.modes = tk.StringVar(value=params["mode"] or "isolate")
+        self.cov_cutoffs = tk.StringVar(value="auto, off")
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """Cria os widgets do diálogo"""
+        info = ("As variantes usam as leituras, diretórios, threads e memória da tela principal e são iniciadas pela "
+                "fila de jobs conforme os recursos livres do servidor. A variante com maior N50 (desempate pelo tamanho "
+                "total) é mantida; as demais têm os diretórios intermediários removidos.")
+        ttk.Label(self.dialog, text=info, wraplength=860).pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        grid_frame = ttk.LabelFrame(self.dialog, text="Grade", padding=5)
+        grid_frame.pack(fill=tk.X, padx=10, pady=5)
+        for row, (label, var, hint) in enumerate((
+            ("Conjuntos de k-mers:", self.kmer_sets, "separados por ';' (vazio = padrão do SPAdes)"),
+            ("Modos:", self.modes, "separados por vírgula (ex: isolate, careful)"),
+            ("Cutoffs de cobertura:", self.cov_cutoffs, "auto, off ou números, separados por vírgula"),
+        )):
+            ttk.Label(grid_frame, text=label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=3)
+            ttk.Entry(grid_frame, textvariable=var, width=40).grid(row=row, column=1, sticky=tk.W, padx=5, pady=3)
+            ttk.Label(grid_frame, text=hint).grid(row=row, column=2, sticky=tk.W, padx=5, pady=3)
+
+        list_frame = ttk.Frame(self.dialog)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        columns = ("index", "output", "kmer", "mode", "cov", "status")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        for column, title, width in (("index", "#", 40), ("output", "Saída", 260), ("kmer", "K-mers", 120),
+                                     ("mode", "Modo", 80), ("cov", "Cutoff", 60), ("status", "Estado", 300)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width)
+        self.tree.tag_configure("best", background="#d8f0d8")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.start_button = ttk.Button(button_frame, text="Iniciar Varredura", command=self._start)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancelar Varredura", command=self._cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fechar", command=self._close).pack(side=tk.RIGHT, padx=5)
+
+    def _refresh(self):
+        """Atualiza a lista de variantes e seus estados"""
+        if not self.dialog.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for variant in self.variants:
+            status = f"{variant.status} ({variant.message})" if variant.message else variant.status
+            self.tree.insert("", tk.END, values=(variant.index, variant.output_dir, variant.kmer or "padrão",
+                                                 variant.mode, variant.cov_cutoff, status),
+                             tags=("best",) if variant.status == SWEEP_BEST else ())
+        if self.sweep is not None and not self.sweep.is_running():
+            self.sweep = None
+            self.start_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+
+    def _on_update(self, variant):
+        """Chamado pela thread da varredura: repassa a atualização para a thread da interface"""
+        try:
+            self.dialog.after(0, self._refresh)
+        except (tk.TclError, RuntimeError):
+            pass
+
+    def _poll(self):
+        """Verifica periodicamente se a varredura terminou"""
+        if self.sweep is None or not self.dialog.winfo_exists():
+            return
+        self._refresh()
+        if self.sweep is not None:
+            self.dialog.after(2000, self._poll)
+
+    def _start(self):
+        """Monta a grade e submete as variantes à fila"""
+        params = self.parent.config_frame.get_spades_params()
+        if not params["remote_dir"] or not params["output_dir"] or (not params["threads"] and not params["auto_tune"]):
+            messagebox.showwarning("Atenção", "Informe o diretório remoto, a pasta de saída e as threads (ou ative o ajuste "
+                                   "automático) na tela principal.", parent=self.dialog)
+            return
+        try:
+            kmers, modes, cutoffs = parse_grid(self.kmer_sets.get(), self.modes.get(), self.cov_cutoffs.get())
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e), parent=self.dialog)
+            return
+
+        # Sem conexão: conecta em segundo plano e repete o início da varredura
+        if not self.parent._ensure_connected(self._start):
+            return
+
+        variants = build_variants(kmers, modes, cutoffs, params["output_dir"])
+        if not messagebox.askyesno("Varredura", f"Serão montadas {len(variants)} variantes em "
+                                   f"{params['remote_dir']}. Deseja continuar?", parent=self.dialog):
+            return
+
+        self.variants = variants
+        self.sweep = ParamSweep(self.parent.job_queue, params, variants, on_update=self._on_update)
+        self.start_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.sweep.start()
+        self._poll()
+
+    def _cancel(self):
+        """Cancela a varredura em andamento"""
+        if self.sweep is not None:
+            if messagebox.askyesno("Cancelar", "Deseja cancelar a varredura e os jobs das variantes?", parent=self.dialog):
+                self.sweep.cancel()
+                self.cancel_button.config(state=tk.DISABLED)
+
+    def _close(self):
+        """Fecha o diálogo (a varredura continua em segundo plano se estiver em andamento)"""
+        if self.sweep is not None and self.sweep.is_running():
+            if not messagebox.askyesno("Fechar", "A varredura continuará em segundo plano. Deseja fechar a janela?",
+                                       parent=self.dialog):
+                return
+        self.dialog.destroy()
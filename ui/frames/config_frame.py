@@ -4,8 +4,12 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import os
+import threading
 from config.settings import DEFAULT_PORT, DEFAULT_THREADS, DEFAULT_MODE, DEFAULT_REMOTE_DIR, DEFAULT_OUTPUT_DIR
 from ui.dialogs.profile_dialog import ProfileDialog, ProfileManagerDialog
+from utils.hash_index import get_hash_index
+from utils.fastq_validator import get_fastq_validator
+from services.read_prep import DEFAULT_TARGET_DEPTH
 
 class ConfigFrame(ttk.Frame):
     """Frame para configuração do servidor e arquivos"""
@@ -40,6 +44,15 @@ class ConfigFrame(ttk.Frame):
         self.memory = tk.StringVar(value="")
         self.mode = tk.StringVar(value=DEFAULT_MODE)
         self.kmer = tk.StringVar(value="")
+        self.compress_upload = tk.BooleanVar(value=False)
+        self.auto_tune = tk.BooleanVar(value=False)
+        self.backend = tk.StringVar(value="direct")
+        self.fast_scratch = tk.BooleanVar(value=False)
+        
+        # Normalização das leituras antes da montagem (configurada em Parâmetros Avançados)
+        self.normalize_method = tk.StringVar(value="")  # vazio = desativada
+        self.normalize_depth = tk.StringVar(value=str(DEFAULT_TARGET_DEPTH))
+        self.genome_size = tk.StringVar(value="")
         
         # Criar interface
         self._create_widgets()
@@ -188,10 +201,18 @@ class ConfigFrame(ttk.Frame):
         ttk.Entry(local_frame, textvariable=self.local_output_dir).pack(side="left", fill="x", expand=True)
         ttk.Button(local_frame, text="Procurar", command=self._browse_local_dir).pack(side="left", padx=5)
         
-        # Botão para selecionar arquivos R1 e R2 juntos
-        ttk.Button(files_frame, text="Selecionar Arquivos R1/R2", command=self._browse_reads).grid(
-            row=5, column=0, columnspan=2, pady=10
-        )
+        # Botões para selecionar arquivos R1 e R2 juntos (locais ou já no servidor)
+        reads_buttons = ttk.Frame(files_frame)
+        reads_buttons.grid(row=5, column=0, columnspan=2, pady=10)
+        ttk.Button(reads_buttons, text="Selecionar Arquivos R1/R2", command=self._browse_reads).pack(side="left", padx=5)
+        ttk.Button(reads_buttons, text="Leituras no Servidor", command=self._browse_remote_reads).pack(side="left", padx=5)
+        
+        # Compressão durante o envio (apenas para .fastq/.fq não comprimidos)
+        ttk.Checkbutton(
+            files_frame, 
+            text="Comprimir leituras durante o envio (.fastq.gz)", 
+            variable=self.compress_upload
+        ).grid(row=6, column=0, columnspan=2, sticky="w", padx=5, pady=5)
     
     def _create_params_frame(self):
         """Cria frame de parâmetros do SPAdes"""
@@ -227,6 +248,29 @@ class ConfigFrame(ttk.Frame):
         
         ttk.Entry(kmer_frame, textvariable=self.kmer, width=15).pack(side="left")
         ttk.Label(kmer_frame, text="Ex: 21,33,55,77").pack(side="left", padx=5)
+        
+        # Ajuste automático de -t e -m
+        ttk.Checkbutton(
+            params_frame,
+            text="Ajustar threads e memória automaticamente (recursos do servidor e tamanho das leituras)",
+            variable=self.auto_tune
+        ).grid(row=2, column=0, columnspan=4, sticky="w", padx=5, pady=5)
+        
+        # Backend de execução (servidor conectado ou escalonador de cluster)
+        ttk.Label(params_frame, text="Execução:").grid(row=3, column=0, sticky="w", padx=5, pady=5)
+        
+        from services.backends import BACKENDS
+        ttk.Combobox(params_frame, textvariable=self.backend, state="readonly", values=list(BACKENDS),
+                     width=15).grid(row=3, column=1, sticky="w", padx=5, pady=5)
+        ttk.Label(params_frame, text="direct: no servidor; slurm/pbs: submetido ao cluster").grid(
+            row=3, column=2, columnspan=2, sticky="w", padx=5, pady=5)
+        
+        # Área temporária do SPAdes (--tmp-dir) no armazenamento mais rápido do servidor
+        ttk.Checkbutton(
+            params_frame,
+            text="Usar o diretório temporário mais rápido do servidor (SSD local, /dev/shm, $TMPDIR)",
+            variable=self.fast_scratch
+        ).grid(row=4, column=0, columnspan=4, sticky="w", padx=5, pady=5)
     
     def _load_server_profiles(self):
         """Carrega a lista de perfis de servidor"""
@@ -343,6 +387,52 @@ class ConfigFrame(ttk.Frame):
             )
             if r2:
                 self.read2_path.set(r2)
+                
+        # Calcular os hashes em segundo plano, para que estejam prontos antes do envio
+        get_hash_index().prefetch([self.read1_path.get(), self.read2_path.get()])
+        
+        # Validar o par localmente antes do envio (em segundo plano)
+        read1, read2 = self.read1_path.get(), self.read2_path.get()
+        if read1 and read2 and os.path.isfile(read1) and os.path.isfile(read2):
+            threading.Thread(target=self._validate_reads, args=(read1, read2), daemon=True).start()
+            
+    def _validate_reads(self, read1, read2):
+        """Valida a estrutura e o pareamento de R1/R2 e registra o perfil das leituras"""
+        self.status_updater.update_log("Validando arquivos de leitura...")
+        try:
+            result = get_fastq_validator().validate_pair(read1, read2)
+        except Exception as e:
+            self.status_updater.update_log(f"Não foi possível validar os arquivos de leitura: {str(e)}", "WARNING")
+            return
+            
+        for label, path, summary in zip(("R1", "R2"), (read1, read2), result["summaries"]):
+            if summary["reads"]:
+                self.status_updater.update_log(
+                    f"{label} ({os.path.basename(path)}): {summary['reads']} leituras, "
+                    f"comprimento {summary['min_length']}-{summary['max_length']} (média {summary['mean_length']:.1f}), "
+                    f"qualidade média {summary['mean_quality']:.1f}, Q30 {summary['q30']:.1f}%, phred+{summary['phred_offset']}"
+                )
+                
+        if result["valid"]:
+            self.status_updater.update_log("Arquivos de leitura válidos e pareados", "SUCCESS")
+        else:
+            for problem in result["problems"]:
+                self.status_updater.update_log(f"Problema nos arquivos de leitura: {problem}", "ERROR")
+    
+    def _browse_remote_reads(self):
+        """Solicita à classe principal (que tem acesso ao servidor) a seleção de leituras remotas"""
+        self.event_generate("<<BrowseRemoteReads>>")
+        
+    def set_remote_reads(self, read1, read2):
+        """Preenche R1/R2 com leituras que já estão no servidor"""
+        self.read1_path.set(read1)
+        self.read2_path.set(read2)
+        self.status_updater.update_log("Leituras do servidor selecionadas: serão ligadas ao diretório remoto, sem envio")
+    
+    def set_resources(self, threads, memory):
+        """Preenche threads e memória (GB) escolhidas pelo ajuste automático"""
+        self.threads.set(str(threads))
+        self.memory.set(str(memory))
     
     def _browse_local_dir(self):
         """Abre diálogo para selecionar diretório local para resultados"""
@@ -438,5 +528,20 @@ class ConfigFrame(ttk.Frame):
             "threads": self.threads.get().strip(),
             "memory": self.memory.get().strip(),
             "mode": self.mode.get(),
-            "kmer": self.kmer.get().strip()
+            "kmer": self.kmer.get().strip(),
+            "compress_upload": self.compress_upload.get(),
+            "auto_tune": self.auto_tune.get(),
+            "backend": self.backend.get() or "direct",
+            "fast_scratch": self.fast_scratch.get(),
+            "normalization": self.get_normalization()
+        }
+        
+    def get_normalization(self):
+        """Retorna os parâmetros de normalização das leituras ou None se desativada"""
+        if not self.normalize_method.get():
+            return None
+        return {
+            "method": self.normalize_method.get(),
+            "depth": self.normalize_depth.get().strip(),
+            "genome_size_mb": self.genome_size.get().strip() or None
         }
\ No newline at end of file
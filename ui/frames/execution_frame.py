@@ -408,8 +408,11 @@ class ExecutionFrame(ttk.Frame):
         # Obter uso de recursos via SSH
         if self.job_manager.ssh and self.job_manager.job_running:
             try:
+                # Preferir as métricas enviadas pelo agente remoto (sem novos canais SSH)
+                snapshot = self.job_manager.get_monitor_snapshot()
+                
                 # Obter informações de todos os processos do usuário
-                process_info = self.job_manager.get_user_processes()
+                process_info = snapshot if snapshot else self.job_manager.get_user_processes()
                 if process_info:
                     # Atualizar uso de CPU (todos os processos SPAdes)
                     spades_cpu = process_info['spades_cpu']
@@ -441,17 +444,24 @@ class ExecutionFrame(ttk.Frame):
                         ))
                 
                 # Verificar fase atual do SPAdes
-                if self.job_manager.job_output_file:
-                    stdin, stdout, stderr = self.job_manager.ssh.exec_command(
-                        f"grep -E '(===|Stage)' {self.job_manager.job_output_file} | tail -n 1"
-                    )
-                    phase = stdout.read().decode().strip()
-                    if phase:
+                if snapshot:
+                    # A fase e as novas linhas do log já chegam pelo agente
+                    phase = snapshot.get('stage')
+                    if phase and phase != self.current_phase_var.get():
                         self.current_phase_var.set(phase)
                         self._add_to_log(f"Fase atual: {phase}", "PHASE")
-                
-                # Atualizar também o status do job
-                self.update_job_status()
+                else:
+                    if self.job_manager.job_output_file:
+                        stdin, stdout, stderr = self.job_manager.ssh.exec_command(
+                            f"grep -E '(===|Stage)' {self.job_manager.job_output_file} | tail -n 1"
+                        )
+                        phase = stdout.read().decode().strip()
+                        if phase:
+                            self.current_phase_var.set(phase)
+                            self._add_to_log(f"Fase atual: {phase}", "PHASE")
+                    
+                    # Atualizar também o status do job
+                    self.update_job_status()
             
             except Exception as e:
                 self._add_to_log(f"Erro ao atualizar métricas: {str(e)}", "ERROR")
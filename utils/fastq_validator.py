@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# NumPy (listado em requirements.txt) acelera a contagem de comprimentos e qualidades;
+# sem ele, a validação usa a contagem em Python puro
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Registros FASTQ lidos por bloco
+VALIDATION_CHUNK_RECORDS = 200000
+
+# Quantidade de nomes de leitura conferidos entre R1 e R2
+PAIR_NAME_SAMPLE = 1000
+
+# Máximo de erros registrados por arquivo (a leitura para ao atingir o limite)
+MAX_REPORTED_ERRORS = 5
+
+def _open_fastq(path):
+    """Abre um FASTQ (comprimido ou não) para leitura binária"""
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb", buffering=4 * 1024 * 1024)
+
+def _read_name(header):
+    """Nome da leitura sem o '@', sem comentários e sem o sufixo /1 ou /2"""
+    name = header[1:].split(None, 1)[0] if len(header) > 1 else b""
+    if name.endswith((b"/1", b"/2")):
+        name = name[:-2]
+    return name
+
+def _count_chunk(lengths, qualities, length_counts, quality_counts):
+    """Acumula os histogramas de comprimento e de qualidade de um bloco de registros"""
+    if np is not None:
+        length_hist = np.bincount(np.fromiter(lengths, dtype=np.int64, count=len(lengths)))
+        quality_hist = np.bincount(np.frombuffer(b"".join(qualities), dtype=np.uint8), minlength=256)
+        for length in np.nonzero(length_hist)[0]:
+            length_counts[int(length)] = length_counts.get(int(length), 0) + int(length_hist[length])
+        for i in range(256):
+            quality_counts[i] += int(quality_hist[i])
+        return
+
+    for length in lengths:
+        length_counts[length] = length_counts.get(length, 0) + 1
+    joined = b"".join(qualities)
+    for i in range(33, 127):
+        quality_counts[i] += joined.count(bytes((i,)))
+
+def profile_fastq(path, chunk_records=VALIDATION_CHUNK_RECORDS):
+    """
+    Lê um FASTQ em blocos, valida a estrutura dos registros e calcula o perfil de leituras
+
+    Executado nos processos do pool (um arquivo por processo).
+
+    Args:
+        path: Caminho do arquivo FASTQ (.fastq ou .fastq.gz)
+        chunk_records: Registros por bloco
+
+    Returns:
+        dict: records, errors, names (amostra dos primeiros nomes), length_counts, quality_counts
+    """
+    errors = []
+    names = []
+    length_counts = {}
+    quality_counts = [0] * 256
+    records = 0
+
+    try:
+        with _open_fastq(path) as f:
+            while len(errors) < MAX_REPORTED_ERRORS:
+                lengths = []
+                qualities = []
+                for _ in range(chunk_records):
+                    header = f.readline()
+                    if not header:
+                        break
+                    seq = f.readline().rstrip(b"\r\n")
+                    plus = f.readline()
+                    qual = f.readline().rstrip(b"\r\n")
+                    records += 1
+                    if not plus:
+                        errors.append(f"Registro {records} incompleto (arquivo truncado?)")
+                        break
+                    if not header.startswith(b"@") or not plus.startswith(b"+"):
+                        errors.append(f"Registro {records}: cabeçalho inválido ({header[:40].decode(errors='replace').strip()})")
+                        if len(errors) >= MAX_REPORTED_ERRORS:
+                            break
+                        continue
+                    if len(seq) != len(qual):
+                        errors.append(f"Registro {records}: sequência e qualidade com tamanhos diferentes ({len(seq)} x {len(qual)})")
+                        if len(errors) >= MAX_REPORTED_ERRORS:
+                            break
+                        continue
+                    if len(names) < PAIR_NAME_SAMPLE:
+                        names.append(_read_name(header.rstrip(b"\r\n")))
+                    lengths.append(len(seq))
+                    qualities.append(qual)
+                if lengths:
+                    _count_chunk(lengths, qualities, length_counts, quality_counts)
+                if not header:
+                    break
+    except (EOFError, OSError, gzip.BadGzipFile) as e:
+        errors.append(f"Erro de leitura após {records} registros (arquivo truncado ou corrompido?): {str(e)}")
+
+    return {
+        "path": path,
+        "records": records,
+        "errors": errors,
+        "names": names,
+        "length_counts": length_counts,
+        "quality_counts": quality_counts,
+    }
+
+def summarize_profile(profile):
+    """
+    Resume o perfil de um arquivo: comprimentos, qualidade média, %Q30 e codificação phred
+
+    Returns:
+        dict: Resumo com min_length, max_length, mean_length, mean_quality, q30, phred_offset
+    """
+    lengths = profile["length_counts"]
+    reads = sum(lengths.values())
+    summary = {"reads": reads, "min_length": 0, "max_length": 0, "mean_length": 0.0,
+               "mean_quality": 0.0, "q30": 0.0, "phred_offset": None}
+    if not reads:
+        return summary
+    summary["min_length"] = min(lengths)
+    summary["max_length"] = max(lengths)
+    summary["mean_length"] = sum(length * count for length, count in lengths.items()) / reads
+
+    counts = profile["quality_counts"]
+    present = [i for i in range(256) if counts[i]]
+    if present:
+        # Caracteres abaixo de ';' só existem na codificação phred+33
+        offset = 33 if present[0] < 59 else 64
+        bases = sum(counts)
+        summary["phred_offset"] = offset
+        summary["mean_quality"] = sum((i - offset) * counts[i] for i in present) / bases
+        summary["q30"] = 100.0 * sum(counts[i] for i in present if i - offset >= 30) / bases
+    return summary
+
+def compare_pair(profile1, profile2):
+    """
+    Confere se dois perfis formam um par R1/R2 consistente
+
+    Returns:
+        list: Problemas encontrados (vazia se o par é consistente)
+    """
+    problems = []
+    if profile1["records"] != profile2["records"]:
+        problems.append(f"R1 tem {profile1['records']} leituras e R2 tem {profile2['records']}")
+    for position, (name1, name2) in enumerate(zip(profile1["names"], profile2["names"])):
+        if name1 != name2:
+            problems.append(f"Leitura {position + 1} com nomes diferentes: "
+                            f"{name1.decode(errors='replace')} x {name2.decode(errors='replace')}")
+            break
+    return problems
+
+class FastqValidator:
+    """Validação local do par de leituras antes do envio, com um processo por arquivo"""
+    def __init__(self, max_workers=2):
+        """
+        Inicializa o validador
+
+        Args:
+            max_workers: Número de processos (um por arquivo do par)
+        """
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def validate_pair(self, read1, read2):
+        """
+        Valida R1 e R2 em paralelo e confere o pareamento
+
+        Args:
+            read1: Caminho do arquivo R1
+            read2: Caminho do arquivo R2
+
+        Returns:
+            dict: valid (bool), problems (lista), summaries (resumo por arquivo)
+        """
+        executor = self._get_executor()
+        futures = [executor.submit(profile_fastq, path) for path in (read1, read2)]
+        profiles = [future.result() for future in futures]
+
+        problems = []
+        for label, profile in zip(("R1", "R2"), profiles):
+            problems.extend(f"{label}: {error}" for error in profile["errors"])
+        if not any(profile["errors"] for profile in profiles):
+            problems.extend(compare_pair(*profiles))
+
+        return {
+            "valid": not problems,
+            "problems": problems,
+            "summaries": [summarize_profile(profile) for profile in profiles],
+        }
+
+    def shutdown(self):
+        """Encerra o pool de processos"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+_shared_validator = None
+_shared_lock = threading.Lock()
+
+def get_fastq_validator():
+    """Retorna o validador compartilhado pela aplicação"""
+    global _shared_validator
+    with _shared_lock:
+        if _shared_validator is None:
+            _shared_validator = FastqValidator()
+        return _shared_validator
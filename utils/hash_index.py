@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import mmap
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from config.settings import HASH_INDEX_FILE
+from utils.logging_utils import log_info, log_error, log_warning
+
+# Tamanho das fatias do mapeamento de memória passadas ao SHA-256
+HASH_CHUNK_SIZE = 16 * 1024 * 1024
+
+def _file_signature(path):
+    """Retorna a assinatura (tamanho, mtime, inode) usada para validar uma entrada do índice"""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+def hash_file_mmap(path, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Calcula o SHA-256 de um arquivo mapeado em memória, em fatias, sem cópias intermediárias
+
+    Executado nos processos do pool. A assinatura é lida antes e conferida depois
+    do cálculo: se o arquivo mudou durante a leitura, o resultado é descartado.
+
+    Args:
+        path: Caminho do arquivo local
+        chunk_size: Tamanho das fatias (bytes)
+
+    Returns:
+        tuple: (sha256, assinatura) ou (None, None) se o arquivo mudou
+    """
+    signature = _file_signature(path)
+    digest = hashlib.sha256()
+    if signature["size"]:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(mapped), chunk_size):
+                    digest.update(view[offset:offset + chunk_size])
+            finally:
+                view.release()
+    if _file_signature(path) != signature:
+        return None, None
+    return digest.hexdigest(), signature
+
+class HashIndex:
+    """Índice local persistente: (caminho, tamanho, mtime, inode) -> SHA-256"""
+    def __init__(self, index_file=HASH_INDEX_FILE, max_workers=2):
+        """
+        Inicializa o índice
+
+        Args:
+            index_file: Arquivo JSON do índice
+            max_workers: Número de processos para cálculo de hashes (um arquivo por processo)
+        """
+        self.index_file = index_file
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}  # caminho -> Future
+        self._entries = self._load()
+
+    def _load(self):
+        """Carrega o índice do arquivo JSON"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            log_warning(f"Índice de hashes ignorado (arquivo inválido): {str(e)}")
+        return {}
+
+    def _save(self):
+        """Salva o índice de forma atômica"""
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            with self._lock:
+                # Remover entradas de arquivos que não existem mais
+                data = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+                self._entries = dict(data)
+            tmp_file = f"{self.index_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            log_error(f"Erro ao salvar índice de hashes: {str(e)}")
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def lookup(self, path):
+        """
+        Retorna o SHA-256 indexado se o arquivo não mudou desde o cálculo
+
+        Returns:
+            str: Hash em hexadecimal ou None
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return None
+        try:
+            signature = _file_signature(key)
+        except OSError:
+            return None
+        if all(entry.get(field) == value for field, value in signature.items()):
+            return entry.get("sha256")
+        return None
+
+    def _schedule(self, key):
+        """
+        Retorna o cálculo pendente de um arquivo, agendando-o se ainda não existir
+
+        A verificação e a inserção em _pending acontecem sob o mesmo lock, de modo
+        que chamadas concorrentes nunca agendam o mesmo arquivo duas vezes.
+
+        Returns:
+            tuple: (Future, created) onde created indica se o cálculo foi agendado agora
+        """
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future, False
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(hash_file_mmap, key)
+            self._pending[key] = future
+        log_info(f"Calculando hash em segundo plano: {os.path.basename(key)}")
+        future.add_done_callback(lambda f, key=key: self._on_hashed(key, f))
+        return future, True
+
+    def prefetch(self, paths):
+        """
+        Agenda o cálculo dos hashes ainda não indexados, em segundo plano
+
+        Args:
+            paths: Caminhos dos arquivos locais
+        """
+        for path in paths:
+            if not path or not os.path.isfile(path) or self.lookup(path):
+                continue
+            self._schedule(self._key(path))
+
+    def _on_hashed(self, key, future):
+        """Registra o resultado de um cálculo em segundo plano"""
+        with self._lock:
+            self._pending.pop(key, None)
+        try:
+            digest, signature = future.result()
+        except Exception as e:
+            log_error(f"Erro ao calcular hash de {os.path.basename(key)}: {str(e)}")
+            return
+        if digest is None:
+            log_warning(f"{os.path.basename(key)} mudou durante o cálculo do hash")
+            return
+        with self._lock:
+            self._entries[key] = dict(signature, sha256=digest)
+        self._save()
+
+    def get_digest(self, path):
+        """
+        Retorna o SHA-256 do arquivo, aguardando ou iniciando o cálculo se necessário
+
+        Returns:
+            str: Hash em hexadecimal
+        """
+        for _ in range(3):
+            digest = self.lookup(path)
+            if digest:
+                return digest
+            key = self._key(path)
+            future, _ = self._schedule(key)
+            try:
+                digest, signature = future.result()
+            except Exception as e:
+                log_warning(f"Cálculo do hash de {os.path.basename(key)} em segundo plano falhou ({str(e)}). Calculando diretamente...")
+                break
+            if digest is not None:
+                with self._lock:
+                    self._entries[key] = dict(signature, sha256=digest)
+                return digest
+        # O arquivo continua mudando ou o pool falhou: calcular diretamente, sem indexar
+        return hash_file_mmap(path)[0] or ""
+
+    def shutdown(self):
+        """Encerra o pool de processos"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+def get_hash_index():
+    """Retorna o índice de hashes compartilhado pela aplicação"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = HashIndex()
+        return _shared_index
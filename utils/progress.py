@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+from config.settings import PROGRESS_UPDATES_PER_SECOND
+
+# Peso da amostra mais recente na média móvel da taxa de transferência
+RATE_SMOOTHING = 0.3
+
+def format_bytes(size_bytes):
+    """
+    Formata uma quantidade de bytes para exibição
+
+    Args:
+        size_bytes: Quantidade em bytes
+
+    Returns:
+        str: Quantidade formatada com unidade
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} TB"
+
+def format_duration(seconds):
+    """
+    Formata uma duração em segundos (ex: 1h05m, 3m20s, 45s)
+
+    Args:
+        seconds: Duração em segundos
+
+    Returns:
+        str: Duração formatada
+    """
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+class TransferProgress:
+    """Instantâneo do progresso de uma transferência"""
+    def __init__(self, name, done, total, rate, eta):
+        self.name = name
+        self.done = done
+        self.total = total
+        self.rate = rate
+        self.eta = eta
+
+    @property
+    def percent(self):
+        return int(float(self.done) / float(self.total) * 100) if self.total else 0
+
+    def describe(self):
+        """Texto de status: 'nome: 45% (1.2 GB de 2.7 GB) - 35.0 MB/s - restam 42s'"""
+        text = f"{self.name}: {self.percent}% ({format_bytes(self.done)} de {format_bytes(self.total)})"
+        if self.rate:
+            text += f" - {format_bytes(self.rate)}/s"
+        if self.eta is not None and self.done < self.total:
+            text += f" - restam {format_duration(self.eta)}"
+        return text
+
+class ProgressAggregator:
+    """Agrega os callbacks de progresso por bloco e emite no máximo N atualizações por segundo por transferência
+
+    Os callbacks de SCP/SFTP são chamados a cada bloco (dezenas de milhares de
+    vezes em um FASTQ grande). Aqui cada chamada só compara o relógio; a taxa
+    (média móvel) e o tempo restante são calculados apenas quando uma
+    atualização é emitida. O início e o fim da transferência sempre são emitidos.
+    """
+    def __init__(self, emit, updates_per_second=PROGRESS_UPDATES_PER_SECOND):
+        """
+        Inicializa o agregador
+
+        Args:
+            emit: Função chamada com um TransferProgress a cada atualização emitida
+            updates_per_second: Máximo de atualizações por segundo em cada transferência
+        """
+        self.emit = emit
+        self.interval = 1.0 / max(1, updates_per_second)
+        self._lock = threading.Lock()
+        self._transfers = {}
+
+    def update(self, name, done, total):
+        """
+        Registra o progresso de uma transferência (chamado a cada bloco)
+
+        Args:
+            name: Identificação da transferência (ex: nome do arquivo)
+            done: Bytes transferidos
+            total: Total de bytes
+        """
+        now = time.monotonic()
+        finished = bool(total) and done >= total
+        with self._lock:
+            state = self._transfers.get(name)
+            if state is None:
+                state = {"start": now, "last_time": now, "last_done": done, "rate": 0.0}
+                self._transfers[name] = state
+            elif not finished and now - state["last_time"] < self.interval:
+                return
+
+            elapsed = now - state["last_time"]
+            if elapsed > 0:
+                sample = max(0, done - state["last_done"]) / elapsed
+                state["rate"] = sample if not state["rate"] else (
+                    RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * state["rate"])
+            state["last_time"] = now
+            state["last_done"] = done
+            rate = state["rate"]
+            if finished:
+                # Taxa média da transferência inteira no resumo final
+                duration = now - state["start"]
+                rate = done / duration if duration > 0 else rate
+                del self._transfers[name]
+
+        eta = (total - done) / rate if rate and total else None
+        self.emit(TransferProgress(name, done, total, rate, eta))
+
+    def reset(self, name=None):
+        """Descarta o estado de uma transferência (ou de todas)"""
+        with self._lock:
+            if name is None:
+                self._transfers.clear()
+            else:
+                self._transfers.pop(name, None)
@@ -48,6 +48,17 @@ class StatusUpdater:
         """Atualiza o valor da barra de progresso"""
         if self.progress_var is not None:
             self.queue.put(("progress", value))
+            
+    def update_transfer(self, progress):
+        """
+        Atualiza a barra e o status com o progresso de uma transferência (sem registrar no log)
+        
+        Args:
+            progress: TransferProgress emitido pelo ProgressAggregator
+        """
+        if self.progress_var is not None:
+            self.queue.put(("progress", progress.percent))
+        self.queue.put(("status", progress.describe()))
     
     def _process_queue(self):
         """Processa a fila de mensagens"""
@@ -87,4 +98,42 @@ class StatusUpdater:
             
     def stop(self):
         """Para o processamento da fila"""
-        self.running = False
\ No newline at end of file
+        self.running = False
+
+class ConsoleStatusUpdater:
+    """Atualizador de status sem interface gráfica (execução headless), apenas registra no log"""
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.running = True
+        
+    def start(self):
+        """Compatibilidade com StatusUpdater (nada a iniciar)"""
+        pass
+        
+    def update_status(self, text):
+        """Registra o texto de status"""
+        log_info(f"Status: {text}")
+        
+    def update_log(self, text, level="INFO"):
+        """Registra uma entrada de log com o nível especificado"""
+        if level == "ERROR":
+            log_error(text)
+        elif level == "WARNING":
+            log_warning(text)
+        elif level == "SUCCESS":
+            log_success(text)
+        else:
+            log_info(text)
+            
+    def update_progress(self, value):
+        """Progresso não é exibido no modo headless"""
+        pass
+        
+    def update_transfer(self, progress):
+        """Registra apenas o resumo das transferências concluídas"""
+        if progress.total and progress.done >= progress.total:
+            log_info(f"Transferência concluída: {progress.describe()}")
+        
+    def stop(self):
+        """Compatibilidade com StatusUpdater"""
+        self.running = False